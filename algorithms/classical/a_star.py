@@ -0,0 +1,280 @@
+import heapq
+import numpy as np
+from algorithms.classical.graph_search import GraphSearch
+from problems.discrete import GridPathfinding
+
+class AStarSearch(GraphSearch):
+    """
+    A* Search - Mở rộng đỉnh có f = g + weight * h nhỏ nhất.
+    weight = 1 với heuristic nhất quán (Manhattan cho lưới 4 hướng, Octile cho lưới 8 hướng) -> tối ưu.
+    weight > 1 (Weighted A*): mở rộng ít đỉnh hơn, chi phí không vượt quá weight lần tối ưu.
+    mode:
+    - 'standard': A* 1 chiều
+    - 'bidirectional': tìm đồng thời từ start và từ goal (trên đồ thị đảo chiều), dùng thế vị trung bình
+      p(v) = (h_goal(v) - h_start(v)) / 2 để 2 phía nhất quán với nhau; dừng khi tổng khóa nhỏ nhất 2 heap
+      >= chi phí đường gặp nhau tốt nhất mu -> vẫn tối ưu. Cần weight = 1.
+    - 'jps': Jump Point Search (Harabor & Grastien 2011) cho GridPathfinding 8 hướng (chi phí đồng nhất,
+      không cắt góc). Chỉ đưa vào heap các "điểm nhảy", bỏ qua các ô đối xứng trên đường thẳng;
+      tại mỗi điểm nhảy chỉ xét các hướng tự nhiên và hướng bắt buộc (forced) theo hướng đến.
+      Các lần quét thẳng tra bảng ô dừng gần nhất theo 4 hướng (tính trước vector hóa, kiểu JPS+) -> O(1).
+      Đường đi trả về đã được nội suy lại thành từng ô liên tiếp.
+    """
+    MODES = ('standard', 'bidirectional', 'jps')
+
+    def __init__(self, problem, weight=1.0, mode='standard', **kwargs):
+        super().__init__(problem, **kwargs)
+        if weight < 1:
+            raise ValueError(f"weight phải >= 1, nhận được: {weight}")
+        if mode not in self.MODES:
+            raise ValueError(f"mode phải thuộc {self.MODES}, nhận được: {mode}")
+        if mode == 'bidirectional' and weight != 1:
+            raise ValueError("mode='bidirectional' chỉ đảm bảo điều kiện dừng với weight = 1")
+        if mode == 'jps' and not (isinstance(problem, GridPathfinding) and problem.connectivity == 8):
+            raise ValueError("mode='jps' chỉ áp dụng cho GridPathfinding 8 hướng")
+        self.weight = weight
+        self.mode = mode
+
+    def _search(self):
+        self._allocate()
+        if self.mode == 'bidirectional':
+            return self._bidirectional()
+        if self.mode == 'jps':
+            return self._jps()
+        return self._best_first(g_weight=1.0, h_weight=self.weight)
+
+    def _build_path(self):
+        if self.mode == 'bidirectional':
+            return self._meeting_path
+        path = self._reconstruct(self.problem.goal)
+        return self._interpolate(path) if self.mode == 'jps' else path
+
+    # ------------------------------------------------------------------ Bidirectional A*
+
+    def _bidirectional(self):
+        P = self.problem
+        graphs = (P, P.reversed())
+        start, goal = P.start, P.goal
+        n = P.n_nodes
+        # Phía 0 dùng lại bộ đệm của lớp cha, phía 1 (ngược từ goal) cấp phát thêm 1 bộ
+        g = (self.g, np.full(n, np.inf))
+        parent = (self.parent, np.full(n, -1, dtype=self._index_dtype))
+        closed = (self.closed, np.zeros(n, dtype=bool))
+        self.memory_bytes *= 2
+
+        def potential(nodes, sign):
+            return sign * 0.5 * (P.heuristic(nodes, goal) - P.heuristic(nodes, start))
+
+        g[0][start] = 0.0
+        g[1][goal] = 0.0
+        heaps = ([(float(potential(np.array([start]), 1)[0]), start)],
+                 [(float(potential(np.array([goal]), -1)[0]), goal)])
+        mu, meet = (0.0, (start, start)) if start == goal else (np.inf, None)
+
+        while heaps[0] and heaps[1]:
+            # Bỏ bản ghi cũ ở đỉnh heap trước khi so điều kiện dừng
+            for side in (0, 1):
+                while heaps[side] and closed[side][heaps[side][0][1]]:
+                    heapq.heappop(heaps[side])
+            if not (heaps[0] and heaps[1]) or heaps[0][0][0] + heaps[1][0][0] >= mu:
+                break
+
+            # Mở rộng phía có tập biên nhỏ hơn
+            side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+            _, u = heapq.heappop(heaps[side])
+            closed[side][u] = True
+            self._expand()
+
+            nbrs, costs = graphs[side].neighbors(u)
+            new_g = g[side][u] + costs
+            # Đường đi qua cạnh (u, v) với v đã được phía kia chạm tới
+            through = new_g + g[1 - side][nbrs]
+            k = int(np.argmin(through)) if len(through) else 0
+            if len(through) and through[k] < mu:
+                mu = float(through[k])
+                v = int(nbrs[k])
+                meet = (u, v) if side == 0 else (v, u)
+
+            is_open = ~closed[side][nbrs]
+            nbrs, new_g = nbrs[is_open], new_g[is_open]
+            better = new_g < g[side][nbrs]
+            if not np.any(better):
+                continue
+            nbrs, new_g = nbrs[better], new_g[better]
+            g[side][nbrs] = new_g
+            parent[side][nbrs] = u
+            keys = new_g + potential(nbrs, 1 if side == 0 else -1)
+            for item in zip(keys.tolist(), nbrs.tolist()):
+                heapq.heappush(heaps[side], item)
+            frontier = len(heaps[0]) + len(heaps[1])
+            if frontier > self.peak_frontier:
+                self.peak_frontier = frontier
+
+        if meet is None:
+            return False
+        # Ghép nửa xuôi start -> a với nửa ngược b -> goal (cạnh a -> b)
+        a, b = meet
+        forward = [a]
+        while forward[-1] != start:
+            forward.append(int(parent[0][forward[-1]]))
+        backward = [b] if b != a else []
+        while backward and backward[-1] != goal:
+            backward.append(int(parent[1][backward[-1]]))
+        self._meeting_path = np.array(forward[::-1] + backward, dtype=self._index_dtype)
+        return True
+
+    # ------------------------------------------------------------------ Jump Point Search
+
+    def _build_jump_tables(self):
+        """
+        Với mỗi hướng thẳng k (0..3) và mỗi ô: tọa độ (hàng hoặc cột) của ô dừng gần nhất khi đi tiếp từ ô đó.
+        Ô dừng: ô bị chặn / biên (-> không có điểm nhảy), goal, hoặc ô có láng giềng bắt buộc
+        (ô cạnh bên trống nhưng ô phía sau nó bị chặn).
+        Trả về (tables, forced): forced[k] là mặt nạ bit (uint8, theo từng ô) các hướng bắt buộc khi tới ô
+        theo hướng k: hướng sang ô cạnh bên đó và hướng chéo về phía trước cùng bên.
+        """
+        P = self.problem
+        H, W = P.height, P.width
+        free = np.zeros((H + 2, W + 2), dtype=bool)
+        free[1:-1, 1:-1] = ~P.grid
+
+        def shifted(dr, dc):
+            return free[1 + dr:H + 1 + dr, 1 + dc:W + 1 + dc]
+
+        is_goal = np.zeros((H, W), dtype=bool)
+        is_goal[divmod(P.goal, W)] = True
+        dtype = np.int16 if max(H, W) < 2**15 - 1 else np.int32
+
+        bit = {d: 1 << k for k, d in enumerate(P.DIRECTIONS)}
+        tables, forced = [], []
+        for dr, dc in P.DIRECTIONS[:4]:
+            mask = np.zeros((H, W), dtype=np.uint8)
+            for sr, sc in ([(-1, 0), (1, 0)] if dr == 0 else [(0, -1), (0, 1)]):
+                # Ô cạnh bên trống nhưng ô phía sau nó bị chặn
+                side = shifted(sr, sc) & ~shifted(sr - dr, sc - dc)
+                mask |= side.astype(np.uint8) * np.uint8(bit[(sr, sc)] | bit[(sr + dr, sc + dc)])
+            stop = P.grid | (mask > 0) | is_goal
+            if dr == 0:
+                tables.append(self._next_stop(stop, dc, dtype))
+            else:
+                tables.append(self._next_stop(stop.T, dr, dtype).T)
+            forced.append(mask.ravel())
+        return tables, forced
+
+    @staticmethod
+    def _next_stop(stop, step, dtype):
+        """Chỉ số cột của ô dừng đầu tiên (không tính chính ô đó) theo hướng step trên từng hàng"""
+        n = stop.shape[1]
+        idx = np.arange(n, dtype=np.int32)
+        table = np.empty(stop.shape, dtype=dtype)
+        if step > 0:
+            pos = np.where(stop, idx, n)
+            table[:, :-1] = np.minimum.accumulate(pos[:, :0:-1], axis=1)[:, ::-1]
+            table[:, -1] = n
+        else:
+            pos = np.where(stop, idx, -1)
+            table[:, 1:] = np.maximum.accumulate(pos[:, :-1], axis=1)
+            table[:, 0] = -1
+        return table
+
+    def _jump(self, r, c, k):
+        """Nhảy từ ô (r, c) theo hướng k, trả về điểm nhảy (r, c) hoặc None"""
+        P = self.problem
+        dr, dc = P.DIRECTIONS[k]
+        if k < 4:
+            s = int(self._tables[k][r, c])
+            if dr == 0:
+                return (r, s) if 0 <= s < P.width and not P.grid[r, s] else None
+            return (s, c) if 0 <= s < P.height and not P.grid[s, c] else None
+
+        # Hướng chéo: đi từng bước, dừng khi tới goal hoặc 1 trong 2 hướng thẳng thành phần có điểm nhảy
+        kr, kc = (0 if dr < 0 else 1), (2 if dc < 0 else 3)
+        bit, W, goal = 1 << k, P.width, self._goal_cell
+        while P.moves[r * W + c] & bit:
+            r += dr
+            c += dc
+            if (r, c) == goal or self._jump(r, c, kr) or self._jump(r, c, kc):
+                return r, c
+        return None
+
+    def _jps(self):
+        P = self.problem
+        W, g, parent, closed = P.width, self.g, self.parent, self.closed
+        start, goal = P.start, P.goal
+        self._tables, forced = self._build_jump_tables()
+        self._goal_cell = divmod(goal, W)
+        self.memory_bytes += sum(t.nbytes for t in self._tables) + sum(f.nbytes for f in forced)
+
+        # Cắt tỉa theo hướng đến: hướng chéo giữ 3 hướng tự nhiên (2 thành phần thẳng và chính nó),
+        # hướng thẳng chỉ giữ chính nó, cộng thêm các hướng bắt buộc của ô (forced, tra theo hướng đến)
+        natural, straight = {}, {}
+        for k, (dr, dc) in enumerate(P.DIRECTIONS):
+            if k < 4:
+                natural[(dr, dc)] = 1 << k
+                straight[(dr, dc)] = forced[k]
+            else:
+                natural[(dr, dc)] = sum(1 << j for j, d in enumerate(P.DIRECTIONS)
+                                        if d in ((dr, 0), (0, dc), (dr, dc)))
+
+        g[start] = 0.0
+        h0 = float(P.heuristic(np.array([start]))[0])
+        heap = [(self.weight * h0, h0, start)]
+        try:
+            while heap:
+                _, _, u = heapq.heappop(heap)
+                if closed[u]:
+                    continue
+                closed[u] = True
+                self._expand()
+                if u == goal:
+                    return True
+
+                r, c = divmod(u, W)
+                mask = int(P.moves[u])
+                p = int(parent[u])
+                if p >= 0:
+                    pr, pc = divmod(p, W)
+                    arrival = (int(np.sign(r - pr)), int(np.sign(c - pc)))
+                    allowed = natural[arrival]
+                    if arrival in straight:
+                        allowed |= int(straight[arrival][u])
+                    mask &= allowed
+
+                succ, new_g = [], []
+                for k in P._dir_table[mask]:
+                    jp = self._jump(r, c, int(k))
+                    if jp is None:
+                        continue
+                    v = jp[0] * W + jp[1]
+                    if closed[v]:
+                        continue
+                    # Đoạn thẳng / chéo thuần giữa u và điểm nhảy
+                    cost = g[u] + max(abs(jp[0] - r), abs(jp[1] - c)) * P._costs[k]
+                    if cost < g[v]:
+                        g[v] = cost
+                        parent[v] = u
+                        succ.append(v)
+                        new_g.append(cost)
+                if not succ:
+                    continue
+
+                succ = np.array(succ)
+                h = P.heuristic(succ)
+                f = np.array(new_g) + self.weight * h
+                for item in zip(f.tolist(), h.tolist(), succ.tolist()):
+                    heapq.heappush(heap, item)
+                if len(heap) > self.peak_frontier:
+                    self.peak_frontier = len(heap)
+            return False
+        finally:
+            self._tables = None  # Giải phóng bảng nhảy sau khi tìm xong
+
+    def _interpolate(self, jump_points):
+        """Nội suy chuỗi điểm nhảy thành đường đi qua từng ô (mỗi đoạn là đường thẳng hoặc chéo 45 độ)"""
+        r, c = self.problem.cell(jump_points.astype(np.int64))
+        dr, dc = np.diff(r), np.diff(c)
+        steps = np.maximum(np.abs(dr), np.abs(dc))
+        seg = np.repeat(np.arange(len(steps)), steps)
+        offset = np.arange(len(seg)) - np.repeat(np.cumsum(steps) - steps, steps)
+        rows = np.append(r[seg] + offset * np.sign(dr)[seg], r[-1])
+        cols = np.append(c[seg] + offset * np.sign(dc)[seg], c[-1])
+        return (rows * self.problem.width + cols).astype(self._index_dtype)
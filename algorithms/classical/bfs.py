@@ -0,0 +1,34 @@
+import numpy as np
+from algorithms.classical.graph_search import GraphSearch
+
+class BreadthFirstSearch(GraphSearch):
+    """
+    Breadth-First Search (BFS) - Tìm kiếm theo chiều rộng
+    Mở rộng theo từng lớp (số bước từ start) -> đường đi ít bước nhất, chỉ tối ưu chi phí khi mọi cạnh bằng nhau.
+    Hàng đợi FIFO là mảng cấp phát trước (mỗi đỉnh vào hàng đợi tối đa 1 lần) với 2 con trỏ head/tail.
+    """
+    def _search(self):
+        self._allocate(need_g=False)
+        P, parent, seen = self.problem, self.parent, self.closed
+        queue = np.empty(P.n_nodes, dtype=self._index_dtype)
+        self.memory_bytes += queue.nbytes
+
+        seen[P.start] = True
+        queue[0] = P.start
+        head, tail = 0, 1
+        while head < tail:
+            u = int(queue[head])
+            head += 1
+            self._expand()
+            if u == P.goal:
+                return True
+
+            # Đánh dấu "đã thấy" ngay khi đưa vào hàng đợi để không thêm trùng
+            nbrs, _ = P.neighbors(u)
+            new = self._unseen(nbrs)
+            seen[new] = True
+            parent[new] = u
+            queue[tail:tail + len(new)] = new
+            tail += len(new)
+            self.peak_frontier = max(self.peak_frontier, tail - head)
+        return False
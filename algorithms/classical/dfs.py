@@ -0,0 +1,34 @@
+import numpy as np
+from algorithms.classical.graph_search import GraphSearch
+
+class DepthFirstSearch(GraphSearch):
+    """
+    Depth-First Search (DFS) - Tìm kiếm theo chiều sâu
+    Luôn đi tiếp từ đỉnh mới thấy gần nhất; không đảm bảo đường đi ngắn nhất nhưng tập biên nhỏ.
+    Ngăn xếp là mảng cấp phát trước, mỗi đỉnh được đẩy vào tối đa 1 lần (đánh dấu khi đẩy).
+    """
+    def _search(self):
+        self._allocate(need_g=False)
+        P, parent, seen = self.problem, self.parent, self.closed
+        stack = np.empty(P.n_nodes, dtype=self._index_dtype)
+        self.memory_bytes += stack.nbytes
+
+        seen[P.start] = True
+        stack[0] = P.start
+        top = 1
+        while top > 0:
+            top -= 1
+            u = int(stack[top])
+            self._expand()
+            if u == P.goal:
+                return True
+
+            nbrs, _ = P.neighbors(u)
+            new = self._unseen(nbrs)
+            seen[new] = True
+            parent[new] = u
+            # Đẩy theo thứ tự ngược để hướng đầu tiên được lấy ra trước
+            stack[top:top + len(new)] = new[::-1]
+            top += len(new)
+            self.peak_frontier = max(self.peak_frontier, top)
+        return False
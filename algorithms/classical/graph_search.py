@@ -0,0 +1,125 @@
+import heapq
+import numpy as np
+from algorithms.optimizer import Optimizer
+
+class GraphSearch(Optimizer):
+    """
+    Class cha cho các thuật toán tìm đường trên GraphProblem / GridPathfinding.
+    Trạng thái tìm kiếm lưu trong mảng NumPy cấp phát 1 lần theo số đỉnh (không dùng dict/set các tuple):
+    - g (float64): chi phí tốt nhất đã biết từ start
+    - parent (int32): đỉnh cha để dựng lại đường đi
+    - closed (bool): đỉnh đã mở rộng / đã thấy
+    Hàng đợi ưu tiên là binary heap (heapq) với xóa lười (lazy deletion): không giảm khóa tại chỗ,
+    chỉ đẩy bản ghi mới và bỏ qua bản ghi cũ khi lấy ra.
+    Sau khi chạy: nodes_expanded (số đỉnh đã mở rộng, cũng là n_evals), peak_frontier (kích thước lớn nhất
+    của tập biên, tính cả bản ghi cũ trong heap), memory_bytes (bộ nhớ các mảng trạng thái).
+    max_fe giới hạn số đỉnh được mở rộng; time_limit được kiểm tra sau mỗi CHECK_EVERY lần mở rộng.
+    """
+    CHECK_EVERY = 1024
+
+    def __init__(self, problem, **kwargs):
+        super().__init__(problem, **kwargs)
+        self.path = None
+        self.nodes_expanded = 0
+        self.peak_frontier = 0
+        self.memory_bytes = 0
+
+    def _allocate(self, need_g=True):
+        n = self.problem.n_nodes
+        self._index_dtype = np.int32 if n < 2**31 else np.int64
+        self.parent = np.full(n, -1, dtype=self._index_dtype)
+        self.closed = np.zeros(n, dtype=bool)
+        self.g = np.full(n, np.inf) if need_g else None
+        self.memory_bytes = self.parent.nbytes + self.closed.nbytes + (self.g.nbytes if need_g else 0)
+
+    def _expand(self):
+        """Đếm 1 lần mở rộng đỉnh và kiểm tra điều kiện dừng định kỳ"""
+        self.nodes_expanded += 1
+        self.n_evals += 1
+        if self.nodes_expanded % self.CHECK_EVERY == 0 or self.nodes_expanded == self.max_fe:
+            self.check_termination()
+
+    def _unseen(self, nbrs):
+        """Các đỉnh kề chưa thấy, bỏ trùng nhưng giữ nguyên thứ tự của neighbors() (thứ tự hướng / cạnh)"""
+        nbrs = nbrs[~self.closed[nbrs]]
+        _, first = np.unique(nbrs, return_index=True)
+        return nbrs[np.sort(first)]
+
+    def _reconstruct(self, goal):
+        """Dựng đường đi start -> goal từ mảng parent"""
+        path = [goal]
+        while path[-1] != self.problem.start:
+            path.append(int(self.parent[path[-1]]))
+        return np.array(path[::-1], dtype=self._index_dtype)
+
+    def _build_path(self):
+        """Đường đi sau khi _search() thành công (lớp con ghi đè nếu lưu vết theo cách khác)"""
+        return self._reconstruct(self.problem.goal)
+
+    def _search(self):
+        """Logic riêng của từng thuật toán: trả về True nếu đã tới goal"""
+        raise NotImplementedError("Lỗi: Bạn chưa viết hàm _search() cho thuật toán này!")
+
+    def _best_first(self, g_weight=1.0, h_weight=1.0):
+        """
+        Tìm kiếm ưu tiên tốt nhất dùng chung cho UCS (h_weight=0), Greedy (g_weight=0) và A*.
+        Độ ưu tiên f = g_weight * g + h_weight * h; hòa thì ưu tiên h nhỏ hơn (gần đích hơn).
+        """
+        P, g, parent, closed = self.problem, self.g, self.parent, self.closed
+        start, goal = P.start, P.goal
+        g[start] = 0.0
+        h0 = float(P.heuristic(np.array([start]))[0]) if h_weight else 0.0
+        heap = [(h_weight * h0, h0, start)]
+
+        while heap:
+            _, _, u = heapq.heappop(heap)
+            if closed[u]:
+                continue  # Bản ghi cũ (đỉnh đã được mở rộng với chi phí tốt hơn)
+            closed[u] = True
+            self._expand()
+            if u == goal:
+                return True
+
+            # Xử lý mọi đỉnh kề cùng lúc: lọc đỉnh đã đóng, so sánh g, tính heuristic vector hóa
+            nbrs, costs = P.neighbors(u)
+            is_open = ~closed[nbrs]
+            nbrs, new_g = nbrs[is_open], g[u] + costs[is_open]
+            better = new_g < g[nbrs]
+            if not np.any(better):
+                continue
+            nbrs, new_g = nbrs[better], new_g[better]
+            g[nbrs] = new_g
+            parent[nbrs] = u
+
+            h = P.heuristic(nbrs) if h_weight else np.zeros(len(nbrs))
+            f = g_weight * new_g + h_weight * h
+            for item in zip(f.tolist(), h.tolist(), nbrs.tolist()):
+                heapq.heappush(heap, item)
+            if len(heap) > self.peak_frontier:
+                self.peak_frontier = len(heap)
+        return False
+
+    def _evolve(self):
+        self.nodes_expanded = 0
+        self.peak_frontier = 0
+        found = self._search()
+
+        # Chi phí thực của đường đi (BFS/DFS/Greedy không đảm bảo tối ưu)
+        self.path = self._build_path() if found else np.array([], dtype=self._index_dtype)
+        cost = float(self.problem.fitness(self.path)) if found else np.inf
+        self.global_best_solution = self.path
+        self.global_best_fitness = cost
+        if not found:
+            self.stop_reason = 'no_path'
+        self.recorder.record(cost)
+        return self.path, cost
+
+    def stats(self):
+        """Thống kê của lần chạy gần nhất"""
+        return {
+            "cost": self.global_best_fitness,
+            "path_length": 0 if self.path is None else len(self.path),
+            "nodes_expanded": self.nodes_expanded,
+            "peak_frontier": self.peak_frontier,
+            "memory_bytes": self.memory_bytes
+        }
@@ -0,0 +1,10 @@
+from algorithms.classical.graph_search import GraphSearch
+
+class GreedyBestFirstSearch(GraphSearch):
+    """
+    Greedy Best-First Search - Mở rộng đỉnh có heuristic h (ước lượng khoảng cách tới đích) nhỏ nhất trước.
+    Rất nhanh trên bản đồ thoáng nhưng không đảm bảo tối ưu.
+    """
+    def _search(self):
+        self._allocate()
+        return self._best_first(g_weight=0.0, h_weight=1.0)
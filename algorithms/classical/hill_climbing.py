@@ -9,12 +9,12 @@ class HillClimbing(Optimizer):
 
     def _evolve(self):
         # 1. Khởi tạo ngẫu nhiên một điểm bắt đầu
-        # np.random.uniform(low, high) tạo số thực ngẫu nhiên
-        current_solution = np.random.uniform(
+        # self.rng.uniform(low, high) tạo số thực ngẫu nhiên
+        current_solution = self.rng.uniform(
             self.problem.bounds[:, 0], 
             self.problem.bounds[:, 1]
         )
-        current_fitness = self.problem.fitness(current_solution)
+        current_fitness = self.evaluate(current_solution)
 
         # Cập nhật Global Best ban đầu
         self.update_global_best(current_solution, current_fitness)
@@ -23,12 +23,12 @@ class HillClimbing(Optimizer):
         # 2. Vòng lặp tối ưu
         for _ in range(self.max_iter):
             # Tạo ứng viên mới bằng cách cộng nhiễu (Gaussian noise) vào vị trí hiện tại
-            candidate = current_solution + np.random.normal(0, self.step_size, size=self.problem.dim)
+            candidate = current_solution + self.rng.normal(0, self.step_size, size=self.problem.dim)
             
             # Đảm bảo ứng viên vẫn nằm trong giới hạn bài toán (Clip)
             candidate = np.clip(candidate, self.problem.bounds[:, 0], self.problem.bounds[:, 1])
             
-            candidate_fitness = self.problem.fitness(candidate)
+            candidate_fitness = self.evaluate(candidate)
 
             # --- LOGIC LEO ĐỒI ---
             # Nếu ứng viên mới tốt hơn hiện tại -> Di chuyển tới đó
@@ -1,43 +1,71 @@
 import numpy as np
 from algorithms.optimizer import Optimizer
+from problems.discrete import TSPLocalSearch
 
 class HillClimbingTSP(Optimizer):
     """
     Hill Climbing chuyên dụng cho bài toán rời rạc (TSP).
-    Thay vì cộng nhiễu Gaussian, ta dùng phép SWAP (Đổi chỗ 2 thành phố).
+    Thay vì cộng nhiễu Gaussian, ta dùng phép biến đổi hoán vị (SWAP, 2-opt, or-opt).
+    Chi phí mỗi bước được tính bằng delta O(1) qua TSPLocalSearch, lộ trình được sửa trực tiếp (không sao chép).
     """
-    def __init__(self, problem, max_iter=1000, **kwargs):
+    def __init__(self, problem, max_iter=1000, move='swap', strategy='random', n_candidates=10, **kwargs):
+        """
+        move: Phép biến đổi hàng xóm: 'swap' (mặc định), '2opt', 'or_opt'
+        strategy: 'random' -> mỗi vòng thử 1 hàng xóm ngẫu nhiên
+                  'first' / 'best' -> duyệt lân cận trên danh sách ứng viên và áp dụng bước cải thiện
+        n_candidates: Số thành phố gần nhất dùng cho danh sách ứng viên
+        """
+        if kwargs.get('cache_size'):
+            # Chi phí mỗi bước là delta trên lộ trình, không gọi problem.fitness -> cache không bao giờ trúng
+            raise ValueError("HillClimbingTSP tính chi phí bằng delta, không hỗ trợ cache_size")
         super().__init__(problem, max_iter=max_iter, **kwargs)
+        if move not in TSPLocalSearch.MOVES:
+            raise ValueError(f"move phải thuộc {TSPLocalSearch.MOVES}, nhận được: {move}")
+        if strategy not in ('random', 'first', 'best'):
+            raise ValueError(f"strategy phải là 'random', 'first' hoặc 'best', nhận được: {strategy}")
+        self.move = move
+        self.strategy = strategy
+        self.n_candidates = n_candidates
 
     def _evolve(self):
         # 1. Khởi tạo: Một hoán vị ngẫu nhiên các thành phố
         # Ví dụ: [0, 1, 2, ..., 19] -> [5, 2, 19, ..., 0]
-        current_sol = np.random.permutation(self.problem.n_cities)
-        current_fit = self.problem.fitness(current_sol)
-        
-        self.update_global_best(current_sol, current_fit)
+        with self.phase('initialization'):
+            n_candidates = self.n_candidates if self.strategy != 'random' else None
+            ls = TSPLocalSearch(self.problem, self.rng.permutation(self.problem.n_cities),
+                                n_candidates=n_candidates, rng=self.rng)
+
+        self.n_evals += 1
+        self.update_global_best(ls.tour, ls.length)
         self.save_history()
 
         # 2. Vòng lặp tối ưu
         for _ in range(self.max_iter):
-            # --- TẠO HÀNG XÓM (Swap Mutation) ---
-            neighbor = current_sol.copy()
-            
-            # Chọn ngẫu nhiên 2 vị trí khác nhau để đổi chỗ
-            idx1, idx2 = np.random.choice(self.problem.n_cities, 2, replace=False)
-            neighbor[idx1], neighbor[idx2] = neighbor[idx2], neighbor[idx1]
-            
-            # Tính fitness
-            neighbor_fit = self.problem.fitness(neighbor)
+            if self.strategy == 'random':
+                # --- TẠO HÀNG XÓM: chỉ tính delta O(1), chưa sửa lộ trình ---
+                # (mỗi hàng xóm được xét tính là 1 lần đánh giá)
+                with self.phase('variation'):
+                    args, delta = ls.random_move(self.move)
+                self.n_evals += 1
+
+                # --- LEO ĐỒI (Chỉ chấp nhận nếu tốt hơn) ---
+                with self.phase('selection'):
+                    if delta < 0:
+                        ls.apply(self.move, args, delta)
+                        self.update_global_best(ls.tour, ls.length)
+            else:
+                # Duyệt lân cận và áp dụng bước cải thiện (nếu có)
+                # (mỗi bước ứng viên được tính delta là 1 lần đánh giá)
+                with self.phase('variation'):
+                    gain, n_moves = ls.scan(self.move, self.strategy)
+                self.n_evals += n_moves
+                if gain >= 0:
+                    # Đã là cực tiểu địa phương của lân cận này (trừ khi lần duyệt cuối đã vượt ngân sách)
+                    self.check_termination()
+                    self.stop_reason = 'local_optimum'
+                    break
+                self.update_global_best(ls.tour, ls.length)
 
-            # --- LEO ĐỒI (Chỉ chấp nhận nếu tốt hơn) ---
-            if neighbor_fit < current_fit:
-                current_sol = neighbor
-                current_fit = neighbor_fit
-                
-                if current_fit < self.global_best_fitness:
-                    self.update_global_best(current_sol, current_fit)
-            
             self.save_history()
-            
-        return self.global_best_solution, self.global_best_fitness
\ No newline at end of file
+
+        return self.global_best_solution, self.global_best_fitness
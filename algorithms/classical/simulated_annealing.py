@@ -0,0 +1,89 @@
+import numpy as np
+from algorithms.optimizer import Optimizer
+from problems.discrete import TSPLocalSearch
+
+class SimulatedAnnealingTSP(Optimizer):
+    """
+    Simulated Annealing cho bài toán rời rạc (TSP) trên biểu diễn hoán vị.
+    Mỗi bước đề xuất 1 phép biến đổi (mặc định 2-opt), chi phí được tính bằng delta O(1) qua TSPLocalSearch,
+    lộ trình chỉ bị sửa (in-place) khi bước đi được chấp nhận theo tiêu chuẩn Metropolis.
+    n_candidates: bước 2-opt nối 1 thành phố ngẫu nhiên với 1 trong các thành phố gần nó nhất
+    (thay vì 2 vị trí ngẫu nhiên) -> tỉ lệ bước có ích cao hơn nhiều khi có hàng nghìn thành phố.
+    """
+    def __init__(self, problem, max_iter=10000, move='2opt', initial_temp=None, cooling_rate=None,
+                 final_temp_ratio=1e-3, n_candidates=10, **kwargs):
+        """
+        move: Phép biến đổi hàng xóm: '2opt' (mặc định), 'swap', 'or_opt'
+        initial_temp: Nhiệt độ khởi tạo. None -> ước lượng sao cho bước xấu trung bình được chấp nhận với xác suất 0.5
+        cooling_rate: Hệ số làm nguội mỗi bước. None -> chọn để nhiệt độ giảm còn final_temp_ratio * T0 sau max_iter bước
+        n_candidates: Số thành phố gần nhất cho bước 2-opt (None/0 -> chọn 2 vị trí ngẫu nhiên)
+        """
+        if kwargs.get('cache_size'):
+            # Chi phí mỗi bước là delta trên lộ trình, không gọi problem.fitness -> cache không bao giờ trúng
+            raise ValueError("SimulatedAnnealingTSP tính chi phí bằng delta, không hỗ trợ cache_size")
+        super().__init__(problem, max_iter=max_iter, **kwargs)
+        if move not in TSPLocalSearch.MOVES:
+            raise ValueError(f"move phải thuộc {TSPLocalSearch.MOVES}, nhận được: {move}")
+        self.move = move
+        self.initial_temp = initial_temp
+        self.cooling_rate = cooling_rate
+        self.final_temp_ratio = final_temp_ratio
+        self.n_candidates = n_candidates
+
+    def _propose(self, ls):
+        """Sinh 1 bước đi, trả về (args, delta) với chi phí O(1)"""
+        if self.move == '2opt' and ls.candidates is not None:
+            # Nối thành phố t[i] với 1 thành phố c gần nó: bỏ (t[i], t[i+1]), (c, succ c)
+            i = int(self.rng.integers(0, ls.n))
+            c = ls.candidates[ls.tour[i], self.rng.integers(0, ls.candidates.shape[1])]
+            j = int(ls.pos[c])
+            i, j = min(i, j), max(i, j)
+            return (i, j), ls.two_opt_delta(i, j)
+        return ls.random_move(self.move)
+
+    def _estimate_temp(self, ls, n_samples=100):
+        """T0 = -mean(delta > 0) / ln(0.5): bước xấu trung bình được chấp nhận với xác suất 0.5"""
+        deltas = np.array([self._propose(ls)[1] for _ in range(n_samples)])
+        uphill = deltas[deltas > 0]
+        if len(uphill) == 0:
+            return 1.0
+        return float(np.mean(uphill) / np.log(2))
+
+    def _evolve(self):
+        # 1. Khởi tạo: Một hoán vị ngẫu nhiên các thành phố
+        with self.phase('initialization'):
+            n_candidates = self.n_candidates if self.move == '2opt' else None
+            ls = TSPLocalSearch(self.problem, self.rng.permutation(self.problem.n_cities),
+                                n_candidates=n_candidates, rng=self.rng)
+
+        self.n_evals += 1
+        self.update_global_best(ls.tour, ls.length)
+        self.save_history()
+
+        # Thiết lập lịch làm nguội
+        with self.phase('initialization'):
+            temp = self.initial_temp if self.initial_temp is not None else self._estimate_temp(ls)
+            cooling_rate = self.cooling_rate
+            if cooling_rate is None:
+                cooling_rate = self.final_temp_ratio ** (1.0 / max(1, self.max_iter))
+
+        # 2. Vòng lặp tối ưu (Quá trình làm nguội)
+        for _ in range(self.max_iter):
+            # --- TẠO HÀNG XÓM: chỉ tính delta, chưa sửa lộ trình (mỗi hàng xóm tính là 1 lần đánh giá) ---
+            with self.phase('variation'):
+                args, delta = self._propose(ls)
+            self.n_evals += 1
+
+            # --- QUYẾT ĐỊNH CHẤP NHẬN (Metropolis): P = exp(-delta / T) ---
+            with self.phase('selection'):
+                if delta < 0 or self.rng.random() < np.exp(-delta / temp):
+                    ls.apply(self.move, args, delta)
+                    if ls.length < self.global_best_fitness:
+                        self.update_global_best(ls.tour, ls.length)
+
+            # --- LÀM NGUỘI ---
+            temp *= cooling_rate
+
+            self.save_history()
+
+        return self.global_best_solution, self.global_best_fitness
@@ -0,0 +1,10 @@
+from algorithms.classical.graph_search import GraphSearch
+
+class UniformCostSearch(GraphSearch):
+    """
+    Uniform Cost Search (UCS / Dijkstra) - Mở rộng đỉnh có chi phí g nhỏ nhất trước.
+    Luôn tìm được đường đi chi phí nhỏ nhất (trọng số không âm), dùng làm chuẩn để kiểm tra các thuật toán khác.
+    """
+    def _search(self):
+        self._allocate()
+        return self._best_first(g_weight=1.0, h_weight=0.0)
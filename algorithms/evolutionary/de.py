@@ -0,0 +1,177 @@
+import numpy as np
+from algorithms.optimizer import Optimizer
+
+class DifferentialEvolution(Optimizer):
+    """
+    Differential Evolution (DE) - Tiến hóa vi phân
+    Đột biến, lai ghép và chọn lọc được sinh cho cả quần thể cùng lúc bằng phép toán mảng,
+    mỗi thế hệ chỉ gọi đánh giá fitness 1 lần (evaluate_batch).
+    Các chiến lược (strategy):
+    - 'rand/1/bin'        : v = x_r1 + F * (x_r2 - x_r3)
+    - 'best/1/bin'        : v = x_best + F * (x_r1 - x_r2)
+    - 'current-to-pbest/1': v = x_i + F * (x_pbest - x_i) + F * (x_r1 - x~_r2)  (JADE, tự thích nghi F/CR)
+    - 'shade'             : current-to-pbest/1 với bộ nhớ tham số lịch sử (SHADE)
+    """
+    STRATEGIES = ('rand/1/bin', 'best/1/bin', 'current-to-pbest/1', 'shade')
+
+    def __init__(self, problem, pop_size=50, F=0.5, CR=0.9, strategy='rand/1/bin',
+                 p_best=0.1, archive_rate=1.0, memory_size=None, c=0.1, **kwargs):
+        """
+        F: Hệ số khuếch đại (Mutation factor) - giá trị cố định cho rand/1 và best/1, giá trị khởi tạo cho JADE/SHADE
+        CR: Xác suất lai ghép (Crossover rate) - tương tự F
+        strategy: Một trong STRATEGIES
+        p_best: Tỉ lệ top cá thể để chọn x_pbest (JADE). SHADE chọn ngẫu nhiên p trong [2/N, 0.2]
+        archive_rate: Kích thước kho lưu trữ (Archive) = archive_rate * pop_size (0 = không dùng)
+        memory_size: Số ô nhớ H của SHADE (mặc định = pop_size)
+        c: Tốc độ học của JADE khi cập nhật mu_F, mu_CR
+        """
+        super().__init__(problem, pop_size=pop_size, **kwargs)
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"strategy phải thuộc {self.STRATEGIES}, nhận được: {strategy}")
+        if pop_size < 4:
+            raise ValueError("DE cần pop_size >= 4")
+        self.F = F
+        self.CR = CR
+        self.strategy = strategy
+        self.p_best = p_best
+        self.archive_size = int(round(archive_rate * pop_size))
+        self.memory_size = memory_size or pop_size
+        self.c = c
+
+    def _distinct_indices(self, n_rows, pool_size, k, exclude):
+        """
+        Sinh ma trận chỉ số (n_rows, k) trong [0, pool_size): các cột khác nhau từng đôi
+        và khác exclude[i] trên mỗi hàng. Các va chạm được rút lại (chỉ vài lượt) thay vì lặp từng hàng.
+        """
+        idx = self.rng.integers(0, pool_size, (n_rows, k))
+        for col in range(k):
+            while True:
+                clash = idx[:, col] == exclude
+                for prev in range(col):
+                    clash |= idx[:, col] == idx[:, prev]
+                if not np.any(clash):
+                    break
+                idx[clash, col] = self.rng.integers(0, pool_size, np.count_nonzero(clash))
+        return idx
+
+    def _sample_F(self, mu, n):
+        """F ~ Cauchy(mu, 0.1), sinh lại nếu <= 0, cắt ở 1"""
+        mu = np.broadcast_to(np.asarray(mu, dtype=float), (n,))
+        F = mu + 0.1 * self.rng.standard_cauchy(n)
+        bad = F <= 0
+        while np.any(bad):
+            F[bad] = mu[bad] + 0.1 * self.rng.standard_cauchy(np.count_nonzero(bad))
+            bad = F <= 0
+        return np.minimum(F, 1.0)
+
+    def _evolve(self):
+        N, dim = self.pop_size, self.problem.dim
+        lb = self.problem.bounds[:, 0]
+        ub = self.problem.bounds[:, 1]
+        rows = np.arange(N)
+        adaptive = self.strategy in ('current-to-pbest/1', 'shade')
+
+        # 1. Khởi tạo quần thể
+        with self.phase('initialization'):
+            pop = self.rng.uniform(lb, ub, (N, dim))
+        fitness = self.evaluate_batch(pop)
+
+        best_idx = np.argmin(fitness)
+        self.update_global_best(pop[best_idx], fitness[best_idx])
+        self.save_history(pop, fitness)
+
+        # Kho lưu trữ các cá thể cha bị thay thế (JADE/SHADE)
+        archive = np.empty((0, dim))
+        # Tham số thích nghi: JADE dùng (mu_F, mu_CR), SHADE dùng bộ nhớ H ô
+        mu_F, mu_CR = self.F, self.CR
+        M_F = np.full(self.memory_size, self.F)
+        M_CR = np.full(self.memory_size, self.CR)
+        k_mem = 0
+
+        for _ in range(self.max_iter):
+            # A. Sinh tham số F, CR cho từng cá thể
+            with self.phase('variation'):
+                if self.strategy == 'shade':
+                    r = self.rng.integers(0, self.memory_size, N)
+                    CR = np.clip(self.rng.normal(M_CR[r], 0.1), 0, 1)
+                    F = self._sample_F(M_F[r], N)
+                elif adaptive:
+                    CR = np.clip(self.rng.normal(mu_CR, 0.1, N), 0, 1)
+                    F = self._sample_F(mu_F, N)
+                else:
+                    CR = np.full(N, self.CR)
+                    F = np.full(N, self.F)
+                F_col = F[:, np.newaxis]
+
+                # B. Đột biến (Mutation) cho cả quần thể
+                if self.strategy == 'rand/1/bin':
+                    r = self._distinct_indices(N, N, 3, rows)
+                    V = pop[r[:, 0]] + F_col * (pop[r[:, 1]] - pop[r[:, 2]])
+                elif self.strategy == 'best/1/bin':
+                    r = self._distinct_indices(N, N, 2, rows)
+                    V = pop[np.argmin(fitness)] + F_col * (pop[r[:, 0]] - pop[r[:, 1]])
+                else:
+                    # current-to-pbest/1: x_pbest chọn ngẫu nhiên trong top p*N
+                    if self.strategy == 'shade':
+                        n_top = np.maximum(2, np.round(self.rng.uniform(2.0 / N, 0.2, N) * N)).astype(int)
+                    else:
+                        n_top = np.full(N, max(2, int(round(self.p_best * N))))
+                    ranked = np.argsort(fitness)
+                    pbest = ranked[(self.rng.random(N) * n_top).astype(int)]
+
+                    # x_r1 lấy từ quần thể, x~_r2 lấy từ quần thể ∪ kho lưu trữ
+                    union = np.vstack([pop, archive]) if len(archive) else pop
+                    r1 = self._distinct_indices(N, N, 1, rows)[:, 0]
+                    r2 = self.rng.integers(0, len(union), N)
+                    clash = (r2 == rows) | (r2 == r1)
+                    while np.any(clash):
+                        r2[clash] = self.rng.integers(0, len(union), np.count_nonzero(clash))
+                        clash = (r2 == rows) | (r2 == r1)
+                    V = pop + F_col * (pop[pbest] - pop) + F_col * (pop[r1] - union[r2])
+
+                # Sửa biên: điểm vượt biên được đặt ở giữa cha và biên (thay vì cắt sát biên)
+                V = np.where(V < lb, (lb + pop) / 2, V)
+                V = np.where(V > ub, (ub + pop) / 2, V)
+
+                # C. Lai ghép nhị thức (Binomial crossover), đảm bảo ít nhất 1 chiều lấy từ V
+                cross = self.rng.random((N, dim)) < CR[:, np.newaxis]
+                cross[rows, self.rng.integers(0, dim, N)] = True
+                U = np.where(cross, V, pop)
+
+            # D. Chọn lọc (Selection) - đánh giá cả quần thể con trong 1 lần gọi
+            trial_fitness = self.evaluate_batch(U)
+            with self.phase('selection'):
+                improved = trial_fitness < fitness
+                accept = trial_fitness <= fitness
+
+                if adaptive and np.any(improved):
+                    # Ghi nhận F/CR thành công, trọng số theo mức cải thiện
+                    delta = fitness[improved] - trial_fitness[improved]
+                    S_F, S_CR = F[improved], CR[improved]
+                    if self.strategy == 'shade':
+                        w = delta / np.sum(delta) if np.sum(delta) > 0 else np.full(len(delta), 1.0 / len(delta))
+                        M_CR[k_mem] = np.sum(w * S_CR)
+                        M_F[k_mem] = np.sum(w * S_F**2) / np.sum(w * S_F)
+                        k_mem = (k_mem + 1) % self.memory_size
+                    else:
+                        mu_CR = (1 - self.c) * mu_CR + self.c * np.mean(S_CR)
+                        mu_F = (1 - self.c) * mu_F + self.c * np.sum(S_F**2) / np.sum(S_F)
+
+                    # Cha bị thay thế được đưa vào kho lưu trữ, xóa ngẫu nhiên khi vượt kích thước
+                    if self.archive_size > 0:
+                        archive = np.vstack([archive, pop[improved]])
+                        if len(archive) > self.archive_size:
+                            keep = self.rng.choice(len(archive), self.archive_size, replace=False)
+                            archive = archive[keep]
+
+                pop[accept] = U[accept]
+                fitness[accept] = trial_fitness[accept]
+
+            # Cập nhật Global Best
+            curr_best_idx = np.argmin(fitness)
+            if fitness[curr_best_idx] < self.global_best_fitness:
+                self.update_global_best(pop[curr_best_idx], fitness[curr_best_idx])
+
+            self.save_history(pop, fitness)
+
+        return self.global_best_solution, self.global_best_fitness
@@ -0,0 +1,165 @@
+import numpy as np
+from algorithms.optimizer import Optimizer
+
+class CMAES(Optimizer):
+    """
+    Covariance Matrix Adaptation Evolution Strategy (CMA-ES)
+    Lấy mẫu lambda con từ phân phối chuẩn N(m, sigma^2 * C) và học dần ma trận hiệp phương sai C
+    (rank-one + rank-mu update), rất mạnh trên các bài toán ill-conditioned như Rosenbrock.
+    - Cả lambda con được sinh trong 1 lần rút ngẫu nhiên và đánh giá bằng 1 lần gọi evaluate_batch.
+    - Phân rã trị riêng C = B D^2 B^T chỉ được tính lại sau mỗi ~ 1 / (10 * n * (c1 + cmu)) thế hệ (lazy update).
+    - mode='sep': sep-CMA-ES chỉ học đường chéo của C (O(n) mỗi mẫu), phù hợp khi dim lớn.
+    - restarts > 0: IPOP-CMA-ES, khởi động lại với lambda tăng gấp inc_popsize lần khi hội tụ cục bộ.
+    """
+    def __init__(self, problem, pop_size=None, sigma0=0.3, mode='auto', restarts=0, inc_popsize=2,
+                 tol_fun=1e-12, tol_x=1e-12, **kwargs):
+        """
+        pop_size: lambda (mặc định 4 + floor(3 ln n))
+        sigma0: Bước khởi tạo, tính theo tỉ lệ độ rộng miền tìm kiếm
+        mode: 'full' (ma trận đầy đủ), 'sep' (chỉ đường chéo), 'auto' (sep nếu dim >= 100)
+        restarts: Số lần khởi động lại tối đa theo IPOP
+        inc_popsize: Hệ số nhân lambda sau mỗi lần khởi động lại
+        tol_fun, tol_x: Ngưỡng phát hiện hội tụ cục bộ (để khởi động lại / dừng)
+        """
+        dim = problem.dim
+        if pop_size is None:
+            pop_size = 4 + int(3 * np.log(dim))
+        super().__init__(problem, pop_size=pop_size, **kwargs)
+        if mode == 'auto':
+            mode = 'sep' if dim >= 100 else 'full'
+        if mode not in ('full', 'sep'):
+            raise ValueError(f"mode phải là 'full', 'sep' hoặc 'auto', nhận được: {mode}")
+        self.sigma0 = sigma0
+        self.mode = mode
+        self.restarts = restarts
+        self.inc_popsize = inc_popsize
+        self.tol_fun = tol_fun
+        self.tol_x = tol_x
+
+    def _strategy_params(self, lam, n):
+        """Các hằng số chiến lược mặc định (Hansen, The CMA Evolution Strategy: A Tutorial)"""
+        mu = lam // 2
+        weights = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+        weights /= np.sum(weights)
+        mueff = 1.0 / np.sum(weights**2)
+
+        cc = (4 + mueff / n) / (n + 4 + 2 * mueff / n)
+        cs = (mueff + 2) / (n + mueff + 5)
+        c1 = 2 / ((n + 1.3)**2 + mueff)
+        cmu = min(1 - c1, 2 * (mueff - 2 + 1 / mueff) / ((n + 2)**2 + mueff))
+        if self.mode == 'sep':
+            # sep-CMA học nhanh hơn vì chỉ có n tham số (Ros & Hansen 2008)
+            c1 *= (n + 2) / 3
+            cmu = min(1 - c1, cmu * (n + 2) / 3)
+        damps = 1 + 2 * max(0, np.sqrt((mueff - 1) / (n + 1)) - 1) + cs
+        chi_n = np.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n**2))
+        return mu, weights, mueff, cc, cs, c1, cmu, damps, chi_n
+
+    def _evolve(self):
+        n = self.problem.dim
+        lb = self.problem.bounds[:, 0]
+        ub = self.problem.bounds[:, 1]
+        sigma_init = self.sigma0 * np.mean(ub - lb)
+
+        lam = self.pop_size
+        gen = 0
+        n_restarts = 0
+
+        while True:
+            with self.phase('initialization'):
+                mu, weights, mueff, cc, cs, c1, cmu, damps, chi_n = self._strategy_params(lam, n)
+
+                # Trạng thái ban đầu của 1 lần chạy (run)
+                mean = self.rng.uniform(lb, ub)
+                sigma = sigma_init
+                p_c = np.zeros(n)
+                p_s = np.zeros(n)
+                if self.mode == 'full':
+                    C = np.eye(n)
+                    B = np.eye(n)
+                C_diag = np.ones(n)   # sep: đường chéo của C; full: chưa dùng
+                D = np.ones(n)        # Căn bậc hai trị riêng (độ lệch chuẩn theo từng trục)
+                eigen_gen = 0
+                # Tính lại phân rã trị riêng sau mỗi ~ 1 / (10 * n * (c1 + cmu)) thế hệ
+                # (Hansen: lambda / (10 n (c1 + cmu)) lần đánh giá, mỗi thế hệ tốn lambda lần đánh giá)
+                eigen_interval = max(1, int(1 / ((c1 + cmu) * n * 10)))
+                best_hist = []
+                local_gen = 0
+
+            while gen < self.max_iter:
+                # 1. Lấy mẫu lambda con trong 1 lần rút: y = B D z
+                with self.phase('variation'):
+                    Z = self.rng.standard_normal((lam, n))
+                    Y = Z @ (B * D).T if self.mode == 'full' else Z * D
+                    X = np.clip(mean + sigma * Y, lb, ub)
+                    # Dùng bước đã sửa biên để cập nhật (phân phối bám theo điểm thực sự được đánh giá)
+                    Y = (X - mean) / sigma
+
+                # 2. Đánh giá và xếp hạng
+                fitness = self.evaluate_batch(X)
+                with self.phase('selection'):
+                    order = np.argsort(fitness)
+                    if fitness[order[0]] < self.global_best_fitness:
+                        self.update_global_best(X[order[0]], fitness[order[0]])
+
+                    # 3. Cập nhật trung bình theo mu con tốt nhất (có trọng số)
+                    Y_sel = Y[order[:mu]]
+                    y_w = weights @ Y_sel
+                    mean = mean + sigma * y_w
+
+                with self.phase('adaptation'):
+                    # 4. Đường tiến hóa (Evolution paths)
+                    if self.mode == 'full':
+                        inv_sqrt_C_y = B @ ((B.T @ y_w) / D)
+                    else:
+                        inv_sqrt_C_y = y_w / D
+                    p_s = (1 - cs) * p_s + np.sqrt(cs * (2 - cs) * mueff) * inv_sqrt_C_y
+                    ps_norm = np.linalg.norm(p_s)
+                    h_sig = ps_norm / np.sqrt(1 - (1 - cs)**(2 * (local_gen + 1))) / chi_n < 1.4 + 2 / (n + 1)
+                    p_c = (1 - cc) * p_c + h_sig * np.sqrt(cc * (2 - cc) * mueff) * y_w
+
+                    # 5. Cập nhật hiệp phương sai: rank-one (p_c) + rank-mu (Y_sel) bằng phép nhân ma trận
+                    decay = 1 - c1 - cmu + (1 - h_sig) * c1 * cc * (2 - cc)
+                    if self.mode == 'full':
+                        C = decay * C + c1 * np.outer(p_c, p_c) + cmu * (Y_sel.T * weights) @ Y_sel
+                    else:
+                        C_diag = decay * C_diag + c1 * p_c**2 + cmu * (weights @ Y_sel**2)
+
+                    # 6. Điều chỉnh bước (Cumulative Step-size Adaptation)
+                    sigma *= np.exp((cs / damps) * (ps_norm / chi_n - 1))
+
+                    # 7. Phân rã trị riêng (lazy) / cập nhật độ lệch chuẩn theo trục
+                    if self.mode == 'full':
+                        if local_gen - eigen_gen >= eigen_interval:
+                            eigen_gen = local_gen
+                            C = np.triu(C) + np.triu(C, 1).T
+                            eig_vals, B = np.linalg.eigh(C)
+                            D = np.sqrt(np.maximum(eig_vals, 1e-20))
+                    else:
+                        D = np.sqrt(np.maximum(C_diag, 1e-20))
+
+                gen += 1
+                local_gen += 1
+                self.save_history(X, fitness)
+
+                # 8. Phát hiện hội tụ cục bộ (để khởi động lại theo IPOP)
+                best_hist.append(fitness[order[0]])
+                window = best_hist[-(10 + int(30 * n / lam)):]
+                if len(best_hist) > 1 and max(np.ptp(fitness), max(window) - min(window)) < self.tol_fun:
+                    break
+                if sigma * np.max(D) < self.tol_x * sigma_init:
+                    break
+                if np.max(D) > 1e7 * np.min(D):
+                    break
+
+            if gen >= self.max_iter:
+                break
+            if n_restarts >= self.restarts:
+                self.stop_reason = 'converged'
+                break
+            # IPOP: khởi động lại với quần thể lớn hơn
+            n_restarts += 1
+            lam = int(lam * self.inc_popsize)
+
+        self.n_restarts = n_restarts
+        return self.global_best_solution, self.global_best_fitness
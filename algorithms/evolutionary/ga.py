@@ -9,43 +9,46 @@ class GeneticAlgorithm(Optimizer):
 
     def _evolve(self):
         # 1. Khởi tạo quần thể
-        pop = np.random.uniform(
-            self.problem.bounds[:, 0], self.problem.bounds[:, 1], 
-            (self.pop_size, self.problem.dim)
-        )
-        fitness = np.apply_along_axis(self.problem.fitness, 1, pop)
+        with self.phase('initialization'):
+            pop = self.rng.uniform(
+                self.problem.bounds[:, 0], self.problem.bounds[:, 1], 
+                (self.pop_size, self.problem.dim)
+            )
+        fitness = self.evaluate_batch(pop)
         
         # Cập nhật best ban đầu
         best_idx = np.argmin(fitness)
         self.update_global_best(pop[best_idx], fitness[best_idx])
         
         # --- SỬA LỖI Ở ĐÂY: Xóa tham số truyền vào ---
-        self.save_history() 
+        self.save_history(pop, fitness) 
 
         # 2. Vòng lặp tiến hóa
         for _ in range(self.max_iter):
             # A. Selection (Tournament)
-            idx1 = np.random.randint(0, self.pop_size, self.pop_size)
-            idx2 = np.random.randint(0, self.pop_size, self.pop_size)
-            mask = fitness[idx1] < fitness[idx2]
-            parents = pop[np.where(mask, idx1, idx2)]
+            with self.phase('selection'):
+                idx1 = self.rng.integers(0, self.pop_size, self.pop_size)
+                idx2 = self.rng.integers(0, self.pop_size, self.pop_size)
+                mask = fitness[idx1] < fitness[idx2]
+                parents = pop[np.where(mask, idx1, idx2)]
 
             # B. Crossover
-            parents2 = parents.copy()
-            np.random.shuffle(parents2)
-            cross_mask = np.random.rand(self.pop_size, self.problem.dim) < 0.5
-            perform_cross = np.random.rand(self.pop_size, 1) < self.crossover_rate
-            offspring = np.where(cross_mask & perform_cross, parents, parents2)
-            offspring = np.where(perform_cross, offspring, parents)
+            with self.phase('variation'):
+                parents2 = parents.copy()
+                self.rng.shuffle(parents2)
+                cross_mask = self.rng.random((self.pop_size, self.problem.dim)) < 0.5
+                perform_cross = self.rng.random((self.pop_size, 1)) < self.crossover_rate
+                offspring = np.where(cross_mask & perform_cross, parents, parents2)
+                offspring = np.where(perform_cross, offspring, parents)
 
-            # C. Mutation
-            mutation_noise = np.random.normal(0, 1.0, size=offspring.shape)
-            mutate_mask = np.random.rand(self.pop_size, self.problem.dim) < self.mutation_rate
-            offspring[mutate_mask] += mutation_noise[mutate_mask]
-            offspring = np.clip(offspring, self.problem.bounds[:, 0], self.problem.bounds[:, 1])
+                # C. Mutation
+                mutation_noise = self.rng.normal(0, 1.0, size=offspring.shape)
+                mutate_mask = self.rng.random((self.pop_size, self.problem.dim)) < self.mutation_rate
+                offspring[mutate_mask] += mutation_noise[mutate_mask]
+                offspring = np.clip(offspring, self.problem.bounds[:, 0], self.problem.bounds[:, 1])
 
             # D. Update
-            offspring_fitness = np.apply_along_axis(self.problem.fitness, 1, offspring)
+            offspring_fitness = self.evaluate_batch(offspring)
             pop = offspring
             fitness = offspring_fitness
             
@@ -55,6 +58,6 @@ class GeneticAlgorithm(Optimizer):
                 self.update_global_best(pop[current_best_idx], fitness[current_best_idx])
             
             # --- SỬA LỖI Ở ĐÂY: Xóa tham số truyền vào ---
-            self.save_history()
+            self.save_history(pop, fitness)
 
         return self.global_best_solution, self.global_best_fitness
\ No newline at end of file
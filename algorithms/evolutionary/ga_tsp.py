@@ -0,0 +1,276 @@
+import numpy as np
+from algorithms.optimizer import Optimizer
+
+class GeneticAlgorithmTSP(Optimizer):
+    """
+    Genetic Algorithm cho TSP trên biểu diễn hoán vị.
+    Quần thể là ma trận int32 (pop_size, n_cities), mỗi hàng là 1 lộ trình.
+    Lai ghép (crossover):
+    - 'ox' : Order Crossover - giữ 1 đoạn của cha, điền phần còn lại theo thứ tự của mẹ (vector hóa hoàn toàn)
+    - 'pmx': Partially Mapped Crossover - dạng hoán đổi, mỗi bước xử lý 1 vị trí cho cả quần thể
+    - 'eax': Edge Assembly Crossover (1 AB-cycle) - ghép cạnh của 2 lộ trình, nối các chu trình con
+             bằng danh sách ứng viên (n_candidates thành phố gần nhất)
+    Đột biến: đảo ngược 1 đoạn ngẫu nhiên (inversion, tương đương 1 bước 2-opt), vector hóa.
+    """
+    CROSSOVERS = ('ox', 'pmx', 'eax')
+
+    def __init__(self, problem, pop_size=100, crossover='ox', crossover_rate=0.9, mutation_rate=0.2,
+                 n_elite=2, tournament_size=2, n_candidates=10, **kwargs):
+        """
+        crossover: Một trong CROSSOVERS
+        n_elite: Số cá thể tốt nhất được giữ nguyên sang thế hệ sau
+        tournament_size: Số cá thể trong mỗi vòng đấu chọn lọc
+        n_candidates: Số thành phố gần nhất dùng để nối chu trình con trong EAX
+        """
+        super().__init__(problem, pop_size=pop_size, **kwargs)
+        if crossover not in self.CROSSOVERS:
+            raise ValueError(f"crossover phải thuộc {self.CROSSOVERS}, nhận được: {crossover}")
+        if not 0 <= n_elite < pop_size:
+            raise ValueError(f"n_elite phải nằm trong [0, pop_size), nhận được: {n_elite}")
+        self.crossover = crossover
+        self.crossover_rate = crossover_rate
+        self.mutation_rate = mutation_rate
+        self.n_elite = n_elite
+        self.tournament_size = max(1, tournament_size)
+        self.n_candidates = n_candidates
+
+    # ------------------------------------------------------------------
+    # Lai ghép
+    # ------------------------------------------------------------------
+    def _cut_points(self, m, n):
+        """Đoạn [a, b) ngẫu nhiên cho mỗi hàng, trả về 2 cột (m, 1)"""
+        cuts = np.sort(self.rng.integers(0, n + 1, (m, 2)), axis=1)
+        return cuts[:, :1], cuts[:, 1:]
+
+    def _ox(self, P1, P2):
+        """Order Crossover cho m cặp cha mẹ cùng lúc"""
+        m, n = P1.shape
+        rows = np.arange(m)[:, np.newaxis]
+        cols = np.arange(n)
+        a, b = self._cut_points(m, n)
+
+        # Đánh dấu các thành phố đã lấy từ đoạn [a, b) của cha
+        in_segment = (cols >= a) & (cols < b)
+        taken = np.zeros((m, n), dtype=bool)
+        taken[rows, P1] = in_segment
+
+        # Đọc mẹ bắt đầu từ vị trí b (vòng tròn), giữ thứ tự các thành phố chưa có (sắp xếp ổn định)
+        order = (b + cols) % n
+        donor = P2[rows, order]
+        fill = np.take_along_axis(donor, np.argsort(taken[rows, donor], axis=1, kind='stable'), axis=1)
+
+        # n - (b - a) vị trí đầu tiên của order chính là các vị trí ngoài đoạn
+        child = P1.copy()
+        outside = cols < n - (b - a)
+        child[rows, order] = np.where(outside, fill, child[rows, order])
+        return child
+
+    def _pmx(self, P1, P2):
+        """
+        Partially Mapped Crossover dạng hoán đổi: bắt đầu từ mẹ, với mỗi vị trí k trong đoạn của cha,
+        đổi chỗ để child[k] = P1[k]. Vòng lặp theo vị trí, mỗi bước vector hóa trên mọi cặp.
+        """
+        m, n = P1.shape
+        child = P2.copy()
+        pos = np.empty_like(child)
+        pos[np.arange(m)[:, np.newaxis], child] = np.arange(n, dtype=child.dtype)
+        a, b = self._cut_points(m, n)
+        a, b = a.ravel(), b.ravel()
+
+        for k in range(int(a.min()), int(b.max())):
+            r = np.flatnonzero((a <= k) & (k < b))
+            city = P1[r, k]
+            j = pos[r, city]
+            displaced = child[r, k]
+            child[r, k], child[r, j] = city, displaced
+            pos[r, city], pos[r, displaced] = k, j
+        return child
+
+    @staticmethod
+    def _adjacency(tour):
+        """adj[c] = (thành phố trước, thành phố sau) của c trong lộ trình"""
+        adj = np.empty((len(tour), 2), dtype=np.int64)
+        adj[tour, 0] = np.roll(tour, 1)
+        adj[tour, 1] = np.roll(tour, -1)
+        return adj
+
+    @staticmethod
+    def _walk(adj, start):
+        """
+        Danh sách thành phố của chu trình chứa start, theo thứ tự đi dọc bảng kề.
+        adj là list Python (adj.tolist()) để truy cập từng phần tử nhanh hơn mảng NumPy.
+        """
+        nodes = []
+        prev, cur = -1, start
+        while True:
+            nodes.append(cur)
+            left, right = adj[cur]
+            nxt = left if left != prev else right
+            prev, cur = cur, nxt
+            if cur == start:
+                return nodes
+
+    def _ab_cycle(self, adj_a, adj_b):
+        """
+        Tìm 1 AB-cycle ngẫu nhiên: chu trình đi luân phiên cạnh chỉ có ở A và cạnh chỉ có ở B.
+        Trả về danh sách thành phố [c0, c1, ..., c0] (c0-c1 là cạnh A, c1-c2 là cạnh B, ...) hoặc None nếu A == B.
+        """
+        only_a = (adj_a[:, :, np.newaxis] != adj_b[:, np.newaxis, :]).all(axis=2)
+        only_b = (adj_b[:, :, np.newaxis] != adj_a[:, np.newaxis, :]).all(axis=2)
+        cities = np.flatnonzero(only_a.any(axis=1))
+        if len(cities) == 0:
+            return None
+        # Danh sách cạnh còn lại của mỗi thành phố, chỉ tạo khi đường đi chạm tới thành phố đó
+        rem = ({}, {})
+        def remaining(side, c):
+            if c not in rem[side]:
+                adj, only = (adj_a, only_a) if side == 0 else (adj_b, only_b)
+                rem[side][c] = adj[c][only[c]].tolist()
+            return rem[side][c]
+
+        start = int(cities[self.rng.integers(0, len(cities))])
+        path = [start]
+        seen = {start: 0}   # Thành phố -> vị trí trong path mà bước tiếp theo là cạnh A
+        cur = start
+        while True:
+            # Mỗi đỉnh có số cạnh chỉ-A bằng số cạnh chỉ-B nên luôn đi tiếp được
+            side = (len(path) - 1) % 2
+            nbrs = remaining(side, cur)
+            nxt = nbrs.pop(int(self.rng.integers(0, len(nbrs))))
+            remaining(side, nxt).remove(cur)
+            path.append(nxt)
+            cur = nxt
+            if (len(path) - 1) % 2 == 0:
+                if cur in seen:
+                    return path[seen[cur]:]
+                seen[cur] = len(path) - 1
+
+    def _eax(self, A, B, candidates):
+        """Edge Assembly Crossover: áp 1 AB-cycle lên A rồi nối các chu trình con thành 1 lộ trình"""
+        n, d = len(A), self.problem.dist_matrix
+        adj = self._adjacency(A)
+        cycle = self._ab_cycle(adj, self._adjacency(B))
+        if cycle is None:
+            return A.copy()
+
+        # 1. Bỏ các cạnh A của AB-cycle, thêm các cạnh B (bỏ hết trước rồi mới thêm)
+        adj_list = adj.tolist()
+        for t in range(0, len(cycle) - 1, 2):
+            u, v = cycle[t], cycle[t + 1]
+            adj_list[u][adj_list[u].index(v)] = -1
+            adj_list[v][adj_list[v].index(u)] = -1
+        for t in range(1, len(cycle) - 1, 2):
+            u, v = cycle[t], cycle[t + 1]
+            adj_list[u][adj_list[u].index(-1)] = v
+            adj_list[v][adj_list[v].index(-1)] = u
+
+        # 2. Gán nhãn chu trình con (mỗi chu trình con đều chứa ít nhất 1 đỉnh của AB-cycle)
+        comp = np.full(n, -1)
+        n_comp = 0
+        for c in cycle:
+            if comp[c] < 0:
+                comp[self._walk(adj_list, c)] = n_comp
+                n_comp += 1
+        if n_comp == 1:
+            return np.array(self._walk(adj_list, int(A[0])), dtype=A.dtype)
+        adj = np.array(adj_list)
+
+        # 3. Nối chu trình con nhỏ nhất vào chu trình khác (bỏ (u, u2), (v, v2), thêm (u, v), (u2, v2))
+        while n_comp > 1:
+            sizes = np.bincount(comp)
+            label = int(np.argmin(np.where(sizes > 0, sizes, n + 1)))
+            U = np.flatnonzero(comp == label)
+            U2 = adj[U]                                    # (m, 2)
+            V = candidates[U]                              # (m, k)
+            if np.all(comp[V] == label):
+                # Không có ứng viên nào ngoài chu trình con -> xét mọi thành phố bên ngoài
+                V = np.flatnonzero(comp != label)[np.newaxis, :].repeat(len(U), axis=0)
+            V2 = adj[V]                                    # (m, k, 2)
+            u, u2 = U[:, None, None, None], U2[:, :, None, None]
+            v, v2 = V[:, None, :, None], V2[:, None, :, :]
+            gain = d[u, v] + d[u2, v2] - d[u, u2] - d[v, v2]
+            gain = np.where(comp[v] == label, np.inf, gain)
+            iu, iu2, iv, iv2 = np.unravel_index(np.argmin(gain), gain.shape)
+            a, a2 = U[iu], U2[iu, iu2]
+            b, b2 = V[iu, iv], V2[iu, iv, iv2]
+            adj[a, adj[a] == a2] = b
+            adj[a2, adj[a2] == a] = b2
+            adj[b, adj[b] == b2] = a
+            adj[b2, adj[b2] == b] = a2
+            comp[comp == comp[b]] = label
+            n_comp -= 1
+
+        # 4. Chuyển bảng kề về lộ trình
+        return np.array(self._walk(adj.tolist(), int(A[0])), dtype=A.dtype)
+
+    def _crossover(self, P1, P2, candidates):
+        if self.crossover == 'ox':
+            return self._ox(P1, P2)
+        if self.crossover == 'pmx':
+            return self._pmx(P1, P2)
+        return np.array([self._eax(a, b, candidates) for a, b in zip(P1, P2)], dtype=P1.dtype).reshape(P1.shape)
+
+    # ------------------------------------------------------------------
+    # Đột biến
+    # ------------------------------------------------------------------
+    def _inversion(self, tours):
+        """Đảo ngược đoạn [i, j] ngẫu nhiên của mỗi hàng"""
+        m, n = tours.shape
+        cuts = np.sort(self.rng.integers(0, n, (m, 2)), axis=1)
+        i, j = cuts[:, :1], cuts[:, 1:]
+        cols = np.arange(n)
+        idx = np.where((cols >= i) & (cols <= j), i + j - cols, cols)
+        return np.take_along_axis(tours, idx, axis=1)
+
+    def _evolve(self):
+        N, n = self.pop_size, self.problem.n_cities
+        rows = np.arange(N)
+        # 1. Khởi tạo quần thể: N hoán vị ngẫu nhiên (argsort của ma trận ngẫu nhiên)
+        with self.phase('initialization'):
+            candidates = self.problem.neighbor_lists(self.n_candidates) if self.crossover == 'eax' else None
+            pop = np.argsort(self.rng.random((N, n)), axis=1).astype(np.int32)
+        fitness = self.evaluate_batch(pop)
+
+        best_idx = np.argmin(fitness)
+        self.update_global_best(pop[best_idx], fitness[best_idx])
+        self.save_history(pop, fitness)
+
+        for _ in range(self.max_iter):
+            # A. Selection (Tournament)
+            with self.phase('selection'):
+                contenders = self.rng.integers(0, N, (N, self.tournament_size))
+                winners = contenders[rows, np.argmin(fitness[contenders], axis=1)]
+                parents = pop[winners]
+                mates = parents[self.rng.permutation(N)]
+
+            # B. Crossover
+            with self.phase('variation'):
+                offspring = parents.copy()
+                cross = self.rng.random(N) < self.crossover_rate
+                if np.any(cross):
+                    offspring[cross] = self._crossover(parents[cross], mates[cross], candidates)
+
+                # C. Mutation (Inversion)
+                mutate = self.rng.random(N) < self.mutation_rate
+                if np.any(mutate):
+                    offspring[mutate] = self._inversion(offspring[mutate])
+
+            # D. Update + Elitism: n_elite cá thể tốt nhất thế hệ cũ thay cho các con kém nhất
+            offspring_fitness = self.evaluate_batch(offspring)
+            with self.phase('selection'):
+                if self.n_elite > 0:
+                    elite = np.argpartition(fitness, self.n_elite - 1)[:self.n_elite]
+                    worst = np.argpartition(offspring_fitness, N - self.n_elite)[N - self.n_elite:]
+                    offspring[worst] = pop[elite]
+                    offspring_fitness[worst] = fitness[elite]
+                pop = offspring
+                fitness = offspring_fitness
+
+                # Cập nhật Global Best
+                current_best_idx = np.argmin(fitness)
+                if fitness[current_best_idx] < self.global_best_fitness:
+                    self.update_global_best(pop[current_best_idx], fitness[current_best_idx])
+
+            self.save_history(pop, fitness)
+
+        return self.global_best_solution, self.global_best_fitness
@@ -0,0 +1,87 @@
+import numpy as np
+
+class ConvergenceHistory:
+    """
+    Bộ ghi lịch sử hội tụ dùng mảng NumPy cấp phát trước (thay cho list.append).
+    Mỗi điểm ghi gồm: vòng lặp, fitness tốt nhất, fitness trung bình của quần thể, độ đa dạng.
+    stride > 1: chỉ ghi 1 điểm sau mỗi stride vòng lặp (điểm cuối cùng luôn được giữ lại).
+    """
+    # Giới hạn số điểm cấp phát ban đầu (VD: max_iter rất lớn khi chạy theo time_limit)
+    MAX_PREALLOC = 1 << 16
+
+    def __init__(self, capacity, stride=1):
+        """
+        Args:
+            capacity: Số vòng lặp dự kiến (max_iter hoặc ngân sách đánh giá), bộ đệm tự mở rộng nếu vượt
+            stride: Bước ghi
+        """
+        self.stride = max(1, int(stride))
+        size = min(max(1, int(capacity)) // self.stride + 2, self.MAX_PREALLOC)
+        self._iters = np.empty(size, dtype=np.int64)
+        self._best = np.empty(size)
+        self._mean = np.empty(size)
+        self._diversity = np.empty(size)
+        self._n = 0        # Số điểm đã ghi
+        self._calls = 0    # Số lần gọi record (= số vòng lặp đã qua)
+        self._pending = None
+
+    def due(self):
+        """True nếu lần gọi record tiếp theo sẽ được ghi (dùng để bỏ qua tính toán thống kê không cần thiết)"""
+        return self._calls % self.stride == 0
+
+    def _write(self, iteration, best, mean, diversity):
+        if self._n == len(self._best):
+            # Hết chỗ (VD: chạy theo time_limit) -> nhân đôi bộ đệm
+            grow = len(self._best)
+            self._iters = np.concatenate([self._iters, np.empty(grow, dtype=np.int64)])
+            self._best = np.concatenate([self._best, np.empty(grow)])
+            self._mean = np.concatenate([self._mean, np.empty(grow)])
+            self._diversity = np.concatenate([self._diversity, np.empty(grow)])
+        k = self._n
+        self._iters[k] = iteration
+        self._best[k] = best
+        self._mean[k] = mean
+        self._diversity[k] = diversity
+        self._n += 1
+
+    def record(self, best, mean=np.nan, diversity=np.nan):
+        if self.due():
+            self._write(self._calls, best, mean, diversity)
+            self._pending = None
+        else:
+            self._pending = (self._calls, best, mean, diversity)
+        self._calls += 1
+
+    def finalize(self):
+        """Ghi nốt điểm cuối cùng nếu nó bị bỏ qua do stride"""
+        if self._pending is not None:
+            self._write(*self._pending)
+            self._pending = None
+
+    @property
+    def iterations(self):
+        return self._iters[:self._n]
+
+    @property
+    def best(self):
+        return self._best[:self._n]
+
+    @property
+    def mean(self):
+        return self._mean[:self._n]
+
+    @property
+    def diversity(self):
+        return self._diversity[:self._n]
+
+    def __len__(self):
+        return self._n
+
+    def as_dict(self):
+        """Xuất lịch sử dưới dạng dict các mảng (bản sao)"""
+        return {
+            "iterations": self.iterations.copy(),
+            "best": self.best.copy(),
+            "mean": self.mean.copy(),
+            "diversity": self.diversity.copy()
+        }
@@ -0,0 +1,81 @@
+import numpy as np
+from algorithms.optimizer import Optimizer
+
+class TLBO(Optimizer):
+    """
+    Teaching-Learning-Based Optimization (TLBO) - Tối ưu hóa dựa trên dạy và học
+    Không có tham số riêng cần tinh chỉnh (chỉ pop_size và max_iter).
+    Mỗi thế hệ gồm 2 pha, cả lớp được cập nhật cùng lúc bằng phép toán mảng:
+    - Pha giáo viên (Teacher): x_new = x + r * (x_teacher - T_F * x_mean), T_F ∈ {1, 2}
+    - Pha học viên (Learner): mỗi học viên học từ 1 bạn ghép cặp ngẫu nhiên (hoán vị),
+      tiến về phía bạn nếu bạn giỏi hơn, ngược lại thì đi ra xa.
+    Sau mỗi pha là chọn lọc tham lam (chỉ nhận lời giải tốt hơn), đánh giá bằng 1 lần gọi evaluate_batch.
+    """
+    def __init__(self, problem, pop_size=50, **kwargs):
+        super().__init__(problem, pop_size=pop_size, **kwargs)
+        if pop_size < 2:
+            raise ValueError("TLBO cần pop_size >= 2")
+
+    def _partners(self, N):
+        """
+        Ghép cặp ngẫu nhiên không ai tự ghép với chính mình:
+        xếp lớp theo 1 hoán vị ngẫu nhiên và cho mỗi người học từ người đứng sau (vòng tròn).
+        """
+        perm = self.rng.permutation(N)
+        partner = np.empty(N, dtype=int)
+        partner[perm] = np.roll(perm, -1)
+        return partner
+
+    def _greedy(self, pop, fitness, new_pop, lb, ub):
+        """Sửa biên, đánh giá cả lớp 1 lần và giữ lại lời giải tốt hơn (cập nhật tại chỗ)"""
+        with self.phase('variation'):
+            new_pop = np.clip(new_pop, lb, ub)
+        new_fitness = self.evaluate_batch(new_pop)
+        with self.phase('selection'):
+            better = new_fitness < fitness
+            pop[better] = new_pop[better]
+            fitness[better] = new_fitness[better]
+
+    def _evolve(self):
+        N, dim = self.pop_size, self.problem.dim
+        lb = self.problem.bounds[:, 0]
+        ub = self.problem.bounds[:, 1]
+
+        # 1. Khởi tạo lớp học
+        with self.phase('initialization'):
+            pop = self.rng.uniform(lb, ub, (N, dim))
+        fitness = self.evaluate_batch(pop)
+
+        best_idx = np.argmin(fitness)
+        self.update_global_best(pop[best_idx], fitness[best_idx])
+        self.save_history(pop, fitness)
+
+        for _ in range(self.max_iter):
+            # 2. Pha giáo viên: kéo trung bình của lớp về phía người giỏi nhất
+            with self.phase('variation'):
+                teacher = pop[np.argmin(fitness)]
+                mean = np.mean(pop, axis=0)
+                T_F = self.rng.integers(1, 3, (N, 1))  # Hệ số giảng dạy (Teaching factor)
+                r = self.rng.random((N, dim))
+                new_pop = pop + r * (teacher - T_F * mean)
+            self._greedy(pop, fitness, new_pop, lb, ub)
+
+            # 3. Pha học viên: học lẫn nhau theo cặp
+            with self.phase('variation'):
+                partner = self._partners(N)
+                # Hướng đi: về phía bạn nếu bạn giỏi hơn, ngược lại đi ra xa
+                direction = np.where((fitness[partner] < fitness)[:, np.newaxis],
+                                     pop[partner] - pop, pop - pop[partner])
+                r = self.rng.random((N, dim))
+                new_pop = pop + r * direction
+            self._greedy(pop, fitness, new_pop, lb, ub)
+
+            # Cập nhật Global Best
+            with self.phase('selection'):
+                curr_best_idx = np.argmin(fitness)
+                if fitness[curr_best_idx] < self.global_best_fitness:
+                    self.update_global_best(pop[curr_best_idx], fitness[curr_best_idx])
+
+            self.save_history(pop, fitness)
+
+        return self.global_best_solution, self.global_best_fitness
@@ -0,0 +1,235 @@
+import queue
+import numpy as np
+import multiprocessing as mp
+from multiprocessing.shared_memory import SharedMemory
+from threading import BrokenBarrierError
+from algorithms.optimizer import Optimizer
+
+class _Migrator:
+    """
+    Callback gắn vào optimizer của từng đảo (generation_callback).
+    Sau mỗi migration_interval thế hệ: ghi các cá thể tốt nhất vào vùng nhớ chia sẻ,
+    chờ mọi đảo (Barrier), đọc dân di cư từ đảo nguồn và thay thế các cá thể kém nhất.
+    """
+    def __init__(self, island_id, n_islands, positions, fitnesses, barrier,
+                 migration_interval, topology, topology_seed):
+        self.island_id = island_id
+        self.n_islands = n_islands
+        self.positions = positions      # View (n_islands, n_migrants, dim) trên shared memory
+        self.fitnesses = fitnesses      # View (n_islands, n_migrants) trên shared memory
+        self.barrier = barrier
+        self.migration_interval = migration_interval
+        self.topology = topology
+        self.topology_seed = topology_seed
+        self.generation = -1            # Lần gọi đầu tiên là quần thể khởi tạo (thế hệ 0)
+        self.epoch = 0
+        self.broken = False
+
+    def _source(self):
+        """Đảo gửi dân di cư tới đảo hiện tại trong đợt di cư này"""
+        if self.topology == 'ring':
+            shift = 1
+        else:
+            # Mọi đảo sinh cùng 1 độ dịch ngẫu nhiên (cùng seed, cùng epoch) -> không cần trao đổi thêm
+            shift = np.random.default_rng([self.topology_seed, self.epoch]).integers(1, self.n_islands)
+        return (self.island_id - shift) % self.n_islands
+
+    def __call__(self, optimizer, population, fitness):
+        self.generation += 1
+        if self.broken or self.generation == 0 or self.generation % self.migration_interval != 0:
+            return
+
+        k = self.positions.shape[1]
+        order = np.argsort(fitness)
+        if optimizer.maximize:
+            order = order[::-1]
+        best, worst = order[:k], order[-k:]
+
+        self.positions[self.island_id] = population[best]
+        self.fitnesses[self.island_id] = fitness[best]
+        try:
+            # Chờ mọi đảo ghi xong -> đọc -> chờ mọi đảo đọc xong trước khi ai đó ghi đợt sau
+            self.barrier.wait()
+            src = self._source()
+            immigrants = self.positions[src].copy()
+            immigrant_fit = self.fitnesses[src].copy()
+            self.barrier.wait()
+        except BrokenBarrierError:
+            # Một đảo đã dừng sớm -> các đảo còn lại tiếp tục chạy độc lập
+            self.broken = True
+            return
+        self.epoch += 1
+
+        population[worst] = immigrants
+        fitness[worst] = immigrant_fit
+        best_imm = np.argmax(immigrant_fit) if optimizer.maximize else np.argmin(immigrant_fit)
+        optimizer.update_global_best(population[worst[best_imm]], immigrant_fit[best_imm])
+
+
+def _island_worker(island_id, optimizer_class, problem, params, seed, shm_names, shapes,
+                   barrier, result_queue, migration_interval, topology, topology_seed):
+    """Chạy 1 đảo trong process riêng (hàm cấp module để có thể pickle)"""
+    shm_pos, shm_fit = SharedMemory(name=shm_names[0]), SharedMemory(name=shm_names[1])
+    try:
+        positions = np.ndarray(shapes[0], dtype=np.float64, buffer=shm_pos.buf)
+        fitnesses = np.ndarray(shapes[1], dtype=np.float64, buffer=shm_fit.buf)
+
+        optimizer = optimizer_class(problem, seed=seed, **params)
+        optimizer.generation_callback = _Migrator(island_id, shapes[0][0], positions, fitnesses, barrier,
+                                                  migration_interval, topology, topology_seed)
+        try:
+            solution, fitness, history = optimizer.solve()
+        finally:
+            # Đảo dừng sớm (hoặc lỗi) sẽ không tham gia các đợt di cư sau -> giải phóng các đảo đang chờ
+            if optimizer.stop_reason != 'max_iter':
+                barrier.abort()
+        result_queue.put((island_id, solution, fitness, history.copy(), optimizer.n_evals, optimizer.stop_reason))
+    except BaseException as e:
+        barrier.abort()
+        result_queue.put((island_id, None, None, None, 0, repr(e)))
+    finally:
+        del positions, fitnesses
+        shm_pos.close()
+        shm_fit.close()
+
+
+class IslandModel(Optimizer):
+    """
+    Mô hình đảo (Island Model): chạy K quần thể con của cùng một thuật toán trong K process riêng.
+    Sau mỗi migration_interval thế hệ, n_migrants cá thể tốt nhất của mỗi đảo di cư sang đảo khác
+    (topology 'ring': i-1 -> i, 'random': độ dịch ngẫu nhiên mỗi đợt) qua shared memory thay vì pickle.
+    Dùng được với mọi thuật toán quần thể truyền (population, fitness) vào save_history().
+    Điều kiện dừng của IslandModel được chuyển xuống các đảo: max_fe chia đều cho các đảo,
+    time_limit / target_fitness / stagnation áp dụng cho từng đảo. stop_reason lấy từ kết quả các đảo.
+    """
+    # Chu kỳ (giây) kiểm tra hàng đợi kết quả và tình trạng các process
+    POLL_INTERVAL = 0.5
+    # Điều kiện dừng được chuyển tiếp xuống từng đảo
+    FORWARDED = ('time_limit', 'target_fitness', 'stagnation', 'stagnation_tol')
+    # Thứ tự ưu tiên khi các đảo dừng vì các lý do khác nhau
+    STOP_PRIORITY = ('target_fitness', 'max_fe', 'time_limit', 'stagnation', 'max_iter')
+
+    def __init__(self, problem, optimizer_class, n_islands=4, migration_interval=10, n_migrants=2,
+                 topology='ring', island_params=None, **kwargs):
+        """
+        Args:
+            optimizer_class: Class thuật toán chạy trên mỗi đảo (VD: GeneticAlgorithm, PSO)
+            n_islands: Số đảo (= số process)
+            migration_interval: Số thế hệ giữa 2 đợt di cư
+            n_migrants: Số cá thể di cư mỗi đợt
+            topology: 'ring' hoặc 'random'
+            island_params: Tham số cho thuật toán trên mỗi đảo (pop_size, ...).
+                           max_iter, time_limit, target_fitness, stagnation mặc định lấy theo IslandModel,
+                           max_fe mặc định là max_fe của IslandModel chia đều cho các đảo.
+        """
+        super().__init__(problem, **kwargs)
+        if topology not in ('ring', 'random'):
+            raise ValueError(f"topology phải là 'ring' hoặc 'random', nhận được: {topology}")
+        if n_islands < 2:
+            raise ValueError(f"n_islands phải >= 2, nhận được: {n_islands}")
+        self.optimizer_class = optimizer_class
+        self.n_islands = n_islands
+        self.migration_interval = max(1, migration_interval)
+        self.n_migrants = n_migrants
+        self.topology = topology
+        island_params = dict(island_params or {})
+        if self.max_fe is not None and 'max_fe' not in island_params:
+            if self.max_fe < n_islands:
+                raise ValueError(f"max_fe ({self.max_fe}) phải >= n_islands ({n_islands})")
+        defaults = {'max_iter': self.max_iter, 'maximize': self.maximize}
+        defaults.update({name: kwargs[name] for name in self.FORWARDED if kwargs.get(name) is not None})
+        self.island_params = {**defaults, **island_params}
+        self.island_results = []
+
+    def _params_for(self, island_id):
+        """Tham số của đảo island_id: ngân sách max_fe chia đều, phần dư cho các đảo đầu"""
+        params = dict(self.island_params)
+        if self.max_fe is not None and 'max_fe' not in params:
+            share, extra = divmod(self.max_fe, self.n_islands)
+            params['max_fe'] = share + (1 if island_id < extra else 0)
+        return params
+
+    def _collect(self, processes, result_queue, barrier):
+        """
+        Nhận kết quả của mọi đảo. Hàng đợi được đọc với timeout: nếu 1 process đã chết mà không gửi kết quả
+        (VD: bị hệ điều hành kết thúc) thì dừng các đảo còn lại và báo lỗi thay vì chờ mãi.
+        """
+        results = {}
+        missing_polls = 0
+        while len(results) < len(processes):
+            try:
+                result = result_queue.get(timeout=self.POLL_INTERVAL)
+                results[result[0]] = result
+                continue
+            except queue.Empty:
+                pass
+            lost = [i for i, p in enumerate(processes) if i not in results and not p.is_alive()]
+            if not lost:
+                missing_polls = 0
+                continue
+            # Cho dữ liệu còn nằm trong pipe thêm 1 lượt chờ trước khi kết luận process bị mất
+            missing_polls += 1
+            if missing_polls > 1:
+                barrier.abort()
+                for p in processes:
+                    if p.is_alive():
+                        p.terminate()
+                    p.join()
+                raise RuntimeError(f"Đảo {lost[0]} dừng đột ngột (exitcode={processes[lost[0]].exitcode}) "
+                                   f"mà không gửi kết quả")
+        return [results[i] for i in range(len(processes))]
+
+    def _evolve(self):
+        dim = self.problem.dim
+        shapes = ((self.n_islands, self.n_migrants, dim), (self.n_islands, self.n_migrants))
+        shm = [SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8)) for shape in shapes]
+
+        # Seed cho từng đảo và cho topology đều sinh từ rng của IslandModel -> lặp lại được
+        seeds = np.random.SeedSequence(int(self.rng.integers(2**63))).spawn(self.n_islands)
+        topology_seed = int(self.rng.integers(2**63))
+
+        ctx = mp.get_context()
+        barrier = ctx.Barrier(self.n_islands)
+        result_queue = ctx.Queue()
+        processes = [
+            ctx.Process(target=_island_worker,
+                        args=(i, self.optimizer_class, self.problem, self._params_for(i), seeds[i],
+                              [s.name for s in shm], shapes, barrier, result_queue,
+                              self.migration_interval, self.topology, topology_seed))
+            for i in range(self.n_islands)
+        ]
+        try:
+            for p in processes:
+                p.start()
+            # Lấy kết quả trước khi join để tránh kẹt khi hàng đợi chứa dữ liệu lớn
+            results = self._collect(processes, result_queue, barrier)
+            for p in processes:
+                p.join()
+        finally:
+            for s in shm:
+                s.close()
+                s.unlink()
+
+        failed = [r for r in results if r[1] is None]
+        if failed:
+            raise RuntimeError(f"Đảo {failed[0][0]} gặp lỗi: {failed[0][5]}")
+
+        self.island_results = results
+        # Lý do dừng chung: lý do có độ ưu tiên cao nhất trong các đảo
+        reasons = [r[5] for r in results]
+        rank = {reason: i for i, reason in enumerate(self.STOP_PRIORITY)}
+        self.stop_reason = min(reasons, key=lambda reason: rank.get(reason, len(rank)))
+        histories = []
+        for _, solution, fitness, history, n_evals, _ in results:
+            self.update_global_best(solution, fitness)
+            self.n_evals += n_evals
+            histories.append(history)
+
+        # Lịch sử chung: fitness tốt nhất trên mọi đảo tại mỗi thời điểm ghi
+        n_points = max(len(h) for h in histories)
+        padded = np.array([np.concatenate([h, np.full(n_points - len(h), h[-1])]) for h in histories])
+        combined = np.max(padded, axis=0) if self.maximize else np.min(padded, axis=0)
+        for value in combined:
+            self.recorder.record(value)
+
+        return self.global_best_solution, self.global_best_fitness
@@ -1,27 +1,92 @@
 import numpy as np
 import time
+from problems.cache import CachedProblem
+from algorithms.history import ConvergenceHistory
+from algorithms.profiling import PhaseProfiler, NULL_PHASE
+
+class TerminationReached(Exception):
+    """
+    Được ném ra bên trong _evolve() khi một điều kiện dừng được thỏa mãn
+    (hết ngân sách đánh giá, hết thời gian, đạt mục tiêu, trì trệ).
+    solve() bắt ngoại lệ này và trả về kết quả tốt nhất đã tìm được.
+    """
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
 
 class Optimizer:
     """
     Class cha (Base Class) cho tất cả các thuật toán tối ưu.
     """
-    def __init__(self, problem, maximize=False, **kwargs):
+    def __init__(self, problem, maximize=False, seed=None, rng=None, **kwargs):
         """
         Args:
             problem: Object chứa thông tin bài toán (hàm mục tiêu, giới hạn...)
             maximize: True nếu tìm Max, False nếu tìm Min (Mặc định là Min)
+            seed: Seed (int hoặc np.random.SeedSequence) cho bộ sinh số ngẫu nhiên riêng của thuật toán
+            rng: np.random.Generator có sẵn (ưu tiên hơn seed)
             kwargs: Các tham số khác (pop_size, max_iter...)
+                    cache_size: > 0 để bọc bài toán bằng CachedProblem (LRU) với dung lượng này
+                    cache_tol: Sai số làm tròn khi băm lời giải liên tục (None = so khớp chính xác)
+                    Khi bật cache, n_evals và max_fe vẫn đếm số lời giải được yêu cầu đánh giá (kể cả cache hit)
+                    để ngân sách so sánh được với lần chạy không cache; số lần thực sự gọi hàm mục tiêu gốc
+                    là cache_info()['misses'].
+                    Điều kiện dừng (ngoài max_iter, mặc định đều tắt):
+                    max_fe: Số lần đánh giá fitness tối đa
+                    time_limit: Thời gian chạy tối đa (giây)
+                    target_fitness: Dừng khi fitness tốt nhất đạt tới giá trị này
+                    stagnation: Dừng khi fitness tốt nhất không cải thiện quá stagnation_tol sau N vòng lặp liên tiếp
+                    Lịch sử hội tụ:
+                    history_stride: Chỉ ghi lịch sử sau mỗi N vòng lặp (mặc định 1)
+                    track_diversity: True để ghi thêm độ đa dạng quần thể mỗi lần ghi
+                    Profiling (mặc định tắt, gần như không tốn chi phí khi tắt):
+                    profile: True để đo thời gian từng pha (xem PhaseProfiler), 'memory' để đo thêm bộ nhớ
         """
+        # Bật cache fitness (tùy chọn) cho các hàm mục tiêu đắt
+        cache_size = kwargs.get('cache_size')
+        if cache_size:
+            problem = CachedProblem(problem, capacity=cache_size, tolerance=kwargs.get('cache_tol'))
+
         self.problem = problem
         self.maximize = maximize
+
+        # Mỗi optimizer có bộ sinh số ngẫu nhiên riêng (không dùng trạng thái toàn cục np.random)
+        # -> chạy song song nhiều optimizer (thread/process) vẫn cho kết quả lặp lại được
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
         
         # Lấy tham số cấu hình, nếu không có thì dùng mặc định
         self.max_iter = kwargs.get('max_iter', 100)
         self.pop_size = kwargs.get('pop_size', 30) # Dùng cho các thuật toán bầy đàn/tiến hóa
+
+        # Điều kiện dừng
+        self.max_fe = kwargs.get('max_fe')
+        self.time_limit = kwargs.get('time_limit')
+        self.target_fitness = kwargs.get('target_fitness')
+        self.stagnation = kwargs.get('stagnation')
+        self.stagnation_tol = kwargs.get('stagnation_tol', 0.0)
+
+        # Bộ đếm số lần đánh giá fitness và lý do dừng
+        self.n_evals = 0
+        self.stop_reason = None
+        self._start_time = None
+        self._stagnant_iters = 0
+        self._last_best = None
+
+        # Callback gọi sau mỗi thế hệ: callback(optimizer, population, fitness).
+        # Được phép sửa trực tiếp population/fitness (VD: di cư trong mô hình đảo - IslandModel)
+        self.generation_callback = None
         
-        # Lưu lịch sử fitness tốt nhất qua từng vòng lặp (để vẽ biểu đồ)
-        self.history = []     
-        self.run_time = 0     
+        # Lưu lịch sử hội tụ (best/mean/diversity) vào bộ đệm NumPy cấp phát trước (để vẽ biểu đồ)
+        # Số vòng lặp không vượt quá max_iter (hoặc max_fe vì mỗi vòng đánh giá ít nhất 1 lần)
+        capacity = self.max_iter if self.max_fe is None else min(self.max_iter, self.max_fe)
+        self.track_diversity = kwargs.get('track_diversity', False)
+        self.recorder = ConvergenceHistory(capacity + 1, stride=kwargs.get('history_stride', 1))
+        self.run_time = 0
+
+        # Đo thời gian theo pha: các thuật toán đánh dấu pha bằng `with self.phase('variation'):`
+        # 'evaluation' (evaluate/evaluate_batch) và 'bookkeeping' (save_history) được đo tự động
+        profile = kwargs.get('profile', False)
+        self.profiler = PhaseProfiler(memory=profile == 'memory') if profile else None
         
         # Kết quả tốt nhất tìm được
         self.global_best_solution = None
@@ -31,21 +96,118 @@ class Optimizer:
         """
         Hàm khung sườn để chạy thuật toán.
         """
-        start_time = time.time()
-        
+        if self.profiler is not None:
+            self.profiler.start()
+        start_time = time.perf_counter_ns()
+        self._start_time = time.perf_counter()
+        self.stop_reason = 'max_iter'
+
         # Gọi hàm xử lý chính (các class con sẽ phải tự định nghĩa hàm này)
-        solution, fitness = self._evolve() 
-        
-        end_time = time.time()
-        self.run_time = end_time - start_time
+        try:
+            solution, fitness = self._evolve()
+        except TerminationReached as stop:
+            # Dừng sớm: trả về kết quả tốt nhất đã ghi nhận
+            self.stop_reason = stop.reason
+            solution, fitness = self.global_best_solution, self.global_best_fitness
+        finally:
+            if self.profiler is not None:
+                self.profiler.stop()
+        self.recorder.finalize()
+
+        end_time = time.perf_counter_ns()
+        self.run_time = (end_time - start_time) / 1e9
         
         # Trả về: Giải pháp tốt nhất, Fitness tốt nhất, Lịch sử hội tụ
         return solution, fitness, self.history
 
+    @property
+    def history(self):
+        """Lịch sử fitness tốt nhất (mảng NumPy, mỗi phần tử ứng với 1 lần ghi)"""
+        return self.recorder.best
+
     def _evolve(self):
         """Logic riêng của từng thuật toán sẽ nằm ở đây (Abstract method)"""
         raise NotImplementedError("Lỗi: Bạn chưa viết hàm _evolve() cho thuật toán này!")
 
+    def phase(self, name):
+        """
+        Ngữ cảnh đánh dấu 1 pha của thuật toán: `with self.phase('selection'): ...`
+        Pha chuẩn: 'initialization', 'variation', 'evaluation', 'selection', 'bookkeeping'.
+        Khi tắt profiling trả về ngữ cảnh rỗng dùng chung.
+        """
+        return NULL_PHASE if self.profiler is None else self.profiler.phase(name)
+
+    def profile_report(self):
+        """Báo cáo thời gian / số lần gọi / bộ nhớ theo pha của lần chạy gần nhất (None nếu tắt profiling)"""
+        return None if self.profiler is None else self.profiler.report()
+
+    def evaluate(self, x):
+        """Đánh giá 1 lời giải. Mọi thuật toán nên gọi hàm này để số lần đánh giá được đếm tự động."""
+        if self.max_fe is not None and self.n_evals >= self.max_fe:
+            raise TerminationReached('max_fe')
+        self.n_evals += 1
+        if self.profiler is None:
+            return self.problem.fitness(x)
+        with self.profiler.phase('evaluation'):
+            return self.problem.fitness(x)
+
+    def evaluate_batch(self, X):
+        """
+        Đánh giá cả quần thể X (pop_size, dim) trong 1 lần gọi problem.fitness_batch.
+        Nếu batch vượt ngân sách max_fe, chỉ các hàng còn trong ngân sách được đánh giá
+        (và được xét cập nhật Global Best) trước khi dừng.
+        """
+        n = len(X)
+        if self.max_fe is not None:
+            remaining = self.max_fe - self.n_evals
+            if remaining <= 0:
+                raise TerminationReached('max_fe')
+            if n > remaining:
+                with self.phase('evaluation'):
+                    fitness = self.problem.fitness_batch(X[:remaining])
+                self.n_evals += remaining
+                best_idx = np.argmax(fitness) if self.maximize else np.argmin(fitness)
+                self.update_global_best(X[best_idx], fitness[best_idx])
+                raise TerminationReached('max_fe')
+        self.n_evals += n
+        if self.profiler is None:
+            return self.problem.fitness_batch(X)
+        with self.profiler.phase('evaluation'):
+            return self.problem.fitness_batch(X)
+
+    def check_termination(self):
+        """
+        Kiểm tra các điều kiện dừng theo vòng lặp (được gọi tự động trong save_history).
+        Ném TerminationReached nếu cần dừng.
+        """
+        best = self.global_best_fitness
+        if self.target_fitness is not None:
+            reached = best >= self.target_fitness if self.maximize else best <= self.target_fitness
+            if reached:
+                raise TerminationReached('target_fitness')
+
+        if self.stagnation is not None:
+            if self._last_best is None:
+                improved = True
+            elif self.maximize:
+                improved = best > self._last_best + self.stagnation_tol
+            else:
+                improved = best < self._last_best - self.stagnation_tol
+            if improved:
+                self._last_best = best
+                self._stagnant_iters = 0
+            else:
+                self._stagnant_iters += 1
+                if self._stagnant_iters >= self.stagnation:
+                    raise TerminationReached('stagnation')
+
+        if self.max_fe is not None and self.n_evals >= self.max_fe:
+            raise TerminationReached('max_fe')
+
+        if self.time_limit is not None and self._start_time is not None:
+            if time.perf_counter() - self._start_time >= self.time_limit:
+                raise TerminationReached('time_limit')
+
     def update_global_best(self, solution, fitness):
         """Hàm hỗ trợ cập nhật kết quả tốt nhất (Dùng chung cho mọi thuật toán)"""
         # Kiểm tra xem kết quả mới có tốt hơn kết quả cũ không
@@ -59,11 +221,36 @@ class Optimizer:
             # .copy() là bắt buộc với NumPy để tránh lỗi tham chiếu bộ nhớ
             self.global_best_solution = solution.copy() 
             
-    def save_history(self):
-        """Lưu fitness tốt nhất hiện tại vào lịch sử"""
-        self.history.append(self.global_best_fitness)
+    def cache_info(self):
+        """
+        Thống kê cache (hits/misses...) nếu bài toán được bọc bởi CachedProblem, ngược lại None.
+        n_evals = hits + misses: chỉ misses là lần gọi hàm mục tiêu gốc.
+        """
+        if isinstance(self.problem, CachedProblem):
+            return self.problem.cache_info()
+        return None
+
+    def save_history(self, population=None, fitness=None):
+        """
+        Lưu fitness tốt nhất hiện tại vào lịch sử, sau đó kiểm tra điều kiện dừng.
+        population / fitness (tùy chọn): quần thể và fitness của thế hệ hiện tại,
+        dùng để ghi fitness trung bình và độ đa dạng.
+        """
+        with self.phase('bookkeeping'):
+            if self.recorder.due():
+                mean = np.mean(fitness) if fitness is not None else np.nan
+                diversity = np.nan
+                if self.track_diversity and population is not None:
+                    diversity = self.calculate_diversity(population)
+                self.recorder.record(self.global_best_fitness, mean, diversity)
+            else:
+                self.recorder.record(self.global_best_fitness)
+
+            if self.generation_callback is not None and population is not None:
+                self.generation_callback(self, population, fitness)
+            self.check_termination()
 
-def calculate_diversity(self, population):
+    def calculate_diversity(self, population):
         """
         Tính độ đa dạng của quần thể (Dùng cho GA, PSO, DE...).
         Công thức: Trung bình khoảng cách từ các cá thể đến trọng tâm (center).
@@ -78,4 +265,4 @@ def calculate_diversity(self, population):
         distances = np.linalg.norm(population - center, axis=1)
         
         # Trả về khoảng cách trung bình
-        return np.mean(distances)
\ No newline at end of file
+        return np.mean(distances)
@@ -7,26 +7,70 @@ class GravitationalSearchAlgorithm(Optimizer):
     Cảm hứng: Định luật vạn vật hấp dẫn Newton.
     Cơ chế: Các vật thể hút nhau, vật có khối lượng lớn (fitness tốt) sẽ di chuyển chậm và hút các vật khác về phía mình.
     """
-    def __init__(self, problem, pop_size=50, G0=100, alpha=20, **kwargs):
+    def __init__(self, problem, pop_size=50, G0=100, alpha=20, kbest=False, final_per=0.02,
+                 chunk_size=None, max_chunk_elems=2**22, **kwargs):
         """
         G0: Hằng số hấp dẫn ban đầu
         alpha: Hằng số suy giảm (Decay constant)
+        kbest: True -> chỉ K vật thể nặng nhất được phép hút, K giảm tuyến tính theo thời gian (Rashedi 2009)
+        final_per: Tỉ lệ K/pop_size ở vòng lặp cuối (mặc định 2%)
+        chunk_size: Số vật thể xử lý mỗi lượt khi tính lực (None = tự chọn theo max_chunk_elems)
+        max_chunk_elems: Số phần tử tối đa của khối (chunk, K, dim) để giới hạn bộ nhớ
         """
         super().__init__(problem, pop_size=pop_size, **kwargs)
         self.G0 = G0
         self.alpha = alpha
+        self.kbest = kbest
+        self.final_per = final_per
+        self.chunk_size = chunk_size
+        self.max_chunk_elems = max_chunk_elems
+
+    def _get_k(self, t):
+        """Số vật thể được phép hút ở vòng lặp t"""
+        if not self.kbest:
+            return self.pop_size
+        ratio = self.final_per + (1 - t / self.max_iter) * (1 - self.final_per)
+        return int(np.clip(round(self.pop_size * ratio), 1, self.pop_size))
+
+    def _compute_acceleration(self, X, M, G, k):
+        """
+        Tính gia tốc cho toàn bộ quần thể bằng phép toán mảng (broadcast).
+        a_i = sum_j( rand * G * M_j / R_ij * (x_j - x_i) ), j thuộc nhóm K vật thể nặng nhất.
+        Quần thể được chia thành từng khối (chunk) để bộ nhớ không vượt quá (chunk, K, dim).
+        """
+        n, dim = X.shape
+        if k < n:
+            # Chọn K vật thể nặng nhất (không cần sắp xếp toàn bộ)
+            idx = np.argpartition(-M, k - 1)[:k]
+            X_k, M_k = X[idx], M[idx]
+        else:
+            X_k, M_k = X, M
+
+        chunk = self.chunk_size or max(1, self.max_chunk_elems // (k * dim))
+        A = np.empty_like(X)
+        for start in range(0, n, chunk):
+            X_c = X[start:start + chunk]
+            # diff[i, j] = x_j - x_i, dạng (chunk, K, dim)
+            diff = X_k[np.newaxis, :, :] - X_c[:, np.newaxis, :]
+            dist = np.sqrt(np.einsum('ijd,ijd->ij', diff, diff))
+            # Cặp i == j có diff = 0 nên tự động không đóng góp lực
+            weight = G * M_k[np.newaxis, :] / (dist + 1e-10)
+            rand_factor = self.rng.random(diff.shape)
+            A[start:start + chunk] = np.einsum('ij,ijd->id', weight, rand_factor * diff)
+        return A
 
     def _evolve(self):
         dim = self.problem.dim
         # 1. Khởi tạo vị trí và vận tốc
-        X = np.random.uniform(self.problem.bounds[:, 0], self.problem.bounds[:, 1], (self.pop_size, dim))
-        V = np.zeros((self.pop_size, dim))
-        fitness = np.apply_along_axis(self.problem.fitness, 1, X)
+        with self.phase('initialization'):
+            X = self.rng.uniform(self.problem.bounds[:, 0], self.problem.bounds[:, 1], (self.pop_size, dim))
+            V = np.zeros((self.pop_size, dim))
+        fitness = self.evaluate_batch(X)
 
         # Cập nhật Best ban đầu
         best_idx = np.argmin(fitness)
         self.update_global_best(X[best_idx], fitness[best_idx])
-        self.save_history()
+        self.save_history(X, fitness)
 
         for t in range(self.max_iter):
             # 2. Cập nhật Hằng số hấp dẫn G(t) giảm dần theo thời gian
@@ -34,51 +78,46 @@ class GravitationalSearchAlgorithm(Optimizer):
 
             # 3. Tính khối lượng (Mass) của từng vật thể
             # Công thức: M_i = (fit_i - worst) / (best - worst)
-            best_val = np.min(fitness)
-            worst_val = np.max(fitness)
+            with self.phase('selection'):
+                best_val = np.min(fitness)
+                worst_val = np.max(fitness)
             
-            # Tránh chia cho 0
-            if worst_val == best_val:
-                M = np.ones(self.pop_size)
-            else:
-                M = (fitness - worst_val) / (best_val - worst_val) # Với bài toán Min: (worst - fit) / (worst - best) ?
-                # Sửa lại cho bài toán Minimization:
-                # fit càng nhỏ (tốt) -> Mass càng to
-                M = (worst_val - fitness) / (worst_val - best_val)
+                # Tránh chia cho 0
+                if worst_val == best_val:
+                    M = np.ones(self.pop_size)
+                else:
+                    M = (fitness - worst_val) / (best_val - worst_val) # Với bài toán Min: (worst - fit) / (worst - best) ?
+                    # Sửa lại cho bài toán Minimization:
+                    # fit càng nhỏ (tốt) -> Mass càng to
+                    M = (worst_val - fitness) / (worst_val - best_val)
 
-            # Chuẩn hóa Mass
-            M = M / (np.sum(M) + 1e-10)
+                # Chuẩn hóa Mass
+                M = M / (np.sum(M) + 1e-10)
 
             # 4. Tính Gia tốc (Acceleration) a = F/M
             # F_ij = G * (M_i * M_j) / R * (x_j - x_i)
             # a_i = sum(F_ij) / M_i = sum( G * M_j / R * (x_j - x_i) )
             
-            A = np.zeros((self.pop_size, dim))
-            for i in range(self.pop_size):
-                for j in range(self.pop_size):
-                    if i != j:
-                        dist = np.linalg.norm(X[i] - X[j])
-                        force = G * M[j] * (X[j] - X[i]) / (dist + 1e-10)
-                        # Thêm một chút ngẫu nhiên vào lực hút (theo một số biến thể GSA)
-                        rand_factor = np.random.rand(dim)
-                        A[i] += rand_factor * force
+            # Thêm một chút ngẫu nhiên vào lực hút (theo một số biến thể GSA)
+            with self.phase('variation'):
+                A = self._compute_acceleration(X, M, G, self._get_k(t))
             
-            # 5. Cập nhật Vận tốc và Vị trí
-            # V(t+1) = rand * V(t) + A(t)
-            V = np.random.rand(self.pop_size, dim) * V + A
-            X = X + V
+                # 5. Cập nhật Vận tốc và Vị trí
+                # V(t+1) = rand * V(t) + A(t)
+                V = self.rng.random((self.pop_size, dim)) * V + A
+                X = X + V
             
-            # Giới hạn không gian tìm kiếm
-            X = np.clip(X, self.problem.bounds[:, 0], self.problem.bounds[:, 1])
+                # Giới hạn không gian tìm kiếm
+                X = np.clip(X, self.problem.bounds[:, 0], self.problem.bounds[:, 1])
 
             # 6. Đánh giá lại
-            fitness = np.apply_along_axis(self.problem.fitness, 1, X)
+            fitness = self.evaluate_batch(X)
 
             # Cập nhật Global Best
             curr_best_idx = np.argmin(fitness)
             if fitness[curr_best_idx] < self.global_best_fitness:
                 self.update_global_best(X[curr_best_idx], fitness[curr_best_idx])
             
-            self.save_history()
+            self.save_history(X, fitness)
 
         return self.global_best_solution, self.global_best_fitness
\ No newline at end of file
@@ -9,13 +9,60 @@ class HarmonySearch(Optimizer):
     - HMCR (Harmony Memory Considering Rate): Xác suất chọn giá trị từ bộ nhớ.
     - PAR (Pitch Adjusting Rate): Xác suất điều chỉnh nhẹ (pitch adjustment) giá trị đã chọn.
     - BW (Bandwidth): Độ lớn bước điều chỉnh.
+    Mỗi vòng lặp ứng tác batch_size bản nhạc cùng lúc (mọi quyết định bộ nhớ / chỉnh cao độ / ngẫu nhiên
+    được rút thành mặt nạ cho mọi chiều), đánh giá trong 1 lần gọi và trộn vào bộ nhớ bằng sắp xếp một phần.
+    ihs=True: Improved Harmony Search (Mahdavi 2007) - PAR tăng tuyến tính, BW giảm theo hàm mũ.
     """
-    def __init__(self, problem, pop_size=20, hmcr=0.9, par=0.3, bw=0.01, **kwargs):
+    def __init__(self, problem, pop_size=20, hmcr=0.9, par=0.3, bw=0.01, batch_size=1,
+                 ihs=False, par_min=0.35, par_max=0.99, bw_min=1e-4, bw_max=None, **kwargs):
+        """
+        batch_size: Số bản nhạc mới mỗi vòng lặp (B)
+        ihs: Bật lịch PAR/BW thích nghi (khi đó par, bw bị bỏ qua)
+        par_min, par_max: PAR ở vòng lặp đầu và cuối
+        bw_min, bw_max: BW ở vòng lặp cuối và đầu (bw_max mặc định = 1/20 độ rộng miền mỗi chiều)
+        """
         # pop_size ở đây đóng vai trò là HMS (Harmony Memory Size)
         super().__init__(problem, pop_size=pop_size, **kwargs)
+        if batch_size < 1:
+            raise ValueError(f"batch_size phải >= 1, nhận được: {batch_size}")
         self.hmcr = hmcr
         self.par = par
         self.bw = bw
+        self.batch_size = batch_size
+        self.ihs = ihs
+        self.par_min = par_min
+        self.par_max = par_max
+        self.bw_min = bw_min
+        self.bw_max = bw_max
+
+    def _schedule(self, t, lb, ub):
+        """PAR và BW tại vòng lặp t"""
+        if not self.ihs:
+            return self.par, self.bw
+        progress = t / max(1, self.max_iter - 1)
+        bw_max = (ub - lb) / 20 if self.bw_max is None else self.bw_max
+        par = self.par_min + (self.par_max - self.par_min) * progress
+        bw = bw_max * np.exp(np.log(self.bw_min / bw_max) * progress)
+        return par, bw
+
+    def _improvise(self, hm, par, bw, lb, ub):
+        """Ứng tác batch_size bản nhạc mới: mọi quyết định được rút cho cả ma trận (B, dim) 1 lần"""
+        B, dim = self.batch_size, hm.shape[1]
+
+        # Memory Consideration: chọn giá trị từ 1 bản nhạc ngẫu nhiên trong HM (độc lập mỗi chiều)
+        use_memory = self.rng.random((B, dim)) < self.hmcr
+        values = hm[self.rng.integers(0, self.pop_size, (B, dim)), np.arange(dim)]
+
+        # Pitch Adjustment: cộng hoặc trừ một lượng nhỏ bw
+        adjust = use_memory & (self.rng.random((B, dim)) < par)
+        sign = np.where(self.rng.random((B, dim)) < 0.5, 1.0, -1.0)
+        values = values + adjust * sign * self.rng.random((B, dim)) * bw
+
+        # Random Selection: chọn ngẫu nhiên trong miền giá trị
+        new_harmonies = np.where(use_memory, values, self.rng.uniform(lb, ub, (B, dim)))
+
+        # Clip để đảm bảo nằm trong biên
+        return np.clip(new_harmonies, lb, ub)
 
     def _evolve(self):
         dim = self.problem.dim
@@ -23,53 +70,42 @@ class HarmonySearch(Optimizer):
         ub = self.problem.bounds[:, 1]
 
         # 1. Khởi tạo Harmony Memory (HM)
-        hm = np.random.uniform(lb, ub, (self.pop_size, dim))
-        hm_fitness = np.apply_along_axis(self.problem.fitness, 1, hm)
+        with self.phase('initialization'):
+            hm = self.rng.uniform(lb, ub, (self.pop_size, dim))
+        hm_fitness = self.evaluate_batch(hm)
 
         # Cập nhật Best ban đầu
         best_idx = np.argmin(hm_fitness)
         self.update_global_best(hm[best_idx], hm_fitness[best_idx])
-        self.save_history()
+        self.save_history(hm, hm_fitness)
 
-        for _ in range(self.max_iter):
-            # 2. Tạo một bản nhạc mới (New Harmony)
-            new_harmony = np.zeros(dim)
-            
-            for i in range(dim):
-                if np.random.rand() < self.hmcr:
-                    # Memory Consideration: Chọn từ HM
-                    rand_idx = np.random.randint(0, self.pop_size)
-                    value = hm[rand_idx, i]
-                    
-                    # Pitch Adjustment: Điều chỉnh nhẹ
-                    if np.random.rand() < self.par:
-                        # Cộng hoặc trừ một lượng nhỏ bw
-                        if np.random.rand() < 0.5:
-                            value += np.random.rand() * self.bw
-                        else:
-                            value -= np.random.rand() * self.bw
-                    
-                    new_harmony[i] = value
-                else:
-                    # Random Selection: Chọn ngẫu nhiên trong miền giá trị
-                    new_harmony[i] = np.random.uniform(lb[i], ub[i])
+        for t in range(self.max_iter):
+            # 2. Tạo batch_size bản nhạc mới (New Harmonies)
+            with self.phase('variation'):
+                par, bw = self._schedule(t, lb, ub)
+                new_harmonies = self._improvise(hm, par, bw, lb, ub)
+            new_fitness = self.evaluate_batch(new_harmonies)
 
-            # Clip để đảm bảo nằm trong biên
-            new_harmony = np.clip(new_harmony, lb, ub)
-            new_fitness = self.problem.fitness(new_harmony)
-
-            # 3. Cập nhật Harmony Memory
-            # Tìm bản nhạc tệ nhất trong bộ nhớ
-            worst_idx = np.argmax(hm_fitness)
-            if new_fitness < hm_fitness[worst_idx]:
-                hm[worst_idx] = new_harmony
-                hm_fitness[worst_idx] = new_fitness
+            # 3. Cập nhật Harmony Memory: giữ HMS bản nhạc tốt nhất của HM ∪ bản mới
+            with self.phase('selection'):
+                if self.batch_size == 1:
+                    # Trường hợp kinh điển: chỉ thay bản nhạc tệ nhất nếu bản mới tốt hơn
+                    worst_idx = np.argmax(hm_fitness)
+                    if new_fitness[0] < hm_fitness[worst_idx]:
+                        hm[worst_idx] = new_harmonies[0]
+                        hm_fitness[worst_idx] = new_fitness[0]
+                else:
+                    all_harmonies = np.vstack([hm, new_harmonies])
+                    all_fitness = np.concatenate([hm_fitness, new_fitness])
+                    keep = np.argpartition(all_fitness, self.pop_size - 1)[:self.pop_size]
+                    hm = all_harmonies[keep]
+                    hm_fitness = all_fitness[keep]
 
-            # Cập nhật Global Best
-            curr_best_idx = np.argmin(hm_fitness)
-            if hm_fitness[curr_best_idx] < self.global_best_fitness:
-                self.update_global_best(hm[curr_best_idx], hm_fitness[curr_best_idx])
+                # Cập nhật Global Best
+                curr_best_idx = np.argmin(hm_fitness)
+                if hm_fitness[curr_best_idx] < self.global_best_fitness:
+                    self.update_global_best(hm[curr_best_idx], hm_fitness[curr_best_idx])
             
-            self.save_history()
+            self.save_history(hm, hm_fitness)
 
-        return self.global_best_solution, self.global_best_fitness
\ No newline at end of file
+        return self.global_best_solution, self.global_best_fitness
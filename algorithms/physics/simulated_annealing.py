@@ -11,75 +11,162 @@ class SimulatedAnnealing(Optimizer):
       để có cơ hội thoát khỏi cực trị địa phương (Local Optima).
     - Xác suất chấp nhận cái xấu phụ thuộc vào "Nhiệt độ" (Temperature).
     - Nhiệt độ cao (đầu game) -> Dễ dãi. Nhiệt độ thấp (cuối game) -> Khắt khe.
+
+    Chạy n_chains chuỗi Markov độc lập song song dưới dạng ma trận (C, dim): mỗi bước sinh C hàng xóm,
+    đánh giá trong 1 lần gọi evaluate_batch và quyết định chấp nhận (Metropolis) cho mọi chuỗi cùng lúc.
+    tempering=True: Parallel Tempering (Replica Exchange) - các chuỗi chạy ở thang nhiệt độ khác nhau
+    và định kỳ đổi nhiệt độ cho nhau.
     """
-    def __init__(self, problem, initial_temp=1000, cooling_rate=0.95, step_size=0.1, **kwargs):
+    SCHEDULES = ('geometric', 'linear', 'adaptive', 'reheat')
+
+    def __init__(self, problem, initial_temp=1000, cooling_rate=0.95, step_size=0.1, n_chains=1,
+                 schedule='geometric', min_temp=1e-8, target_accept=0.3, reheat_after=50, reheat_ratio=0.5,
+                 tempering=False, temp_ratio=1e-3, exchange_interval=10, **kwargs):
         """
         Args:
             initial_temp: Nhiệt độ khởi tạo (Càng cao càng dễ chấp nhận lỗi ở đầu)
             cooling_rate: Tốc độ làm nguội (0.8 - 0.99). Thường dùng 0.95 hoặc 0.99
             step_size: Độ lớn bước nhảy khi tìm hàng xóm
+            n_chains: Số chuỗi chạy song song (C). Mỗi bước tốn C lần đánh giá
+            schedule: Lịch làm nguội, một trong SCHEDULES hoặc hàm schedule(temps, t, accept_rate) -> temps mới
+                - 'geometric': T <- T * cooling_rate
+                - 'linear'   : T giảm tuyến tính từ initial_temp về min_temp sau max_iter bước
+                - 'adaptive' : nguội nhanh khi tỉ lệ chấp nhận cao hơn target_accept, chậm lại khi thấp hơn
+                - 'reheat'   : như geometric, chuỗi nào reheat_after bước không chấp nhận được bước nào
+                               thì được hâm nóng lại lên reheat_ratio * initial_temp
+            min_temp: Nhiệt độ tối thiểu (tránh chia cho 0)
+            tempering: Bật Parallel Tempering (cần n_chains >= 2)
+            temp_ratio: Chuỗi lạnh nhất bắt đầu ở initial_temp * temp_ratio (thang nhiệt độ cấp số nhân)
+            exchange_interval: Số bước giữa 2 lần đề xuất đổi nhiệt độ
         """
         super().__init__(problem, **kwargs)
+        if not callable(schedule) and schedule not in self.SCHEDULES:
+            raise ValueError(f"schedule phải thuộc {self.SCHEDULES} hoặc là hàm, nhận được: {schedule}")
+        if n_chains < 1:
+            raise ValueError(f"n_chains phải >= 1, nhận được: {n_chains}")
+        if tempering and n_chains < 2:
+            raise ValueError("Parallel Tempering cần n_chains >= 2")
         self.initial_temp = initial_temp
         self.cooling_rate = cooling_rate
         self.step_size = step_size
+        self.n_chains = n_chains
+        self.schedule = schedule
+        self.min_temp = min_temp
+        self.target_accept = target_accept
+        self.reheat_after = reheat_after
+        self.reheat_ratio = reheat_ratio
+        self.tempering = tempering
+        self.temp_ratio = temp_ratio
+        self.exchange_interval = max(1, exchange_interval)
+        self.n_exchanges = 0
+
+    def _initial_temps(self):
+        if self.tempering:
+            # Thang nhiệt độ: chuỗi 0 nóng nhất, chuỗi C-1 lạnh nhất
+            return np.geomspace(self.initial_temp, self.initial_temp * self.temp_ratio, self.n_chains)
+        return np.full(self.n_chains, float(self.initial_temp))
+
+    def _cool(self, temps, t, accept_rate, stagnant, rungs):
+        """
+        Tính nhiệt độ cho bước t+1 theo lịch làm nguội (vector hóa theo chuỗi).
+        rungs[i]: bậc hiện tại của chuỗi i trên thang nhiệt độ ban đầu (thay đổi khi đổi nhiệt độ ở PT).
+        """
+        if callable(self.schedule):
+            temps = np.asarray(self.schedule(temps, t, accept_rate), dtype=float)
+        elif self.schedule == 'geometric':
+            temps = temps * self.cooling_rate
+        elif self.schedule == 'linear':
+            # Giữ tỉ lệ giữa các bậc (thang PT), giảm tuyến tính theo tiến độ;
+            # mỗi chuỗi lấy nhiệt độ của bậc nó đang giữ (không phải bậc ban đầu)
+            ladder = self._initial_temps() * max(0.0, 1 - (t + 1) / self.max_iter)
+            temps = ladder[rungs]
+        elif self.schedule == 'adaptive':
+            # Số mũ > 1 khi chấp nhận nhiều (còn quá nóng), < 1 khi chấp nhận ít
+            exponent = np.clip(accept_rate / self.target_accept, 0.1, 2.0)
+            temps = temps * self.cooling_rate ** exponent
+        else:
+            temps = temps * self.cooling_rate
+            reheat = stagnant >= self.reheat_after
+            temps[reheat] = np.maximum(temps[reheat], self.reheat_ratio * self._initial_temps()[rungs[reheat]])
+            stagnant[reheat] = 0
+        return np.maximum(temps, self.min_temp)
+
+    def _exchange(self, temps, rungs, current_fit, t):
+        """
+        Đề xuất đổi nhiệt độ giữa các cặp chuỗi kề nhau trên thang (luân phiên cặp chẵn / lẻ).
+        Chấp nhận với xác suất min(1, exp((f_i - f_j) * (1/T_i - 1/T_j))).
+        Cặp được chấp nhận đổi cả nhiệt độ lẫn bậc trên thang (rungs, sửa tại chỗ).
+        """
+        ladder = np.argsort(-temps)  # Từ nóng đến lạnh
+        start = (t // self.exchange_interval) % 2
+        hot, cold = ladder[start:-1:2], ladder[start + 1::2]
+        n = min(len(hot), len(cold))
+        hot, cold = hot[:n], cold[:n]
+        if n == 0:
+            return temps
+        log_ratio = (current_fit[hot] - current_fit[cold]) * (1 / temps[hot] - 1 / temps[cold])
+        swap = np.log(self.rng.random(n)) < np.minimum(log_ratio, 0)
+        a, b = hot[swap], cold[swap]
+        temps[a], temps[b] = temps[b], temps[a].copy()
+        rungs[a], rungs[b] = rungs[b], rungs[a].copy()
+        self.n_exchanges += int(np.count_nonzero(swap))
+        return temps
 
     def _evolve(self):
-        # 1. Khởi tạo điểm bắt đầu ngẫu nhiên
-        current_sol = np.random.uniform(
-            self.problem.bounds[:, 0], 
-            self.problem.bounds[:, 1]
-        )
-        current_fit = self.problem.fitness(current_sol)
+        C, dim = self.n_chains, self.problem.dim
+        lb = self.problem.bounds[:, 0]
+        ub = self.problem.bounds[:, 1]
+
+        # 1. Khởi tạo điểm bắt đầu ngẫu nhiên cho mỗi chuỗi
+        with self.phase('initialization'):
+            current_sol = self.rng.uniform(lb, ub, (C, dim))
+        current_fit = self.evaluate_batch(current_sol)
         
         # Cập nhật Global Best ban đầu
-        self.update_global_best(current_sol, current_fit)
-        self.save_history() # Lưu lại fitness hiện tại vào lịch sử
+        best_idx = np.argmin(current_fit)
+        self.update_global_best(current_sol[best_idx], current_fit[best_idx])
+        self.save_history(current_sol, current_fit)
         
         # Thiết lập nhiệt độ ban đầu
-        temp = self.initial_temp
+        temps = self._initial_temps()
+        rungs = np.arange(C)                          # Bậc trên thang nhiệt độ mà mỗi chuỗi đang giữ
+        accept_rate = np.full(C, self.target_accept)  # Tỉ lệ chấp nhận (trung bình trượt) của mỗi chuỗi
+        stagnant = np.zeros(C, dtype=int)            # Số bước liên tiếp không chấp nhận bước nào
 
         # 2. Vòng lặp tối ưu (Quá trình làm nguội)
-        for _ in range(self.max_iter):
-            # --- TẠO ỨNG VIÊN (NEIGHBOR) ---
-            # Cộng nhiễu Gaussian để tạo điểm lân cận
-            neighbor = current_sol + np.random.normal(0, self.step_size, size=self.problem.dim)
-            
-            # Đảm bảo điểm mới vẫn nằm trong giới hạn bài toán
-            neighbor = np.clip(neighbor, self.problem.bounds[:, 0], self.problem.bounds[:, 1])
-            
-            # Tính fitness điểm mới
-            neighbor_fit = self.problem.fitness(neighbor)
+        for t in range(self.max_iter):
+            # --- TẠO ỨNG VIÊN (NEIGHBOR) cho mọi chuỗi ---
+            # Cộng nhiễu Gaussian để tạo điểm lân cận, đảm bảo vẫn nằm trong giới hạn bài toán
+            with self.phase('variation'):
+                neighbor = np.clip(current_sol + self.rng.normal(0, self.step_size, size=(C, dim)), lb, ub)
+            neighbor_fit = self.evaluate_batch(neighbor)
 
-            # --- QUYẾT ĐỊNH CHẤP NHẬN HAY KHÔNG? ---
-            # Tính độ chênh lệch năng lượng (Delta E)
-            delta = neighbor_fit - current_fit
+            # --- QUYẾT ĐỊNH CHẤP NHẬN (Metropolis, vector hóa) ---
+            # Tốt hơn -> luôn chấp nhận; tệ hơn -> chấp nhận với xác suất P = exp(-delta / T)
+            with self.phase('selection'):
+                delta = neighbor_fit - current_fit
+                accept = (delta < 0) | (np.log(self.rng.random(C)) < -delta / temps)
+                current_sol[accept] = neighbor[accept]
+                current_fit[accept] = neighbor_fit[accept]
 
-            if delta < 0:
-                # TRƯỜNG HỢP 1: Tốt hơn (Xuống dốc) -> LUÔN CHẤP NHẬN
-                current_sol = neighbor
-                current_fit = neighbor_fit
-                
                 # Cập nhật kết quả tốt nhất toàn cục nếu phá kỷ lục
-                if current_fit < self.global_best_fitness:
-                    self.update_global_best(current_sol, current_fit)
-            else:
-                # TRƯỜNG HỢP 2: Tệ hơn (Lên dốc) -> CHẤP NHẬN CÓ XÁC SUẤT
-                # Công thức Metropolis: P = exp(-delta / T)
-                # T càng lớn -> P càng gần 1 (Dễ chấp nhận)
-                # T càng nhỏ -> P càng gần 0 (Khó chấp nhận)
-                probability = np.exp(-delta / temp)
-                
-                # Tung đồng xu ngẫu nhiên
-                if np.random.rand() < probability:
-                    current_sol = neighbor
-                    current_fit = neighbor_fit
+                best_idx = np.argmin(current_fit)
+                if current_fit[best_idx] < self.global_best_fitness:
+                    self.update_global_best(current_sol[best_idx], current_fit[best_idx])
 
             # --- LÀM NGUỘI ---
-            # Giảm nhiệt độ theo hệ số cooling_rate
-            temp *= self.cooling_rate
+            with self.phase('cooling'):
+                accept_rate = 0.9 * accept_rate + 0.1 * accept
+                stagnant = np.where(accept, 0, stagnant + 1)
+                temps = self._cool(temps, t, accept_rate, stagnant, rungs)
+
+                # --- ĐỔI NHIỆT ĐỘ (Parallel Tempering) ---
+                if self.tempering and (t + 1) % self.exchange_interval == 0:
+                    temps = self._exchange(temps, rungs, current_fit, t)
             
             # Lưu lịch sử để vẽ biểu đồ
-            self.save_history()
+            self.save_history(current_sol, current_fit)
 
-        return self.global_best_solution, self.global_best_fitness
\ No newline at end of file
+        self.final_temps = temps
+        self.final_rungs = rungs
+        return self.global_best_solution, self.global_best_fitness
@@ -0,0 +1,105 @@
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+# Ngữ cảnh rỗng dùng chung khi tắt profiling: không cấp phát, không gọi đồng hồ
+NULL_PHASE = nullcontext()
+
+
+class PhaseProfiler:
+    """
+    Đo thời gian từng pha của 1 lần chạy bằng time.perf_counter_ns.
+    Thời gian là thời gian riêng (exclusive): pha lồng bên trong (VD: 'evaluation' gọi trong 'variation')
+    tạm dừng đồng hồ của pha ngoài -> tổng thời gian các pha đúng bằng thời gian chạy.
+    Thời gian trong solve() không thuộc pha nào được tính vào 'other'.
+    memory=True: ghi thêm đỉnh bộ nhớ (tracemalloc) của từng pha và ảnh chụp (snapshot) đầu/cuối lần chạy.
+    """
+    PHASES = ('initialization', 'variation', 'evaluation', 'selection', 'bookkeeping', 'other')
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.times = {}         # Pha -> tổng thời gian (ns)
+        self.calls = {}         # Pha -> số lần vào pha
+        self.peak_memory = {}   # Pha -> đỉnh bộ nhớ (bytes)
+        self.snapshots = None   # (snapshot đầu, snapshot cuối) khi memory=True
+        self._stack = []
+        self._mark = 0
+        self._next = None
+        self._own_tracing = False
+        self._first_snapshot = None
+
+    def phase(self, name):
+        """Dùng với with: `with profiler.phase('variation'): ...`"""
+        self._next = name
+        return self
+
+    def _switch(self, now):
+        """Cộng thời gian (và đỉnh bộ nhớ) từ mốc trước cho pha đang chạy"""
+        active = self._stack[-1]
+        self.times[active] = self.times.get(active, 0) + now - self._mark
+        self._mark = now
+        if self.memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            if peak > self.peak_memory.get(active, 0):
+                self.peak_memory[active] = peak
+            tracemalloc.reset_peak()
+
+    def __enter__(self):
+        now = time.perf_counter_ns()
+        if self._stack:
+            self._switch(now)
+        else:
+            self._mark = now
+        name = self._next
+        self._stack.append(name)
+        self.calls[name] = self.calls.get(name, 0) + 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._switch(time.perf_counter_ns())
+        self._stack.pop()
+        return False
+
+    def start(self):
+        """Bắt đầu 1 lần chạy mới (gọi trong Optimizer.solve)"""
+        self.times, self.calls, self.peak_memory = {}, {}, {}
+        self._stack = []
+        if self.memory:
+            self._own_tracing = not tracemalloc.is_tracing()
+            if self._own_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._first_snapshot = tracemalloc.take_snapshot()
+        self.phase('other').__enter__()
+
+    def stop(self):
+        self.__exit__(None, None, None)
+        if self.memory:
+            self.snapshots = (self._first_snapshot, tracemalloc.take_snapshot())
+            self._first_snapshot = None
+            if self._own_tracing:
+                tracemalloc.stop()
+
+    def report(self):
+        """
+        {pha: {'time_s', 'share', 'calls', 'peak_memory_mb'}}, các pha chuẩn theo thứ tự PHASES,
+        pha tự đặt tên ở sau. peak_memory_mb là None nếu không bật memory.
+        """
+        total = sum(self.times.values()) or 1
+        names = [p for p in self.PHASES if p in self.times] + [p for p in self.times if p not in self.PHASES]
+        return {
+            name: {
+                "time_s": self.times[name] / 1e9,
+                "share": self.times[name] / total,
+                "calls": self.calls.get(name, 0),
+                "peak_memory_mb": self.peak_memory.get(name, 0) / (1024 * 1024) if self.memory else None
+            }
+            for name in names
+        }
+
+    def top_allocations(self, limit=10):
+        """Các dòng code cấp phát thêm nhiều bộ nhớ nhất giữa đầu và cuối lần chạy (cần memory=True)"""
+        if self.snapshots is None:
+            return []
+        first, last = self.snapshots
+        return last.compare_to(first, 'lineno')[:limit]
@@ -4,6 +4,7 @@ from .pso import ParticleSwarmOptimization
 from .abc import ArtificialBeeColony
 from .fa import FireflyAlgorithm
 from .cs import CuckooSearch
+from .pso_tsp import SwapSequencePSO
 
 # --- TẠO ALIAS (TÊN VIẾT TẮT) ---
 # Mục đích: Giúp main.py có thể gọi ngắn gọn: "from algorithms.swarm import PSO"
@@ -19,5 +20,6 @@ __all__ = [
     'ParticleSwarmOptimization', 'PSO',
     'ArtificialBeeColony', 'ABC',
     'FireflyAlgorithm', 'FA',
-    'CuckooSearch', 'CS'
+    'CuckooSearch', 'CS',
+    'SwapSequencePSO'
 ]
\ No newline at end of file
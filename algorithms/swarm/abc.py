@@ -2,37 +2,43 @@ import numpy as np
 from algorithms.optimizer import Optimizer
 
 class ArtificialBeeColony(Optimizer):
-    def __init__(self, problem, pop_size=50, limit=50, **kwargs):
+    def __init__(self, problem, pop_size=50, limit=50, mode='vectorized', max_scouts=None, **kwargs):
+        """
+        mode: 'vectorized' -> mỗi pha (employed / onlooker / scout) sinh mọi ứng viên cùng lúc,
+                              đánh giá fitness 1 lần mỗi pha; mỗi ứng viên chỉ đổi 1 chiều ngẫu nhiên (ABC chuẩn)
+              'sequential' -> vòng lặp từng con ong như bản gốc (đổi mọi chiều, đánh giá ngay sau mỗi lần)
+        max_scouts: Số ong trinh sát tối đa mỗi chu kỳ ở mode 'vectorized' (None = mọi nguồn vượt limit)
+        """
         # pop_size trong ABC thường là tổng số ong (Employed + Onlooker)
         # Số lượng nguồn thức ăn (SN) = pop_size / 2
         super().__init__(problem, pop_size=pop_size, **kwargs)
+        if mode not in ('vectorized', 'sequential'):
+            raise ValueError(f"mode phải là 'vectorized' hoặc 'sequential', nhận được: {mode}")
         self.n_food = pop_size // 2 
+        if self.n_food < 2:
+            raise ValueError("ABC cần pop_size >= 4 (ít nhất 2 nguồn thức ăn)")
         self.limit = limit
+        self.mode = mode
+        self.max_scouts = max_scouts
 
-    def _evolve(self):
-        dim = self.problem.dim
-        lb = self.problem.bounds[:, 0]
-        ub = self.problem.bounds[:, 1]
-        
-        # Khởi tạo nguồn thức ăn (Employed bees ban đầu)
-        pop = np.random.uniform(lb, ub, (self.n_food, dim))
-        fitness = np.apply_along_axis(self.problem.fitness, 1, pop)
-        trials = np.zeros(self.n_food) # Đếm số lần không cải thiện
-        
-        # Cập nhật Global Best
-        best_idx = np.argmin(fitness)
-        self.update_global_best(pop[best_idx], fitness[best_idx])
-        self.save_history()
+    def _selection_probs(self, fitness):
+        # Chuyển fitness (min problem) sang xác suất: fit càng nhỏ prob càng to
+        fit_inv = 1.0 / (1.0 + fitness + abs(np.min(fitness))) 
+        return fit_inv / np.sum(fit_inv)
+
+    def _sequential_cycle(self, pop, fitness, trials, lb, ub):
+        """Bản gốc: từng con ong tạo 1 ứng viên và được đánh giá ngay"""
+        dim = pop.shape[1]
 
         def mutate(i):
             k = i
             while k == i:
-                k = np.random.randint(0, self.n_food)
+                k = self.rng.integers(0, self.n_food)
             
-            phi = np.random.uniform(-1, 1, dim)
+            phi = self.rng.uniform(-1, 1, dim)
             new_sol = pop[i] + phi * (pop[i] - pop[k])
             new_sol = np.clip(new_sol, lb, ub)
-            new_fit = self.problem.fitness(new_sol)
+            new_fit = self.evaluate(new_sol)
             
             if new_fit < fitness[i]:
                 pop[i] = new_sol
@@ -41,36 +47,126 @@ class ArtificialBeeColony(Optimizer):
             else:
                 trials[i] += 1
 
-        for _ in range(self.max_iter):
-            # 1. Employed Bees Phase
+        # 1. Employed Bees Phase
+        with self.phase('variation'):
             for i in range(self.n_food):
                 mutate(i)
 
-            # 2. Onlooker Bees Phase
-            # Tính xác suất (Roulette Wheel)
-            # Chuyển fitness (min problem) sang xác suất: fit càng nhỏ prob càng to
-            fit_inv = 1.0 / (1.0 + fitness + abs(np.min(fitness))) 
-            probs = fit_inv / np.sum(fit_inv)
-            
+        # 2. Onlooker Bees Phase (Roulette Wheel, tích lũy xác suất 1 lần cho cả pha)
+        with self.phase('selection'):
+            cumulative = np.cumsum(self._selection_probs(fitness))
+        with self.phase('variation'):
             for _ in range(self.n_food):
                 # Chọn nguồn thức ăn để khai thác
-                i = np.searchsorted(np.cumsum(probs), np.random.rand())
+                i = np.searchsorted(cumulative, self.rng.random())
                 i = min(i, self.n_food - 1)
                 mutate(i)
 
-            # 3. Scout Bees Phase
-            # Tìm nguồn thức ăn đã cạn kiệt (vượt quá limit)
+        # 3. Scout Bees Phase
+        # Tìm nguồn thức ăn đã cạn kiệt (vượt quá limit)
+        with self.phase('variation'):
             max_trials_idx = np.argmax(trials)
             if trials[max_trials_idx] > self.limit:
-                pop[max_trials_idx] = np.random.uniform(lb, ub, dim)
-                fitness[max_trials_idx] = self.problem.fitness(pop[max_trials_idx])
+                pop[max_trials_idx] = self.rng.uniform(lb, ub, dim)
+                fitness[max_trials_idx] = self.evaluate(pop[max_trials_idx])
                 trials[max_trials_idx] = 0
 
+    def _candidates(self, pop, sources, lb, ub):
+        """
+        Sinh ứng viên cho các nguồn `sources` cùng lúc:
+        v_ij = x_ij + phi * (x_ij - x_kj), với 1 chiều j và 1 nguồn k != i chọn ngẫu nhiên cho mỗi hàng.
+        """
+        n, dim = len(sources), pop.shape[1]
+        # Chọn k trong [0, SN-1) rồi dịch qua i -> luôn khác i, không cần rút lại
+        partners = self.rng.integers(0, self.n_food - 1, n)
+        partners += partners >= sources
+        dims = self.rng.integers(0, dim, n)
+        phi = self.rng.uniform(-1, 1, n)
+
+        rows = np.arange(n)
+        V = pop[sources].copy()
+        V[rows, dims] += phi * (pop[sources, dims] - pop[partners, dims])
+        V[rows, dims] = np.clip(V[rows, dims], lb[dims], ub[dims])
+        return V
+
+    def _vectorized_cycle(self, pop, fitness, trials, lb, ub):
+        """Mỗi pha: sinh mọi ứng viên -> 1 lần evaluate_batch -> chọn lọc tham lam bằng mặt nạ"""
+        dim = pop.shape[1]
+        foods = np.arange(self.n_food)
+
+        # 1. Employed Bees Phase: mỗi nguồn 1 ứng viên
+        with self.phase('variation'):
+            V = self._candidates(pop, foods, lb, ub)
+        new_fit = self.evaluate_batch(V)
+        with self.phase('selection'):
+            better = new_fit < fitness
+            pop[better] = V[better]
+            fitness[better] = new_fit[better]
+            trials[better] = 0
+            trials[~better] += 1
+
+        # 2. Onlooker Bees Phase: chọn nguồn cho mọi ong quan sát trong 1 lần rút có trọng số
+        with self.phase('selection'):
+            sources = self.rng.choice(self.n_food, self.n_food, p=self._selection_probs(fitness))
+        with self.phase('variation'):
+            V = self._candidates(pop, sources, lb, ub)
+        new_fit = self.evaluate_batch(V)
+
+        with self.phase('selection'):
+            # Nhiều ong cùng khai thác 1 nguồn -> chỉ giữ ứng viên tốt nhất của nguồn đó
+            order = np.lexsort((new_fit, sources))
+            first = np.r_[True, sources[order][1:] != sources[order][:-1]]
+            best_rows = order[first]
+            targets = sources[best_rows]
+            better = new_fit[best_rows] < fitness[targets]
+            pop[targets[better]] = V[best_rows[better]]
+            fitness[targets[better]] = new_fit[best_rows[better]]
+
+            # Bộ đếm: nguồn được cải thiện về 0, nguồn không cải thiện cộng số ong đã thử thất bại
+            visits = np.bincount(sources, minlength=self.n_food)
+            improved = np.zeros(self.n_food, dtype=bool)
+            improved[targets[better]] = True
+            trials[improved] = 0
+            trials[~improved] += visits[~improved]
+
+        # 3. Scout Bees Phase: mọi nguồn cạn kiệt (vượt limit) được thay cùng lúc
+        with self.phase('variation'):
+            exhausted = np.flatnonzero(trials > self.limit)
+            if self.max_scouts is not None and len(exhausted) > self.max_scouts:
+                # Ưu tiên các nguồn bị bỏ lâu nhất
+                exhausted = exhausted[np.argsort(-trials[exhausted], kind='stable')[:self.max_scouts]]
+            if len(exhausted):
+                pop[exhausted] = self.rng.uniform(lb, ub, (len(exhausted), dim))
+                fitness[exhausted] = self.evaluate_batch(pop[exhausted])
+                trials[exhausted] = 0
+
+    def _evolve(self):
+        dim = self.problem.dim
+        lb = self.problem.bounds[:, 0]
+        ub = self.problem.bounds[:, 1]
+        
+        # Khởi tạo nguồn thức ăn (Employed bees ban đầu)
+        with self.phase('initialization'):
+            pop = self.rng.uniform(lb, ub, (self.n_food, dim))
+        fitness = self.evaluate_batch(pop)
+        trials = np.zeros(self.n_food) # Đếm số lần không cải thiện
+        
+        # Cập nhật Global Best
+        best_idx = np.argmin(fitness)
+        self.update_global_best(pop[best_idx], fitness[best_idx])
+        self.save_history(pop, fitness)
+
+        cycle = self._vectorized_cycle if self.mode == 'vectorized' else self._sequential_cycle
+
+        for _ in range(self.max_iter):
+            cycle(pop, fitness, trials, lb, ub)
+
             # Cập nhật kết quả tốt nhất vòng này
-            curr_best_idx = np.argmin(fitness)
-            if fitness[curr_best_idx] < self.global_best_fitness:
-                self.update_global_best(pop[curr_best_idx], fitness[curr_best_idx])
+            with self.phase('selection'):
+                curr_best_idx = np.argmin(fitness)
+                if fitness[curr_best_idx] < self.global_best_fitness:
+                    self.update_global_best(pop[curr_best_idx], fitness[curr_best_idx])
             
-            self.save_history()
+            self.save_history(pop, fitness)
 
-        return self.global_best_solution, self.global_best_fitness
\ No newline at end of file
+        return self.global_best_solution, self.global_best_fitness
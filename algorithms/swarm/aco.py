@@ -2,76 +2,111 @@ import numpy as np
 from algorithms.optimizer import Optimizer
 
 class AntColonyOptimization(Optimizer):
-    def __init__(self, problem, n_ants=10, decay=0.5, alpha=1, beta=2, **kwargs):
+    def __init__(self, problem, n_ants=10, decay=0.5, alpha=1, beta=2, n_candidates=None, **kwargs):
+        """
+        n_candidates: Số thành phố gần nhất được xét ở mỗi bước (Candidate List).
+                      None = xét tất cả thành phố chưa đi (như bản gốc).
+        """
         super().__init__(problem, **kwargs)
         self.n_ants = n_ants
         self.decay = decay
         self.alpha = alpha
         self.beta = beta
-        
+
         # Lấy dữ liệu từ bài toán TSP
         self.n_cities = self.problem.n_cities
         self.dist_matrix = self.problem.dist_matrix
-        
+
         # Khởi tạo Pheromone
         self.pheromone = np.ones((self.n_cities, self.n_cities)) / self.n_cities
 
+        # Tính trước thông tin heuristic eta^beta (không đổi trong suốt quá trình chạy)
+        self.eta_beta = (1.0 / (self.dist_matrix + 1e-10)) ** self.beta
+
+        # Danh sách ứng viên: n_candidates thành phố gần nhất của mỗi thành phố (bỏ chính nó)
+        self.candidates = None
+        if n_candidates is not None and 0 < n_candidates < self.n_cities - 1:
+            self.candidates = self.problem.neighbor_lists(n_candidates)
+
     def _evolve(self):
         # Không có best solution ban đầu, ta chạy vòng lặp luôn
         self.save_history() # Lưu giá trị inf ban đầu (hoặc bạn có thể chạy thử 1 con kiến để init)
 
         for _ in range(self.max_iter):
-            all_paths = []
-            all_path_lens = []
-            
-            # Mỗi kiến xây dựng 1 đường đi
-            for _ in range(self.n_ants):
-                path = self._construct_path()
-                path_len = self.problem.fitness(path) # Dùng hàm fitness của bài toán
-                all_paths.append(path)
-                all_path_lens.append(path_len)
-                
-                # Cập nhật Global Best nếu tìm thấy đường tốt hơn
-                if path_len < self.global_best_fitness:
-                    self.update_global_best(np.array(path), path_len)
-            
-            # Cập nhật Pheromone
-            self.pheromone *= (1 - self.decay) # Bay hơi
-            
-            for path, length in zip(all_paths, all_path_lens):
-                for j in range(len(path) - 1):
-                    self.pheromone[path[j], path[j+1]] += 1.0 / (length + 1e-10)
-                # Đoạn khép kín vòng
-                self.pheromone[path[-1], path[0]] += 1.0 / (length + 1e-10)
-
-            self.save_history()
+            # Tất cả kiến xây dựng đường đi cùng lúc: mảng (n_ants, n_cities)
+            with self.phase('variation'):
+                tours = self._construct_tours()
+            tour_lens = self.evaluate_batch(tours)
+
+            # Cập nhật Global Best nếu tìm thấy đường tốt hơn
+            with self.phase('selection'):
+                best_ant = np.argmin(tour_lens)
+                if tour_lens[best_ant] < self.global_best_fitness:
+                    self.update_global_best(tours[best_ant], tour_lens[best_ant])
+
+            # Cập nhật Pheromone (pha riêng của ACO)
+            with self.phase('pheromone'):
+                self.pheromone *= (1 - self.decay) # Bay hơi
+
+                # Rải pheromone trên mọi cạnh (kể cả đoạn khép kín vòng) trong 1 lần gọi
+                deposit = np.repeat(1.0 / (tour_lens + 1e-10), self.n_cities)
+                np.add.at(self.pheromone, (tours.ravel(), np.roll(tours, -1, axis=1).ravel()), deposit)
+
+            self.save_history(fitness=tour_lens)
 
         return self.global_best_solution, self.global_best_fitness
 
-    def _construct_path(self):
-        start_node = np.random.randint(0, self.n_cities)
-        path = [start_node]
-        visited = set(path)
-        
-        for _ in range(self.n_cities - 1):
-            curr = path[-1]
-            probs = self._calculate_probs(curr, visited)
-            next_city = self._roulette_wheel_selection(probs)
-            path.append(next_city)
-            visited.add(next_city)
-        return path
-
-    def _calculate_probs(self, curr, visited):
-        probs = np.zeros(self.n_cities)
-        for city in range(self.n_cities):
-            if city not in visited:
-                heuristic = 1.0 / (self.dist_matrix[curr][city] + 1e-10)
-                probs[city] = (self.pheromone[curr][city] ** self.alpha) * (heuristic ** self.beta)
-        
-        total = np.sum(probs)
-        return probs / (total + 1e-10)
-
-    def _roulette_wheel_selection(self, probs):
-        cumulative_probs = np.cumsum(probs)
-        r = np.random.rand()
-        return np.searchsorted(cumulative_probs, r)
\ No newline at end of file
+    def _construct_tours(self):
+        """
+        Xây dựng đường đi cho toàn bộ đàn kiến theo kiểu lock-step:
+        ở mỗi bước, mọi con kiến chọn thành phố tiếp theo cùng lúc bằng phép toán mảng.
+        """
+        n_ants, n = self.n_ants, self.n_cities
+        ants = np.arange(n_ants)
+
+        # Ma trận lựa chọn tau^alpha * eta^beta chỉ cần tính 1 lần mỗi vòng lặp
+        choice_info = (self.pheromone ** self.alpha) * self.eta_beta
+
+        tours = np.empty((n_ants, n), dtype=int)
+        visited = np.zeros((n_ants, n), dtype=bool)
+        tours[:, 0] = self.rng.integers(0, n, n_ants)
+        visited[ants, tours[:, 0]] = True
+
+        for step in range(1, n):
+            curr = tours[:, step - 1]
+            next_city = np.full(n_ants, -1)
+
+            if self.candidates is not None:
+                # Ưu tiên chọn trong danh sách ứng viên
+                cand = self.candidates[curr]
+                weights = np.where(visited[ants[:, np.newaxis], cand], 0.0, choice_info[curr[:, np.newaxis], cand])
+                has_cand = np.sum(weights, axis=1) > 0
+                if np.any(has_cand):
+                    picked = self._roulette_wheel_selection(weights[has_cand])
+                    next_city[has_cand] = cand[has_cand, picked]
+
+            # Kiến chưa chọn được (không dùng candidate list hoặc ứng viên đã đi hết) -> xét mọi thành phố
+            pending = next_city < 0
+            if np.any(pending):
+                weights = np.where(visited[pending], 0.0, choice_info[curr[pending]])
+                next_city[pending] = self._roulette_wheel_selection(weights, ~visited[pending])
+
+            tours[:, step] = next_city
+            visited[ants, next_city] = True
+        return tours
+
+    def _roulette_wheel_selection(self, weights, fallback=None):
+        """
+        Chọn ngẫu nhiên 1 cột cho mỗi hàng theo trọng số (Roulette Wheel).
+        fallback: mặt nạ các lựa chọn hợp lệ, dùng chọn đều khi tổng trọng số của hàng bằng 0 (underflow).
+        """
+        total = np.sum(weights, axis=1)
+        if fallback is not None:
+            empty = total <= 0
+            if np.any(empty):
+                weights = weights.copy()
+                weights[empty] = fallback[empty]
+        cumulative = np.cumsum(weights, axis=1)
+        r = self.rng.random(len(weights)) * cumulative[:, -1]
+        idx = np.sum(cumulative <= r[:, np.newaxis], axis=1)
+        return np.minimum(idx, weights.shape[1] - 1)
@@ -3,62 +3,113 @@ import math
 from algorithms.optimizer import Optimizer
 
 class CuckooSearch(Optimizer):
-    def __init__(self, problem, pop_size=25, pa=0.25, **kwargs):
+    def __init__(self, problem, pop_size=25, pa=0.25, beta=1.5, mode='vectorized', **kwargs):
+        """
+        beta: Số mũ phân phối Lévy (1 < beta <= 2)
+        mode: 'vectorized' -> công thức toàn quần thể của Yang & Deb: mỗi thế hệ mọi tổ cùng bay Lévy,
+                              sau đó các tổ bị phát hiện (mặt nạ xác suất pa) đi bộ ngẫu nhiên có hướng;
+                              mỗi pha đánh giá fitness 1 lần
+              'sequential' -> bản gốc: 1 cuckoo mỗi vòng lặp, thay thế các tổ kém nhất bằng tổ ngẫu nhiên
+        """
         super().__init__(problem, pop_size=pop_size, **kwargs)
+        if mode not in ('vectorized', 'sequential'):
+            raise ValueError(f"mode phải là 'vectorized' hoặc 'sequential', nhận được: {mode}")
         self.pa = pa # Discovery rate (Xác suất bị phát hiện)
+        self.beta = beta
+        self.mode = mode
+        # Độ lệch chuẩn của u trong thuật toán Mantegna chỉ phụ thuộc beta -> tính 1 lần
+        self._sigma_u = (math.gamma(1 + beta) * math.sin(math.pi * beta / 2) / 
+                         (math.gamma((1 + beta) / 2) * beta * 2 ** ((beta - 1) / 2))) ** (1 / beta)
 
-    def _levy_flight(self, beta=1.5):
-        sigma = (math.gamma(1 + beta) * math.sin(math.pi * beta / 2) / 
-                 (math.gamma((1 + beta) / 2) * beta * 2 ** ((beta - 1) / 2))) ** (1 / beta)
-        u = np.random.normal(0, sigma, self.problem.dim)
-        v = np.random.normal(0, 1, self.problem.dim)
-        step = u / abs(v) ** (1 / beta)
+    def _levy_flight(self, n=None):
+        """Bước Lévy (Mantegna): 1 vector (dim,) hoặc ma trận (n, dim) cho n tổ trong 1 lần rút"""
+        shape = self.problem.dim if n is None else (n, self.problem.dim)
+        u = self.rng.normal(0, self._sigma_u, shape)
+        v = self.rng.normal(0, 1, shape)
+        step = u / abs(v) ** (1 / self.beta)
         return step
 
+    def _greedy(self, nests, fitness, new_nests):
+        """Đánh giá cả nhóm tổ mới trong 1 lần gọi, tổ nào tốt hơn tổ cũ cùng vị trí thì thay thế"""
+        new_fitness = self.evaluate_batch(new_nests)
+        with self.phase('selection'):
+            better = new_fitness < fitness
+            nests[better] = new_nests[better]
+            fitness[better] = new_fitness[better]
+
+    def _vectorized_step(self, nests, fitness, lb, ub):
+        n, dim = nests.shape
+
+        # 1. Global Walk: mọi tổ cùng bay Lévy quanh tổ tốt nhất
+        with self.phase('variation'):
+            step_size = 0.01 * self._levy_flight(n) * (nests - self.global_best_solution)
+            new_nests = np.clip(nests + step_size * self.rng.standard_normal((n, dim)), lb, ub)
+        self._greedy(nests, fitness, new_nests)
+
+        # 2. Local Walk: mỗi thành phần bị phát hiện với xác suất pa,
+        #    dịch chuyển theo hiệu 2 tổ ngẫu nhiên (biased random walk)
+        with self.phase('variation'):
+            discovered = self.rng.random((n, dim)) < self.pa
+            step_size = self.rng.random((n, 1)) * (nests[self.rng.permutation(n)] - nests[self.rng.permutation(n)])
+            new_nests = np.clip(nests + step_size * discovered, lb, ub)
+        self._greedy(nests, fitness, new_nests)
+
+    def _sequential_step(self, nests, fitness, lb, ub):
+        dim = nests.shape[1]
+
+        # 1. Tạo cuckoo mới bằng Levy Flight (Global Walk)
+        with self.phase('variation'):
+            i = self.rng.integers(0, self.pop_size)
+            step_size = 0.01 * self._levy_flight() * (nests[i] - self.global_best_solution)
+            new_cuckoo = nests[i] + step_size * self.rng.standard_normal(dim)
+            new_cuckoo = np.clip(new_cuckoo, lb, ub)
+        new_fit = self.evaluate(new_cuckoo)
+        
+        # Chọn tổ ngẫu nhiên j để đẻ nhờ
+        with self.phase('selection'):
+            j = self.rng.integers(0, self.pop_size)
+            if new_fit < fitness[j]:
+                nests[j] = new_cuckoo
+                fitness[j] = new_fit
+
+            # 2. Loại bỏ tổ xấu (Discovery / Local Walk)
+            # Thay thế 1 phần tổ tồi bằng tổ mới
+            sorted_idx = np.argsort(fitness)
+            n_abandon = int(self.pop_size * self.pa)
+        
+        # Thay thế n_abandon tổ kém nhất (đánh giá cả nhóm trong 1 lần gọi)
+        if n_abandon > 0:
+            with self.phase('variation'):
+                idx = sorted_idx[self.pop_size - n_abandon:]
+                nests[idx] = self.rng.uniform(lb, ub, (n_abandon, dim))
+            fitness[idx] = self.evaluate_batch(nests[idx])
+
     def _evolve(self):
         dim = self.problem.dim
         lb = self.problem.bounds[:, 0]
         ub = self.problem.bounds[:, 1]
         
         # Khởi tạo tổ chim
-        nests = np.random.uniform(lb, ub, (self.pop_size, dim))
-        fitness = np.apply_along_axis(self.problem.fitness, 1, nests)
+        with self.phase('initialization'):
+            nests = self.rng.uniform(lb, ub, (self.pop_size, dim))
+        fitness = self.evaluate_batch(nests)
         
         # Best ban đầu
         best_idx = np.argmin(fitness)
         self.update_global_best(nests[best_idx], fitness[best_idx])
-        self.save_history()
+        self.save_history(nests, fitness)
 
-        for _ in range(self.max_iter):
-            # 1. Tạo cuckoo mới bằng Levy Flight (Global Walk)
-            i = np.random.randint(0, self.pop_size)
-            step_size = 0.01 * self._levy_flight() * (nests[i] - self.global_best_solution)
-            new_cuckoo = nests[i] + step_size * np.random.randn(dim)
-            new_cuckoo = np.clip(new_cuckoo, lb, ub)
-            new_fit = self.problem.fitness(new_cuckoo)
-            
-            # Chọn tổ ngẫu nhiên j để đẻ nhờ
-            j = np.random.randint(0, self.pop_size)
-            if new_fit < fitness[j]:
-                nests[j] = new_cuckoo
-                fitness[j] = new_fit
+        step = self._vectorized_step if self.mode == 'vectorized' else self._sequential_step
 
-            # 2. Loại bỏ tổ xấu (Discovery / Local Walk)
-            # Thay thế 1 phần tổ tồi bằng tổ mới
-            sorted_idx = np.argsort(fitness)
-            n_abandon = int(self.pop_size * self.pa)
-            
-            # Thay thế n_abandon tổ kém nhất
-            for k in range(self.pop_size - n_abandon, self.pop_size):
-                idx = sorted_idx[k]
-                nests[idx] = np.random.uniform(lb, ub, dim)
-                fitness[idx] = self.problem.fitness(nests[idx])
+        for _ in range(self.max_iter):
+            step(nests, fitness, lb, ub)
 
             # Cập nhật Global Best
-            curr_best_idx = np.argmin(fitness)
-            if fitness[curr_best_idx] < self.global_best_fitness:
-                self.update_global_best(nests[curr_best_idx], fitness[curr_best_idx])
+            with self.phase('selection'):
+                curr_best_idx = np.argmin(fitness)
+                if fitness[curr_best_idx] < self.global_best_fitness:
+                    self.update_global_best(nests[curr_best_idx], fitness[curr_best_idx])
             
-            self.save_history()
+            self.save_history(nests, fitness)
 
         return self.global_best_solution, self.global_best_fitness
\ No newline at end of file
@@ -2,11 +2,69 @@ import numpy as np
 from algorithms.optimizer import Optimizer
 
 class FireflyAlgorithm(Optimizer):
-    def __init__(self, problem, pop_size=40, beta0=1.0, gamma=1.0, alpha=0.2, **kwargs):
+    def __init__(self, problem, pop_size=40, beta0=1.0, gamma=1.0, alpha=0.2, mode='vectorized',
+                 normalize=False, **kwargs):
+        """
+        mode: 'vectorized' -> cập nhật đồng bộ cả bầy, đánh giá fitness 1 lần mỗi thế hệ
+              'sequential' -> vòng lặp i, j như bản gốc (đánh giá sau mỗi lần di chuyển)
+        normalize: Chỉ dùng ở mode 'vectorized'. True -> chia bước đi cho max(tổng lực hút, 1)
+                   (trọng tâm có trọng số của các con sáng hơn); False -> cộng dồn lực hút như công thức gốc
+        """
         super().__init__(problem, pop_size=pop_size, **kwargs)
+        if mode not in ('vectorized', 'sequential'):
+            raise ValueError(f"mode phải là 'vectorized' hoặc 'sequential', nhận được: {mode}")
         self.beta0 = beta0  # Attractiveness at r=0
         self.gamma = gamma  # Absorption coefficient
         self.alpha = alpha  # Randomization parameter
+        self.mode = mode
+        self.normalize = normalize
+
+    def _sequential_sweep(self, X, Light, lb, ub):
+        """Bản gốc: so sánh từng cặp đom đóm, đánh giá lại ngay sau mỗi lần bay"""
+        dim = X.shape[1]
+        for i in range(self.pop_size):
+            for j in range(self.pop_size):
+                # Nếu j sáng hơn i (fitness nhỏ hơn) -> i bay về phía j
+                if Light[j] < Light[i]:
+                    r = np.linalg.norm(X[i] - X[j])
+                    beta = self.beta0 * np.exp(-self.gamma * r**2)
+
+                    noise = self.alpha * (self.rng.random(dim) - 0.5)
+                    X[i] += beta * (X[j] - X[i]) + noise
+                    X[i] = np.clip(X[i], lb, ub)
+
+                    Light[i] = self.evaluate(X[i])
+        return X, Light
+
+    def _vectorized_sweep(self, X, Light, lb, ub):
+        """
+        Cập nhật đồng bộ: tính ma trận hấp dẫn cho cả bầy theo độ sáng đầu thế hệ.
+        attract[i, j] = True nếu j sáng hơn i; beta_ij = beta0 * exp(-gamma * r_ij^2).
+        Bước đi của i là tổng lực hút sum_j beta_ij * (x_j - x_i) như công thức gốc.
+        normalize=True: nếu tổng lực hút vượt quá 1, bước đi được chuẩn hóa thành trọng tâm có trọng số
+        của các con sáng hơn (tránh bay vượt quá khi cộng dồn nhiều bước).
+        """
+        # Ma trận khoảng cách bình phương r_ij^2 = |x_i|^2 + |x_j|^2 - 2 x_i.x_j
+        sq_norm = np.sum(X**2, axis=1)
+        r2 = np.maximum(sq_norm[:, np.newaxis] + sq_norm[np.newaxis, :] - 2 * X @ X.T, 0)
+
+        attract = Light[np.newaxis, :] < Light[:, np.newaxis]
+        beta = np.where(attract, self.beta0 * np.exp(-self.gamma * r2), 0.0)
+
+        # sum_j beta_ij * (x_j - x_i) = beta @ X - (sum_j beta_ij) * x_i
+        beta_sum = np.sum(beta, axis=1)
+        move = beta @ X - beta_sum[:, np.newaxis] * X
+        if self.normalize:
+            move /= np.maximum(beta_sum, 1.0)[:, np.newaxis]
+
+        # Chỉ những con có ít nhất 1 con sáng hơn mới bay (con sáng nhất đứng yên như bản gốc)
+        moving = np.any(attract, axis=1)
+        noise = self.alpha * (self.rng.random(X.shape) - 0.5)
+        X = np.where(moving[:, np.newaxis], np.clip(X + move + noise, lb, ub), X)
+
+        # Đánh giá lại cả bầy trong 1 lần gọi
+        Light = self.evaluate_batch(X)
+        return X, Light
 
     def _evolve(self):
         dim = self.problem.dim
@@ -14,39 +72,34 @@ class FireflyAlgorithm(Optimizer):
         ub = self.problem.bounds[:, 1]
         
         # Khởi tạo
-        X = np.random.uniform(lb, ub, (self.pop_size, dim))
-        Light = np.apply_along_axis(self.problem.fitness, 1, X)
+        with self.phase('initialization'):
+            X = self.rng.uniform(lb, ub, (self.pop_size, dim))
+        Light = self.evaluate_batch(X)
         
         # Update Best
         min_idx = np.argmin(Light)
         self.update_global_best(X[min_idx], Light[min_idx])
-        self.save_history()
+        self.save_history(X, Light)
 
         for _ in range(self.max_iter):
             # So sánh từng cặp đom đóm
-            for i in range(self.pop_size):
-                for j in range(self.pop_size):
-                    # Nếu j sáng hơn i (fitness nhỏ hơn) -> i bay về phía j
-                    if Light[j] < Light[i]:
-                        r = np.linalg.norm(X[i] - X[j])
-                        beta = self.beta0 * np.exp(-self.gamma * r**2)
-                        
-                        noise = self.alpha * (np.random.rand(dim) - 0.5)
-                        X[i] += beta * (X[j] - X[i]) + noise
-                        X[i] = np.clip(X[i], lb, ub)
-                        
-                        Light[i] = self.problem.fitness(X[i])
+            with self.phase('variation'):
+                if self.mode == 'sequential':
+                    X, Light = self._sequential_sweep(X, Light, lb, ub)
+                else:
+                    X, Light = self._vectorized_sweep(X, Light, lb, ub)
             
             # Giảm alpha dần để ổn định
             self.alpha *= 0.98
             
             # Cập nhật Best
-            curr_best_val = np.min(Light)
-            curr_best_idx = np.argmin(Light)
-            
-            if curr_best_val < self.global_best_fitness:
-                self.update_global_best(X[curr_best_idx], curr_best_val)
+            with self.phase('selection'):
+                curr_best_val = np.min(Light)
+                curr_best_idx = np.argmin(Light)
+
+                if curr_best_val < self.global_best_fitness:
+                    self.update_global_best(X[curr_best_idx], curr_best_val)
                 
-            self.save_history()
+            self.save_history(X, Light)
 
         return self.global_best_solution, self.global_best_fitness
\ No newline at end of file
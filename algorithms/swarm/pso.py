@@ -20,40 +20,43 @@ class ParticleSwarmOptimization(Optimizer):
         ub = self.problem.bounds[:, 1]
         
         # Vị trí và vận tốc
-        X = np.random.uniform(lb, ub, (self.pop_size, dim))
-        V = np.random.uniform(-1, 1, (self.pop_size, dim))
+        with self.phase('initialization'):
+            X = self.rng.uniform(lb, ub, (self.pop_size, dim))
+            V = self.rng.uniform(-1, 1, (self.pop_size, dim))
         
         # P_best (Cá nhân tốt nhất)
         P_best = X.copy()
-        P_best_val = np.apply_along_axis(self.problem.fitness, 1, X)
+        P_best_val = self.evaluate_batch(X)
         
         # Cập nhật Global Best lần đầu
         min_idx = np.argmin(P_best_val)
         self.update_global_best(P_best[min_idx], P_best_val[min_idx])
-        self.save_history()
+        self.save_history(P_best, P_best_val)
 
         # 2. Vòng lặp
         for _ in range(self.max_iter):
-            r1 = np.random.rand(self.pop_size, dim)
-            r2 = np.random.rand(self.pop_size, dim)
+            with self.phase('variation'):
+                r1 = self.rng.random((self.pop_size, dim))
+                r2 = self.rng.random((self.pop_size, dim))
             
-            # Cập nhật vận tốc
-            # v_new = w*v + c1*r1*(pbest - x) + c2*r2*(gbest - x)
-            V = (self.w * V + 
-                 self.c1 * r1 * (P_best - X) + 
-                 self.c2 * r2 * (self.global_best_solution - X))
+                # Cập nhật vận tốc
+                # v_new = w*v + c1*r1*(pbest - x) + c2*r2*(gbest - x)
+                V = (self.w * V + 
+                     self.c1 * r1 * (P_best - X) + 
+                     self.c2 * r2 * (self.global_best_solution - X))
             
-            # Cập nhật vị trí
-            X = X + V
-            X = np.clip(X, lb, ub) # Giữ trong biên
+                # Cập nhật vị trí
+                X = X + V
+                X = np.clip(X, lb, ub) # Giữ trong biên
             
             # Đánh giá
-            current_vals = np.apply_along_axis(self.problem.fitness, 1, X)
+            current_vals = self.evaluate_batch(X)
             
             # Cập nhật P_best
-            better_mask = current_vals < P_best_val
-            P_best[better_mask] = X[better_mask]
-            P_best_val[better_mask] = current_vals[better_mask]
+            with self.phase('selection'):
+                better_mask = current_vals < P_best_val
+                P_best[better_mask] = X[better_mask]
+                P_best_val[better_mask] = current_vals[better_mask]
             
             # Cập nhật Global Best
             min_val = np.min(P_best_val)
@@ -62,6 +65,6 @@ class ParticleSwarmOptimization(Optimizer):
             if min_val < self.global_best_fitness:
                 self.update_global_best(P_best[min_idx], min_val)
                 
-            self.save_history()
+            self.save_history(P_best, P_best_val)
             
         return self.global_best_solution, self.global_best_fitness
\ No newline at end of file
@@ -0,0 +1,106 @@
+import numpy as np
+from algorithms.optimizer import Optimizer
+
+class SwapSequencePSO(Optimizer):
+    """
+    PSO rời rạc cho TSP dựa trên chuỗi hoán đổi (Swap Sequence PSO - Wang et al. 2003).
+    Vị trí là 1 hoán vị (ma trận int32 (pop_size, n_cities)), vận tốc là chuỗi các phép đổi chỗ SO(i, j).
+    v_new = w ⊗ v  ⊕  c1 ⊗ (P_best - X)  ⊕  c2 ⊗ (G_best - X)
+    - (P - X): chuỗi hoán đổi biến X thành P (với mỗi vị trí k, đổi X[k] với vị trí đang chứa P[k])
+    - c ⊗ SS: mỗi phép đổi chỗ trong chuỗi được giữ lại với xác suất c
+    Mỗi bước duyệt theo vị trí k nhưng xử lý cả bầy cùng lúc (vector hóa theo hạt).
+    """
+    def __init__(self, problem, pop_size=30, w=0.5, c1=0.3, c2=0.3, max_velocity=None, **kwargs):
+        """
+        w: Xác suất giữ lại mỗi phép đổi chỗ của vận tốc cũ (Quán tính)
+        c1: Xác suất áp dụng mỗi phép đổi chỗ hướng về P_best (Hệ số cá nhân)
+        c2: Xác suất áp dụng mỗi phép đổi chỗ hướng về G_best (Hệ số xã hội)
+        max_velocity: Số phép đổi chỗ tối đa lưu trong vận tốc (mặc định = n_cities)
+        """
+        super().__init__(problem, pop_size=pop_size, **kwargs)
+        for name, value in (('w', w), ('c1', c1), ('c2', c2)):
+            if not 0 <= value <= 1:
+                raise ValueError(f"{name} là xác suất, phải nằm trong [0, 1], nhận được: {value}")
+        self.w = w
+        self.c1 = c1
+        self.c2 = c2
+        self.max_velocity = max_velocity or problem.n_cities
+
+    def _swap(self, X, pos, rows, i, j, V, v_len):
+        """Đổi chỗ X[r, i] và X[r, j] cho các hạt rows, đồng thời ghi phép đổi vào vận tốc mới"""
+        a, b = X[rows, i], X[rows, j]
+        X[rows, i], X[rows, j] = b, a
+        pos[rows, b], pos[rows, a] = i, j
+
+        room = v_len[rows] < self.max_velocity
+        r = rows[room]
+        V[r, v_len[r], 0] = np.broadcast_to(i, rows.shape)[room]
+        V[r, v_len[r], 1] = np.broadcast_to(j, rows.shape)[room]
+        v_len[r] += 1
+
+    def _move_towards(self, X, pos, T, prob, V, v_len):
+        """Áp dụng chuỗi hoán đổi (T - X), mỗi phép đổi được giữ với xác suất prob"""
+        N, n = X.shape
+        keep = self.rng.random((N, n)) < prob
+        for k in range(n):
+            rows = np.flatnonzero((X[:, k] != T[:, k]) & keep[:, k])
+            if len(rows):
+                self._swap(X, pos, rows, k, pos[rows, T[rows, k]], V, v_len)
+
+    def _evolve(self):
+        N, n = self.pop_size, self.problem.n_cities
+        all_rows = np.arange(N)
+
+        # 1. Khởi tạo: vị trí là hoán vị ngẫu nhiên, vận tốc rỗng
+        with self.phase('initialization'):
+            X = np.argsort(self.rng.random((N, n)), axis=1).astype(np.int32)
+            pos = np.empty_like(X)
+            pos[all_rows[:, np.newaxis], X] = np.arange(n, dtype=np.int32)
+            V = np.zeros((N, self.max_velocity, 2), dtype=np.int32)
+            v_len = np.zeros(N, dtype=np.int64)
+
+        # P_best (Cá nhân tốt nhất)
+        P_best = X.copy()
+        P_best_val = self.evaluate_batch(X)
+
+        # Cập nhật Global Best lần đầu
+        min_idx = np.argmin(P_best_val)
+        self.update_global_best(P_best[min_idx], P_best_val[min_idx])
+        self.save_history(P_best, P_best_val)
+
+        # 2. Vòng lặp
+        for _ in range(self.max_iter):
+            with self.phase('variation'):
+                old_V, old_len = V, v_len
+                V = np.zeros_like(old_V)
+                v_len = np.zeros(N, dtype=np.int64)
+
+                # Quán tính: áp dụng lại từng phép đổi của vận tốc cũ với xác suất w
+                keep = self.rng.random(old_len.shape + (self.max_velocity,)) < self.w
+                for l in range(int(old_len.max(initial=0))):
+                    rows = np.flatnonzero((l < old_len) & keep[:, l])
+                    if len(rows):
+                        self._swap(X, pos, rows, old_V[rows, l, 0], old_V[rows, l, 1], V, v_len)
+
+                # Thành phần cá nhân và xã hội
+                self._move_towards(X, pos, P_best, self.c1, V, v_len)
+                G_best = np.broadcast_to(self.global_best_solution, X.shape)
+                self._move_towards(X, pos, G_best, self.c2, V, v_len)
+
+            # Đánh giá
+            current_vals = self.evaluate_batch(X)
+
+            # Cập nhật P_best
+            with self.phase('selection'):
+                better_mask = current_vals < P_best_val
+                P_best[better_mask] = X[better_mask]
+                P_best_val[better_mask] = current_vals[better_mask]
+
+                # Cập nhật Global Best
+                min_idx = np.argmin(P_best_val)
+                if P_best_val[min_idx] < self.global_best_fitness:
+                    self.update_global_best(P_best[min_idx], P_best_val[min_idx])
+
+            self.save_history(P_best, P_best_val)
+
+        return self.global_best_solution, self.global_best_fitness
@@ -1,3 +1,4 @@
+import os
 # Import bài toán
 from problems.continuous import Sphere, Rastrigin, Rosenbrock, Ackley
 from problems.discrete import TSP # (File này chúng ta sẽ tạo ở bước sau)
@@ -6,32 +7,38 @@ from problems.discrete import TSP # (File này chúng ta sẽ tạo ở bước
 from algorithms.classical.hill_climbing import HillClimbing
 from algorithms.evolutionary.ga import GeneticAlgorithm
 from algorithms.physics.simulated_annealing import SimulatedAnnealing
-from algorithms.swarm import PSO, ABC, FA, CS, ACO
-# from algorithms.classical.hill_climbing_tsp import HillClimbingTSP (Sẽ dùng cho bài toán rời rạc)
+from algorithms.swarm import PSO, ABC, FA, CS, ACO, SwapSequencePSO
+from algorithms.classical.hill_climbing_tsp import HillClimbingTSP
+from algorithms.classical.simulated_annealing import SimulatedAnnealingTSP
+from algorithms.evolutionary.ga_tsp import GeneticAlgorithmTSP
 
 from algorithms.physics.gsa import GravitationalSearchAlgorithm
 from algorithms.physics.hs import HarmonySearch
 # Import công cụ chạy
-from utils.experiments import run_suite
+from utils.benchmark import run_benchmark
+
+# Kết quả từng lần chạy được ghi vào RESULTS_DIR/<tên kịch bản>.csv, biểu đồ lưu vào RESULTS_DIR/plots.
+# Chạy lại main.py sau khi bị ngắt sẽ bỏ qua các lần chạy đã có trong file kết quả.
+RESULTS_DIR = "results"
+
+# ==========================================
+# KỊCH BẢN 1: BÀI TOÁN LIÊN TỤC (CONTINUOUS)
+# ==========================================
+CONTINUOUS_BENCHMARK = {
+    'name': 'continuous',
+    'n_runs': 30,
+    'seed': 42,
 
-def main():
-    # ==========================================
-    # KỊCH BẢN 1: BÀI TOÁN LIÊN TỤC (CONTINUOUS)
-    # ==========================================
-    print("\n==============================================")
-    print("SCENARIO 1: CONTINUOUS OPTIMIZATION BENCHMARK")
-    print("==============================================")
-    
     # 1. Chọn các bài test (Test Cases)
     # Bạn muốn so sánh trên nhiều địa hình khác nhau
-    continuous_problems = [
-        Sphere(dim=10),      # Dễ, lồi
-        Rastrigin(dim=10),   # Khó, đa cực trị (nhiều đỉnh nhọn)
-        # Ackley(dim=10)     # (Mở comment nếu muốn test thêm)
-    ]
-    
+    'problems': [
+        {'class': Sphere, 'params': {'dim': 10}},      # Dễ, lồi
+        {'class': Rastrigin, 'params': {'dim': 10}},   # Khó, đa cực trị (nhiều đỉnh nhọn)
+        # {'class': Ackley, 'params': {'dim': 10}},    # (Mở comment nếu muốn test thêm)
+    ],
+
     # 2. Chọn các thuật toán và tham số (Algorithm Configs)
-    continuous_algos = [
+    'algorithms': [
         {
             'class': HillClimbing, 
             'params': {'max_iter': 500, 'step_size': 0.5}
@@ -54,38 +61,58 @@ def main():
             'params': {'max_iter': 500, 'pop_size': 20, 'hmcr': 0.95, 'par': 0.3}
         }
     ]
-    
-    # 3. Kích hoạt chạy bộ test
-    run_suite(continuous_problems, continuous_algos, n_runs=30)
+}
 
+# ==========================================
+# KỊCH BẢN 2: BÀI TOÁN RỜI RẠC (DISCRETE)
+# ==========================================
+DISCRETE_BENCHMARK = {
+    'name': 'tsp',
+    'n_runs': 5,
+    'seed': 42,
+    'problems': [
+        {'class': TSP, 'params': {'n_cities': 20}},
+        {'class': TSP, 'params': {'n_cities': 100}}
+    ],
 
-    # ==========================================
-    # KỊCH BẢN 2: BÀI TOÁN RỜI RẠC (DISCRETE)
-    # ==========================================
-    # Hiện tại chúng ta chưa cài xong thuật toán cho TSP (GA/SA cần sửa đổi cho TSP)
-    # Nên tôi tạm comment lại để code không lỗi. 
-    # Khi bạn cài xong HillClimbingTSP ở bước trước thì mở ra nhé.
-    
-    """
-    print("\n==============================================")
-    print("SCENARIO 2: DISCRETE OPTIMIZATION (TSP)")
-    print("==============================================")
-    
-    discrete_problems = [
-        TSP(n_cities=10),
-        TSP(n_cities=20)
-    ]
-    
-    discrete_algos = [
+    # Các thuật toán làm việc trực tiếp trên hoán vị (lộ trình int32)
+    'algorithms': [
         {
             'class': HillClimbingTSP,
-            'params': {'max_iter': 1000}
+            'params': {'max_iter': 1000, 'move': '2opt', 'strategy': 'first'}
+        },
+        {
+            'class': SimulatedAnnealingTSP,
+            'params': {'max_iter': 20000}
+        },
+        {
+            'class': GeneticAlgorithmTSP,
+            'params': {'max_iter': 200, 'pop_size': 100, 'crossover': 'ox'}
+        },
+        {
+            'class': SwapSequencePSO,
+            'params': {'max_iter': 200, 'pop_size': 30}
+        },
+        {
+            'class': ACO,
+            'params': {'max_iter': 100, 'n_ants': 20, 'n_candidates': 15}
         }
-        # Sau này thêm GA_TSP, SA_TSP vào đây
     ]
-    
-    run_suite(discrete_problems, discrete_algos, n_runs=5)
-    """
+}
+
+SCENARIOS = [
+    ("SCENARIO 1: CONTINUOUS OPTIMIZATION BENCHMARK", CONTINUOUS_BENCHMARK),
+    ("SCENARIO 2: DISCRETE OPTIMIZATION (TSP)", DISCRETE_BENCHMARK),
+]
+
+def main():
+    for title, config in SCENARIOS:
+        print("\n==============================================")
+        print(title)
+        print("==============================================")
+        run_benchmark(config,
+                      results_path=os.path.join(RESULTS_DIR, f"{config['name']}.csv"),
+                      plots_dir=os.path.join(RESULTS_DIR, "plots"))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,114 @@
+import numpy as np
+from collections import OrderedDict
+
+class CachedProblem:
+    """
+    Lớp bọc (wrapper) thêm bộ nhớ đệm LRU cho hàm fitness của bất kỳ bài toán nào
+    (ContinuousProblem / DiscreteProblem).
+    Dùng khi hàm mục tiêu đắt (mô phỏng...) và thuật toán hay đánh giá lại cùng một lời giải
+    (quần thể GA/HS đã hội tụ, Hill Climbing trên TSP...).
+    Các thuộc tính khác (bounds, dim, name, dist_matrix...) được chuyển tiếp về bài toán gốc.
+    Optimizer.n_evals / max_fe đếm cả các lần trúng cache (số lời giải được yêu cầu đánh giá);
+    số lần gọi hàm mục tiêu gốc được báo riêng qua misses (xem cache_info).
+    """
+    def __init__(self, problem, capacity=10000, tolerance=None):
+        """
+        Args:
+            problem: Bài toán gốc
+            capacity: Số lời giải tối đa lưu trong cache (cũ nhất bị loại trước - LRU)
+            tolerance: None -> so khớp chính xác từng byte.
+                       Số thực > 0 -> làm tròn lời giải theo lưới tolerance trước khi băm
+                       (các điểm cùng ô lưới dùng chung 1 giá trị fitness).
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity phải > 0, nhận được: {capacity}")
+        if tolerance is not None and tolerance <= 0:
+            raise ValueError(f"tolerance phải > 0, nhận được: {tolerance}")
+        self.problem = problem
+        self.capacity = capacity
+        self.tolerance = tolerance
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __getattr__(self, name):
+        # Chỉ được gọi khi không tìm thấy thuộc tính trên wrapper -> chuyển về bài toán gốc
+        # (chặn 'problem' và dunder để pickle/copy không bị đệ quy vô hạn)
+        if name == 'problem' or name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.problem, name)
+
+    def _key(self, x):
+        arr = np.asarray(x)
+        if self.tolerance is not None:
+            arr = np.round(arr / self.tolerance).astype(np.int64)
+        elif arr.dtype.kind in 'iu':
+            # Chuẩn hóa kiểu số nguyên để [0, 2, 1] dạng int32 và int64 trùng khóa
+            arr = arr.astype(np.int64)
+        else:
+            arr = arr.astype(np.float64)
+        return arr.tobytes()
+
+    def _store(self, key, value):
+        self._cache[key] = value
+        if len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+
+    def fitness(self, x):
+        key = self._key(x)
+        value = self._cache.get(key)
+        if value is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return value
+        self.misses += 1
+        value = self.problem.fitness(x)
+        self._store(key, value)
+        return value
+
+    def fitness_batch(self, X):
+        """
+        Đánh giá cả quần thể: các hàng đã có trong cache được lấy ra,
+        các hàng còn lại (đã loại trùng) được gửi cho bài toán gốc trong 1 lần gọi fitness_batch.
+        """
+        X = np.asarray(X)
+        keys = [self._key(x) for x in X]
+        values = np.empty(len(keys), dtype=float)
+
+        pending = {}  # key -> danh sách vị trí cần giá trị
+        for i, key in enumerate(keys):
+            value = self._cache.get(key)
+            if value is not None:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                values[i] = value
+            else:
+                pending.setdefault(key, []).append(i)
+
+        if pending:
+            first_rows = [rows[0] for rows in pending.values()]
+            new_values = self.problem.fitness_batch(X[first_rows])
+            for (key, rows), value in zip(pending.items(), new_values):
+                # Chỉ lần xuất hiện đầu tiên là miss, các bản trùng trong cùng batch tính là hit
+                self.misses += 1
+                self.hits += len(rows) - 1
+                values[rows] = value
+                self._store(key, value)
+        return values
+
+    def cache_info(self):
+        """Thống kê cache: số lần trúng/trượt, tỉ lệ trúng và kích thước hiện tại"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._cache),
+            "capacity": self.capacity
+        }
+
+    def clear(self):
+        """Xóa cache và đặt lại bộ đếm"""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
@@ -9,6 +9,15 @@ class ContinuousProblem:
     def fitness(self, x):
         raise NotImplementedError
 
+    def fitness_batch(self, X):
+        """
+        Tính fitness cho cả quần thể cùng lúc.
+        X có dạng (pop_size, dim), trả về mảng (pop_size,).
+        Mặc định gọi fitness() cho từng hàng; các bài toán con nên ghi đè bằng bản vector hóa.
+        """
+        X = np.atleast_2d(X)
+        return np.array([self.fitness(x) for x in X], dtype=float)
+
 # --- Bài 1: Sphere (Dễ, Lồi) ---
 class Sphere(ContinuousProblem):
     def __init__(self, dim=10):
@@ -17,6 +26,10 @@ class Sphere(ContinuousProblem):
     def fitness(self, x):
         return np.sum(x**2)
 
+    def fitness_batch(self, X):
+        X = np.atleast_2d(X)
+        return np.sum(X**2, axis=1)
+
 # --- Bài 2: Rastrigin (Khó, Đa cực trị) ---
 class Rastrigin(ContinuousProblem):
     def __init__(self, dim=10):
@@ -26,6 +39,11 @@ class Rastrigin(ContinuousProblem):
         A = 10
         return A * self.dim + np.sum(x**2 - A * np.cos(2 * np.pi * x))
 
+    def fitness_batch(self, X):
+        A = 10
+        X = np.atleast_2d(X)
+        return A * self.dim + np.sum(X**2 - A * np.cos(2 * np.pi * X), axis=1)
+
 # --- Bài 3: Rosenbrock (Thung lũng hẹp - Rất khó hội tụ) ---
 class Rosenbrock(ContinuousProblem):
     def __init__(self, dim=10):
@@ -35,6 +53,10 @@ class Rosenbrock(ContinuousProblem):
         # f(x) = sum(100*(x_{i+1} - x_i^2)^2 + (1 - x_i)^2)
         return np.sum(100.0 * (x[1:] - x[:-1]**2.0)**2.0 + (1 - x[:-1])**2.0)
 
+    def fitness_batch(self, X):
+        X = np.atleast_2d(X)
+        return np.sum(100.0 * (X[:, 1:] - X[:, :-1]**2.0)**2.0 + (1 - X[:, :-1])**2.0, axis=1)
+
 # --- Bài 4: Ackley (Nhiều bẫy nhỏ nhưng có phễu lớn) ---
 class Ackley(ContinuousProblem):
     def __init__(self, dim=10):
@@ -44,4 +66,11 @@ class Ackley(ContinuousProblem):
         a, b, c = 20, 0.2, 2 * np.pi
         term1 = -a * np.exp(-b * np.sqrt(np.mean(x**2)))
         term2 = -np.exp(np.mean(np.cos(c * x)))
-        return term1 + term2 + a + np.exp(1)
\ No newline at end of file
+        return term1 + term2 + a + np.exp(1)
+
+    def fitness_batch(self, X):
+        a, b, c = 20, 0.2, 2 * np.pi
+        X = np.atleast_2d(X)
+        term1 = -a * np.exp(-b * np.sqrt(np.mean(X**2, axis=1)))
+        term2 = -np.exp(np.mean(np.cos(c * X), axis=1))
+        return term1 + term2 + a + np.exp(1)
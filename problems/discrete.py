@@ -12,6 +12,12 @@ class DiscreteProblem:
     def fitness(self, solution):
         raise NotImplementedError
 
+    def fitness_batch(self, solutions):
+        """
+        Tính fitness cho nhiều lời giải cùng lúc. Mặc định gọi fitness() cho từng hàng.
+        """
+        return np.array([self.fitness(sol) for sol in solutions], dtype=float)
+
 class TSP(DiscreteProblem):
     """
     Traveling Salesman Problem (TSP) - Bài toán người du lịch
@@ -23,18 +29,18 @@ class TSP(DiscreteProblem):
         self.dim = n_cities # Số chiều = Số thành phố
         
         # Cố định seed để mỗi lần chạy đều ra bản đồ giống nhau (dễ so sánh)
-        np.random.seed(seed)
-        
+        # Dùng bộ sinh số ngẫu nhiên riêng để không ghi đè trạng thái toàn cục của np.random
+        map_rng = np.random.RandomState(seed)
+
         # Tạo toạ độ ngẫu nhiên cho các thành phố (x, y) trong khoảng [0, 100]
-        self.cities = np.random.rand(n_cities, 2) * 100
+        self.cities = map_rng.rand(n_cities, 2) * 100
         
         # Tính trước ma trận khoảng cách (Distance Matrix) để thuật toán chạy nhanh hơn
         # Thay vì tính lại khoảng cách mỗi lần, ta tra bảng
-        self.dist_matrix = np.zeros((n_cities, n_cities))
-        for i in range(n_cities):
-            for j in range(n_cities):
-                # Khoảng cách Euclidean: sqrt((x1-x2)^2 + (y1-y2)^2)
-                self.dist_matrix[i, j] = np.linalg.norm(self.cities[i] - self.cities[j])
+        # Khoảng cách Euclidean: sqrt((x1-x2)^2 + (y1-y2)^2), tính cho mọi cặp bằng broadcast
+        dx = self.cities[:, 0, np.newaxis] - self.cities[np.newaxis, :, 0]
+        dy = self.cities[:, 1, np.newaxis] - self.cities[np.newaxis, :, 1]
+        self.dist_matrix = np.hypot(dx, dy)
 
     def fitness(self, path):
         """
@@ -42,17 +48,30 @@ class TSP(DiscreteProblem):
         Path là danh sách chỉ số thành phố, ví dụ: [0, 5, 2, 9...]
         """
         # Đảm bảo path là kiểu số nguyên
-        path = np.array(path, dtype=int)
-        
-        total_dist = 0
-        # Cộng khoảng cách giữa các thành phố liên tiếp
-        for i in range(len(path) - 1):
-            total_dist += self.dist_matrix[path[i], path[i+1]]
-            
-        # Cộng khoảng cách từ điểm cuối quay về điểm đầu
-        total_dist += self.dist_matrix[path[-1], path[0]]
-        
-        return total_dist
+        path = np.asarray(path, dtype=int)
+
+        # Cộng khoảng cách giữa các thành phố liên tiếp, kể cả đoạn từ điểm cuối quay về điểm đầu
+        return np.sum(self.dist_matrix[path, np.roll(path, -1)])
+
+    def fitness_batch(self, paths):
+        """
+        Tính độ dài cho nhiều lộ trình cùng lúc.
+        paths: mảng (n_tours, n_cities), mỗi hàng là một lộ trình. Trả về mảng (n_tours,).
+        """
+        paths = np.atleast_2d(np.asarray(paths, dtype=int))
+        return np.sum(self.dist_matrix[paths, np.roll(paths, -1, axis=1)], axis=1)
+
+    def neighbor_lists(self, k):
+        """
+        Danh sách ứng viên (Candidate List): k thành phố gần nhất của mỗi thành phố (không gồm chính nó),
+        sắp xếp theo khoảng cách tăng dần. Trả về mảng (n_cities, k).
+        """
+        k = int(min(k, self.n_cities - 1))
+        dist = self.dist_matrix.copy()
+        np.fill_diagonal(dist, np.inf)
+        nearest = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(dist, nearest, axis=1), axis=1)
+        return np.take_along_axis(nearest, order, axis=1)
 
     def visualize(self, path, title="TSP Route"):
         """Vẽ bản đồ và đường đi"""
@@ -78,4 +97,519 @@ class TSP(DiscreteProblem):
         plt.ylabel("Y Coordinate")
         plt.legend()
         plt.grid(True, linestyle='--', alpha=0.5)
-        plt.show()
\ No newline at end of file
+        plt.show()
+
+
+class TSPLocalSearch:
+    """
+    Bộ máy tìm kiếm cục bộ cho TSP với chi phí delta O(1).
+    Giữ lộ trình hiện tại (tour), vị trí của từng thành phố trong lộ trình (pos) và độ dài (length).
+    Các phép biến đổi được áp dụng trực tiếp lên mảng (in-place), không sao chép lộ trình:
+    - 'swap'  : Đổi chỗ 2 thành phố ở vị trí i, j
+    - '2opt'  : Bỏ cạnh (t[i], t[i+1]) và (t[j], t[j+1]), đảo ngược đoạn t[i+1..j]
+    - 'or_opt': Chuyển đoạn dài L bắt đầu ở vị trí i đến sau vị trí j
+    """
+    MOVES = ('swap', '2opt', 'or_opt')
+
+    def __init__(self, problem, tour, n_candidates=10, max_segment=3, rng=None):
+        """
+        Args:
+            problem: Bài toán TSP
+            tour: Lộ trình ban đầu (sẽ được sao chép 1 lần)
+            n_candidates: Số thành phố gần nhất dùng cho danh sách ứng viên khi duyệt lân cận
+            max_segment: Độ dài tối đa của đoạn di chuyển trong or-opt
+            rng: np.random.Generator dùng để sinh bước đi ngẫu nhiên (thường là optimizer.rng)
+        """
+        self.problem = problem
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.dist = problem.dist_matrix
+        self.n = problem.n_cities
+        self.tour = np.array(tour, dtype=np.int32)
+        self.pos = np.empty(self.n, dtype=np.int32)
+        self.pos[self.tour] = np.arange(self.n, dtype=np.int32)
+        self.length = float(problem.fitness(self.tour))
+        self.max_segment = max(1, min(max_segment, self.n - 2))
+        self.candidates = problem.neighbor_lists(n_candidates) if n_candidates and self.n > 2 else None
+
+    # ------------------------------------------------------------------
+    # Delta O(1)
+    # ------------------------------------------------------------------
+    def swap_delta(self, i, j):
+        """Chênh lệch độ dài khi đổi chỗ 2 thành phố ở vị trí i và j"""
+        if i == j:
+            return 0.0
+        n, t, d = self.n, self.tour, self.dist
+        # Các cạnh bị ảnh hưởng, cạnh k nối t[k] và t[k+1]
+        edges = {(i - 1) % n, i, (j - 1) % n, j}
+
+        def city(k):
+            if k == i:
+                return t[j]
+            if k == j:
+                return t[i]
+            return t[k]
+
+        delta = 0.0
+        for k in edges:
+            k1 = (k + 1) % n
+            delta += d[city(k), city(k1)] - d[t[k], t[k1]]
+        return delta
+
+    def two_opt_delta(self, i, j):
+        """Chênh lệch độ dài của phép 2-opt giữa cạnh ở vị trí i và cạnh ở vị trí j"""
+        if i == j:
+            return 0.0
+        if i > j:
+            i, j = j, i
+        t, d = self.tour, self.dist
+        a, b = t[i], t[i + 1]
+        c, e = t[j], t[(j + 1) % self.n]
+        return d[a, c] + d[b, e] - d[a, b] - d[c, e]
+
+    def or_opt_delta(self, i, seg_len, j):
+        """
+        Chênh lệch độ dài khi chuyển đoạn t[i..i+L-1] vào giữa t[j] và t[j+1].
+        j không được nằm trong đoạn và không được là vị trí ngay trước đoạn.
+        """
+        n, t, d = self.n, self.tour, self.dist
+        p, s0 = t[(i - 1) % n], t[i]
+        s_last, nx = t[(i + seg_len - 1) % n], t[(i + seg_len) % n]
+        c, cn = t[j], t[(j + 1) % n]
+        return (d[p, nx] + d[c, s0] + d[s_last, cn]
+                - d[p, s0] - d[s_last, nx] - d[c, cn])
+
+    # ------------------------------------------------------------------
+    # Áp dụng bước đi (in-place)
+    # ------------------------------------------------------------------
+    def _write(self, idx, values):
+        self.tour[idx] = values
+        self.pos[values] = idx
+
+    def apply_swap(self, i, j, delta=None):
+        if delta is None:
+            delta = self.swap_delta(i, j)
+        t = self.tour
+        t[i], t[j] = t[j], t[i]
+        self.pos[t[i]], self.pos[t[j]] = i, j
+        self.length += delta
+
+    def apply_two_opt(self, i, j, delta=None):
+        if i > j:
+            i, j = j, i
+        if delta is None:
+            delta = self.two_opt_delta(i, j)
+        n = self.n
+        m = j - i
+        # Đảo đoạn ngắn hơn: đảo t[i+1..j] hay đảo phần bù t[j+1..i] cho cùng một chu trình
+        if m <= n - m:
+            idx = np.arange(i + 1, j + 1)
+        else:
+            idx = np.arange(j + 1, j + 1 + n - m) % n
+        self._write(idx, self.tour[idx[::-1]])
+        self.length += delta
+
+    def apply_or_opt(self, i, seg_len, j, delta=None):
+        if delta is None:
+            delta = self.or_opt_delta(i, seg_len, j)
+        n = self.n
+        forward = (j - i) % n + 1                 # Vùng i..j: đoạn dời ra sau
+        backward = (i + seg_len - 1 - j) % n      # Vùng j+1..i+L-1: đoạn dời lên trước
+        if forward <= backward:
+            idx = (i + np.arange(forward)) % n
+            values = self.tour[idx]
+            self._write(idx, np.concatenate([values[seg_len:], values[:seg_len]]))
+        else:
+            idx = (j + 1 + np.arange(backward)) % n
+            values = self.tour[idx]
+            split = backward - seg_len
+            self._write(idx, np.concatenate([values[split:], values[:split]]))
+        self.length += delta
+
+    def apply(self, move, args, delta=None):
+        """Áp dụng bước đi move với tham số args (tuple vị trí)"""
+        if move == 'swap':
+            self.apply_swap(*args, delta=delta)
+        elif move == '2opt':
+            self.apply_two_opt(*args, delta=delta)
+        elif move == 'or_opt':
+            self.apply_or_opt(*args, delta=delta)
+        else:
+            raise ValueError(f"move phải thuộc {self.MOVES}, nhận được: {move}")
+
+    # ------------------------------------------------------------------
+    # Sinh bước đi ngẫu nhiên (dùng cho Hill Climbing / SA)
+    # ------------------------------------------------------------------
+    def random_move(self, move):
+        """Sinh 1 bước đi ngẫu nhiên, trả về (args, delta) với chi phí O(1)"""
+        n = self.n
+        if move == 'swap':
+            i, j = self.rng.choice(n, 2, replace=False)
+            return (i, j), self.swap_delta(i, j)
+        if move == '2opt':
+            i, j = sorted(self.rng.choice(n, 2, replace=False))
+            return (i, j), self.two_opt_delta(i, j)
+        if move == 'or_opt':
+            seg_len = self.rng.integers(1, self.max_segment + 1)
+            i = self.rng.integers(0, n)
+            # j chạy trên các vị trí ngoài đoạn, trừ vị trí ngay trước đoạn
+            j = (i + seg_len + self.rng.integers(0, n - seg_len - 1)) % n
+            return (i, seg_len, j), self.or_opt_delta(i, seg_len, j)
+        raise ValueError(f"move phải thuộc {self.MOVES}, nhận được: {move}")
+
+    # ------------------------------------------------------------------
+    # Duyệt lân cận trên danh sách ứng viên (vector hóa)
+    # ------------------------------------------------------------------
+    def _candidate_deltas(self, move, P):
+        """
+        Tính delta của mọi bước đi sinh từ các vị trí P và danh sách ứng viên.
+        Trả về (deltas, args) với args là tuple các mảng tham số tương ứng.
+        """
+        n, t, d, pos = self.n, self.tour, self.dist, self.pos
+        a = t[P][:, np.newaxis]
+        C = self.candidates[t[P]]
+        J = pos[C]
+
+        if move == '2opt':
+            # Nối a-c: bỏ (a, succ a), (c, succ c) hoặc bỏ (pred a, a), (pred c, c)
+            I = np.broadcast_to(P[:, np.newaxis], J.shape)
+            B, D = t[(I + 1) % n], t[(J + 1) % n]
+            delta_succ = d[a, C] + d[B, D] - d[a, B] - d[C, D]
+            Bp, Dp = t[(I - 1) % n], t[(J - 1) % n]
+            delta_pred = d[a, C] + d[Bp, Dp] - d[a, Bp] - d[C, Dp]
+            deltas = np.concatenate([delta_succ.ravel(), delta_pred.ravel()])
+            i_arr = np.concatenate([I.ravel(), ((I - 1) % n).ravel()])
+            j_arr = np.concatenate([J.ravel(), ((J - 1) % n).ravel()])
+            return deltas, (i_arr, j_arr)
+
+        if move == 'swap':
+            # Đổi chỗ thành phố đứng sau a với c để c trở thành hàng xóm của a
+            X = np.broadcast_to(((P + 1) % n)[:, np.newaxis], J.shape)
+            Y = J
+            u, v = t[X], t[Y]
+            pu, nu = t[(X - 1) % n], t[(X + 1) % n]
+            pv, nv = t[(Y - 1) % n], t[(Y + 1) % n]
+            deltas = (d[pu, v] + d[v, nu] + d[pv, u] + d[u, nv]
+                      - d[pu, u] - d[u, nu] - d[pv, v] - d[v, nv])
+            # Loại các cặp trùng hoặc kề nhau (công thức trên chỉ đúng khi 4 cạnh phân biệt)
+            gap = (Y - X) % n
+            deltas = np.where((gap <= 1) | (gap >= n - 1), np.inf, deltas)
+            return deltas.ravel(), (X.ravel(), Y.ravel())
+
+        if move == 'or_opt':
+            # Chuyển đoạn bắt đầu tại s0 = t[i] vào sau thành phố c gần s0
+            all_d, all_i, all_l, all_j = [], [], [], []
+            I = np.broadcast_to(P[:, np.newaxis], J.shape)
+            for seg_len in range(1, self.max_segment + 1):
+                p, s0 = t[(I - 1) % n], t[I]
+                s_last, nx = t[(I + seg_len - 1) % n], t[(I + seg_len) % n]
+                cn = t[(J + 1) % n]
+                deltas = (d[p, nx] + d[C, s0] + d[s_last, cn]
+                          - d[p, s0] - d[s_last, nx] - d[C, cn])
+                invalid = ((J - I) % n < seg_len) | (J == (I - 1) % n)
+                all_d.append(np.where(invalid, np.inf, deltas).ravel())
+                all_i.append(I.ravel())
+                all_l.append(np.full(I.size, seg_len))
+                all_j.append(J.ravel())
+            return (np.concatenate(all_d),
+                    (np.concatenate(all_i), np.concatenate(all_l), np.concatenate(all_j)))
+
+        raise ValueError(f"move phải thuộc {self.MOVES}, nhận được: {move}")
+
+    def scan(self, move='2opt', strategy='first', block_size=64):
+        """
+        Duyệt lân cận trên danh sách ứng viên và áp dụng 1 bước cải thiện.
+        strategy: 'best' -> bước tốt nhất trong toàn bộ lân cận
+                  'first' -> duyệt từng khối block_size vị trí (bắt đầu ngẫu nhiên),
+                             dừng ở khối đầu tiên có cải thiện và lấy bước tốt nhất trong khối đó
+        Trả về (delta, n_moves): delta đã áp dụng (0.0 nếu lộ trình đã là cực tiểu địa phương)
+        và số bước đi ứng viên đã được tính delta (tương đương số lần đánh giá).
+        """
+        if self.candidates is None:
+            raise ValueError("Cần n_candidates > 0 để duyệt lân cận")
+        if strategy not in ('first', 'best'):
+            raise ValueError(f"strategy phải là 'first' hoặc 'best', nhận được: {strategy}")
+
+        n = self.n
+        if strategy == 'best':
+            blocks = [np.arange(n)]
+        else:
+            order = (self.rng.integers(0, n) + np.arange(n)) % n
+            blocks = [order[s:s + block_size] for s in range(0, n, block_size)]
+
+        n_moves = 0
+        for P in blocks:
+            deltas, args = self._candidate_deltas(move, P)
+            n_moves += len(deltas)
+            k = np.argmin(deltas)
+            if deltas[k] < -1e-10:
+                delta = float(deltas[k])
+                self.apply(move, tuple(int(arg[k]) for arg in args), delta)
+                return delta, n_moves
+        return 0.0, n_moves
+
+    def local_optimum(self, move='2opt', strategy='first', max_moves=None):
+        """Lặp scan() đến khi không còn bước cải thiện (hoặc đạt max_moves). Trả về số bước đã áp dụng."""
+        n_moves = 0
+        while max_moves is None or n_moves < max_moves:
+            if self.scan(move, strategy)[0] == 0.0:
+                break
+            n_moves += 1
+        return n_moves
+
+
+class GraphProblem(DiscreteProblem):
+    """
+    Bài toán tìm đường trên đồ thị có trọng số, danh sách kề lưu dạng CSR (Compressed Sparse Row):
+    - indptr (n_nodes + 1,): các cạnh đi ra từ u nằm ở indices[indptr[u]:indptr[u + 1]]
+    - indices (n_edges,): đỉnh đích của mỗi cạnh
+    - weights (n_edges,): trọng số (chi phí) của mỗi cạnh
+    Không dùng dict/list lồng nhau -> bộ nhớ chỉ O(n_nodes + n_edges) số nguyên/thực.
+    Lời giải là đường đi (mảng đỉnh từ start đến goal), fitness là tổng chi phí.
+    """
+    METRICS = ('manhattan', 'octile', 'euclidean')
+
+    def __init__(self, indptr, indices, weights, start=0, goal=None, coords=None, metric='euclidean',
+                 name=None):
+        """
+        Args:
+            start, goal: Đỉnh xuất phát và đích (mặc định goal là đỉnh cuối cùng)
+            coords: Tọa độ (n_nodes, 2) của các đỉnh dùng cho hàm heuristic (None -> heuristic = 0)
+            metric: Khoảng cách dùng cho heuristic, một trong METRICS.
+                    Chỉ admissible khi trọng số mỗi cạnh >= khoảng cách giữa 2 đầu mút.
+        Cạnh song song (cùng nguồn, cùng đích) trong CSR đầu vào được gộp, chỉ giữ cạnh rẻ nhất.
+        """
+        indptr = np.asarray(indptr, dtype=np.int64)
+        self.n_nodes = len(indptr) - 1
+        super().__init__(name=name or f"Graph ({self.n_nodes} nodes)")
+        if metric not in self.METRICS:
+            raise ValueError(f"metric phải thuộc {self.METRICS}, nhận được: {metric}")
+        indices = np.asarray(indices, dtype=np.int32 if self.n_nodes < 2**31 else np.int64)
+        weights = np.asarray(weights, dtype=np.float64)
+        if len(indices) != indptr[-1] or len(weights) != len(indices):
+            raise ValueError(f"CSR không hợp lệ: indptr[-1] = {indptr[-1]}, len(indices) = {len(indices)}, "
+                             f"len(weights) = {len(weights)}")
+        self.indptr, self.indices, self.weights = self._merge_parallel(indptr, indices, weights)
+        self.dim = self.n_nodes
+        self.start = int(start)
+        self.goal = int(self.n_nodes - 1 if goal is None else goal)
+        self.coords = None if coords is None else np.asarray(coords, dtype=np.float64)
+        self.metric = metric
+
+    @classmethod
+    def from_edges(cls, n_nodes, edges, weights=None, directed=False, **kwargs):
+        """
+        Tạo đồ thị từ danh sách cạnh (n_edges, 2). weights mặc định = 1.
+        directed=False: mỗi cạnh được thêm theo cả 2 chiều.
+        """
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        weights = np.ones(len(edges)) if weights is None else np.asarray(weights, dtype=np.float64)
+        src, dst = edges[:, 0], edges[:, 1]
+        if not directed:
+            src, dst = np.concatenate([src, dst]), np.concatenate([dst, src])
+            weights = np.concatenate([weights, weights])
+        # Sắp xếp cạnh theo (nguồn, đích); cạnh song song được gộp trong __init__
+        order = np.lexsort((dst, src))
+        src, dst, weights = src[order], dst[order], weights[order]
+        # indptr là tổng tích lũy số cạnh ra của mỗi đỉnh
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(src, minlength=n_nodes))])
+        return cls(indptr, dst, weights, **kwargs)
+
+    @staticmethod
+    def _merge_parallel(indptr, indices, weights):
+        """
+        Gộp các cạnh song song của CSR, chỉ giữ cạnh rẻ nhất (các thuật toán tìm kiếm cập nhật g
+        theo chỉ số đỉnh kề nên đỉnh kề của 1 đỉnh không được trùng).
+        Thứ tự đỉnh kề của đầu vào được giữ nguyên; không có cạnh song song -> trả lại nguyên các mảng.
+        """
+        n_nodes = len(indptr) - 1
+        src = np.repeat(np.arange(n_nodes), np.diff(indptr))
+        order = np.lexsort((weights, indices, src))
+        s, d = src[order], indices[order]
+        parallel = (s[1:] == s[:-1]) & (d[1:] == d[:-1])
+        if not np.any(parallel):
+            return indptr, indices, weights
+        # Vị trí cạnh trong CSR đã nhóm theo nguồn -> sắp xếp lại vị trí là giữ thứ tự ban đầu
+        order = np.sort(order[np.r_[True, ~parallel]])
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(src[order], minlength=n_nodes))])
+        return indptr, indices[order], weights[order]
+
+    def neighbors(self, u):
+        """Các đỉnh kề của u và chi phí tương ứng (view trên mảng CSR, không sao chép)"""
+        s, e = self.indptr[u], self.indptr[u + 1]
+        return self.indices[s:e], self.weights[s:e]
+
+    def reversed(self):
+        """Đồ thị đảo chiều mọi cạnh (chuyển vị CSR), dùng cho tìm kiếm ngược từ goal"""
+        src = np.repeat(np.arange(self.n_nodes), np.diff(self.indptr))
+        return GraphProblem.from_edges(self.n_nodes, np.column_stack([self.indices, src]), self.weights,
+                                       directed=True, start=self.start, goal=self.goal, coords=self.coords,
+                                       metric=self.metric, name=f"{self.name} (reversed)")
+
+    def _distance(self, dx, dy):
+        """Khoảng cách theo metric từ các độ lệch tọa độ (vector hóa)"""
+        if self.metric == 'manhattan':
+            return dx + dy
+        if self.metric == 'octile':
+            return np.maximum(dx, dy) + (np.sqrt(2) - 1) * np.minimum(dx, dy)
+        return np.hypot(dx, dy)
+
+    def heuristic(self, nodes, target=None):
+        """Ước lượng chi phí từ các đỉnh nodes đến target (mặc định goal), tính cho cả mảng cùng lúc"""
+        nodes = np.asarray(nodes)
+        if self.coords is None:
+            return np.zeros(nodes.shape)
+        target = self.goal if target is None else target
+        diff = np.abs(self.coords[nodes] - self.coords[target])
+        return self._distance(diff[..., 0], diff[..., 1])
+
+    def fitness(self, path):
+        """Tổng chi phí đường đi (inf nếu đường đi rỗng hoặc có cạnh không tồn tại)"""
+        path = np.asarray(path, dtype=np.int64)
+        if len(path) == 0:
+            return np.inf
+        cost = 0.0
+        for u, v in zip(path[:-1], path[1:]):
+            nbrs, w = self.neighbors(u)
+            hit = np.flatnonzero(nbrs == v)
+            if len(hit) == 0:
+                return np.inf
+            cost += w[hit].min()
+        return cost
+
+
+class GridPathfinding(GraphProblem):
+    """
+    Tìm đường trên lưới 2D. Vật cản lưu trong mảng bool grid (True = ô bị chặn), ô (r, c) là đỉnh r * width + c.
+    Lưới lớn (VD: 4096 x 4096) không cần dựng CSR: mỗi ô chỉ lưu 1 byte mặt nạ các hướng đi hợp lệ (moves),
+    các đỉnh kề được sinh khi cần từ bảng độ dịch. to_graph() xuất ra GraphProblem dạng CSR nếu cần.
+    - connectivity=4: 4 hướng, chi phí 1
+    - connectivity=8: thêm 4 hướng chéo, chi phí sqrt(2), không cho đi cắt góc vật cản
+    """
+    DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+    def __init__(self, height=64, width=64, obstacle_ratio=0.2, connectivity=8, seed=42, grid=None,
+                 start=None, goal=None, metric=None):
+        """
+        Args:
+            obstacle_ratio: Tỉ lệ ô bị chặn khi sinh lưới ngẫu nhiên
+            grid: Lưới bool có sẵn (bỏ qua height, width, obstacle_ratio)
+            start, goal: Ô (r, c) xuất phát và đích (mặc định góc trên trái và góc dưới phải, luôn được mở)
+            metric: Heuristic (mặc định 'manhattan' với 4 hướng, 'octile' với 8 hướng)
+        """
+        if connectivity not in (4, 8):
+            raise ValueError(f"connectivity phải là 4 hoặc 8, nhận được: {connectivity}")
+        if grid is None:
+            # Bản đồ cố định theo seed, không ghi đè trạng thái toàn cục của np.random
+            map_rng = np.random.RandomState(seed)
+            grid = map_rng.rand(height, width) < obstacle_ratio
+        self.grid = np.array(grid, dtype=bool)
+        self.height, self.width = self.grid.shape
+        start = (0, 0) if start is None else tuple(start)
+        goal = (self.height - 1, self.width - 1) if goal is None else tuple(goal)
+        self.grid[start] = False
+        self.grid[goal] = False
+        self.connectivity = connectivity
+
+        n_nodes = self.height * self.width
+        DiscreteProblem.__init__(self, name=f"Grid {self.height}x{self.width} ({connectivity}-conn)")
+        self.n_nodes = n_nodes
+        self.dim = n_nodes
+        self.start = self.node(*start)
+        self.goal = self.node(*goal)
+        self.coords = None
+        self.metric = metric or ('octile' if connectivity == 8 else 'manhattan')
+        if self.metric not in self.METRICS:
+            raise ValueError(f"metric phải thuộc {self.METRICS}, nhận được: {self.metric}")
+
+        dirs = np.array(self.DIRECTIONS[:connectivity])
+        self._offsets = dirs[:, 0] * self.width + dirs[:, 1]
+        self._costs = np.where(np.all(dirs != 0, axis=1), np.sqrt(2), 1.0)
+        self.moves = self._build_moves(dirs)
+        # Bảng tra: mặt nạ 8 bit -> chỉ số các hướng hợp lệ
+        self._dir_table = [np.flatnonzero((m >> np.arange(connectivity)) & 1) for m in range(1 << connectivity)]
+
+    def _build_moves(self, dirs):
+        """Mặt nạ hướng đi hợp lệ của mọi ô (uint8), tính bằng các phép dịch lưới"""
+        H, W = self.height, self.width
+        free = np.zeros((H + 2, W + 2), dtype=bool)
+        free[1:-1, 1:-1] = ~self.grid
+
+        def shifted(dr, dc):
+            return free[1 + dr:H + 1 + dr, 1 + dc:W + 1 + dc]
+
+        moves = np.zeros((H, W), dtype=np.uint8)
+        for k, (dr, dc) in enumerate(dirs):
+            valid = ~self.grid & shifted(dr, dc)
+            if dr != 0 and dc != 0:
+                # Không cắt góc: 2 ô kề theo hàng và cột cũng phải trống
+                valid &= shifted(dr, 0) & shifted(0, dc)
+            moves |= valid.astype(np.uint8) << k
+        return moves.ravel()
+
+    def node(self, r, c):
+        return int(r) * self.width + int(c)
+
+    def cell(self, nodes):
+        """Đỉnh -> (hàng, cột), vector hóa"""
+        return np.divmod(nodes, self.width)
+
+    def neighbors(self, u):
+        idx = self._dir_table[self.moves[u]]
+        return u + self._offsets[idx], self._costs[idx]
+
+    def reversed(self):
+        # Các bước đi trên lưới đối xứng (kể cả luật không cắt góc) -> đồ thị ngược chính là lưới này
+        return self
+
+    def heuristic(self, nodes, target=None):
+        target = self.goal if target is None else target
+        r, c = self.cell(np.asarray(nodes))
+        tr, tc = divmod(target, self.width)
+        return self._distance(np.abs(r - tr), np.abs(c - tc))
+
+    def fitness(self, path):
+        """Tổng chi phí đường đi trên lưới (inf nếu đi vào ô bị chặn hoặc bước không hợp lệ), vector hóa"""
+        path = np.asarray(path, dtype=np.int64)
+        if len(path) == 0 or np.any(self.grid.ravel()[path]):
+            return np.inf
+        r, c = self.cell(path)
+        dr, dc = np.abs(np.diff(r)), np.abs(np.diff(c))
+        # Mỗi bước phải trùng 1 hướng nằm trong mặt nạ moves của ô xuất phát
+        # (mặt nạ đã loại các bước ra ngoài biên nên không lo bị "tràn" sang hàng khác)
+        step = np.diff(path)
+        from_moves = self.moves[path[:-1]]
+        allowed = np.zeros(len(step), dtype=bool)
+        for k, offset in enumerate(self._offsets):
+            allowed |= (step == offset) & ((from_moves >> k) & 1).astype(bool)
+        if not np.all(allowed):
+            return np.inf
+        return float(np.sum(np.where((dr == 1) & (dc == 1), np.sqrt(2), 1.0)))
+
+    def to_graph(self):
+        """Xuất lưới thành GraphProblem (CSR) với cùng start, goal và heuristic"""
+        src, dst, w = [], [], []
+        for k, offset in enumerate(self._offsets):
+            has = np.flatnonzero((self.moves >> k) & 1)
+            src.append(has)
+            dst.append(has + offset)
+            w.append(np.full(len(has), self._costs[k]))
+        r, c = self.cell(np.arange(self.n_nodes))
+        return GraphProblem.from_edges(self.n_nodes, np.column_stack([np.concatenate(src), np.concatenate(dst)]),
+                                       np.concatenate(w), directed=True, start=self.start, goal=self.goal,
+                                       coords=np.column_stack([r, c]), metric=self.metric,
+                                       name=f"{self.name} (CSR)")
+
+    def visualize(self, path=None, title="Grid Path"):
+        """Vẽ lưới (ô đen là vật cản) và đường đi"""
+        plt.figure(figsize=(8, 8))
+        plt.imshow(self.grid, cmap='gray_r', origin='upper')
+        if path is not None and len(path):
+            r, c = self.cell(np.asarray(path))
+            plt.plot(c, r, c='blue', linewidth=1.5)
+            plt.title(f"{title}\nCost: {self.fitness(path):.2f}")
+        else:
+            plt.title(title)
+        plt.scatter(*self.cell(self.start)[::-1], c='green', s=50, zorder=3, label='Start')
+        plt.scatter(*self.cell(self.goal)[::-1], c='red', s=50, zorder=3, label='Goal')
+        plt.legend()
+        plt.show()
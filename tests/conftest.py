@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Chạy pytest từ bất kỳ thư mục nào vẫn import được algorithms / problems / utils
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+from problems.discrete import GridPathfinding
+from algorithms.classical.a_star import AStarSearch
+from algorithms.classical.ucs import UniformCostSearch
+
+
+@pytest.mark.parametrize('ratio', [0.0, 0.1, 0.3])
+@pytest.mark.parametrize('seed', range(5))
+def test_jps_matches_ucs_cost(ratio, seed):
+    problem = GridPathfinding(40, 40, obstacle_ratio=ratio, seed=seed)
+    ucs, jps = UniformCostSearch(problem), AStarSearch(problem, mode='jps')
+    ucs.solve()
+    jps.solve()
+    cost, jps_cost = ucs.global_best_fitness, jps.global_best_fitness
+    assert cost == jps_cost == np.inf or np.isclose(cost, jps_cost)
+
+
+def test_jps_prunes_to_natural_and_forced_neighbours():
+    problem = GridPathfinding(128, 128, obstacle_ratio=0.02, seed=0)
+    astar, jps = AStarSearch(problem), AStarSearch(problem, mode='jps')
+    astar.solve()
+    jps.solve()
+    # Giữ thêm hướng vuông góc / chéo phía trước ở mọi điểm nhảy chỉ đạt ~3.5x trên bản đồ này
+    assert jps.nodes_expanded * 5 < astar.nodes_expanded
@@ -0,0 +1,55 @@
+import numpy as np
+from problems.discrete import GraphProblem, GridPathfinding
+from algorithms.classical.bfs import BreadthFirstSearch
+from algorithms.classical.dfs import DepthFirstSearch
+
+
+class _RecordingGraph(GraphProblem):
+    """Ghi lại thứ tự các đỉnh được mở rộng (mỗi lần mở rộng gọi neighbors() đúng 1 lần)"""
+    def neighbors(self, u):
+        self.expanded.append(int(u))
+        return super().neighbors(u)
+
+
+class _RecordingGrid(GridPathfinding):
+    def neighbors(self, u):
+        self.expanded.append(int(u))
+        return super().neighbors(u)
+
+
+def _graph():
+    # 0 -> 3, 1, 3 (cạnh song song), 2; 3 -> 5; 1 -> 4; đích 6 không tới được
+    indptr = [0, 4, 5, 5, 6, 6, 6, 6]
+    indices = [3, 1, 3, 2, 4, 5]
+    weights = [2.0, 1.0, 1.0, 1.0, 1.0, 1.0]
+    problem = _RecordingGraph(indptr, indices, weights, start=0, goal=6)
+    problem.expanded = []
+    return problem
+
+
+def test_parallel_edges_merged_in_input_order():
+    problem = _graph()
+    nbrs, costs = GraphProblem.neighbors(problem, 0)
+    assert nbrs.tolist() == [1, 3, 2]
+    assert costs.tolist() == [1.0, 1.0, 1.0]
+
+
+def test_dfs_expands_neighbours_in_csr_order():
+    problem = _graph()
+    DepthFirstSearch(problem).solve()
+    # Đỉnh kề đầu tiên (1) được lấy ra trước, đi hết nhánh của nó rồi mới tới 3 và 2
+    assert problem.expanded == [0, 1, 4, 3, 5, 2]
+
+
+def test_bfs_expands_neighbours_in_csr_order():
+    problem = _graph()
+    BreadthFirstSearch(problem).solve()
+    assert problem.expanded == [0, 1, 3, 2, 4, 5]
+
+
+def test_dfs_expands_grid_directions_in_order():
+    problem = _RecordingGrid(grid=np.zeros((3, 3), dtype=bool), connectivity=4, start=(1, 1), goal=(2, 2))
+    problem.expanded = []
+    DepthFirstSearch(problem).solve()
+    # DIRECTIONS: lên, xuống, trái, phải -> từ tâm đi lên (0, 1) trước, rồi sang trái (0, 0) ...
+    assert problem.expanded[:3] == [4, 1, 0]
@@ -0,0 +1,22 @@
+import pytest
+from problems.discrete import TSP
+from algorithms.classical.hill_climbing_tsp import HillClimbingTSP
+
+
+@pytest.mark.parametrize('strategy', ['first', 'best'])
+def test_scan_strategies_count_evaluations_and_respect_max_fe(strategy):
+    problem = TSP(50, seed=0)
+    hc = HillClimbingTSP(problem, move='2opt', strategy=strategy, max_iter=1000, max_fe=300, seed=0)
+    hc.solve()
+    assert hc.stop_reason == 'max_fe'
+    # Dừng ngay sau lần duyệt làm vượt ngân sách: vượt tối đa 1 lần duyệt lân cận
+    assert 300 <= hc.n_evals < 300 + 2 * problem.n_cities * hc.n_candidates
+
+
+@pytest.mark.parametrize('strategy', ['first', 'best'])
+def test_scan_strategies_report_evaluations_without_budget(strategy):
+    hc = HillClimbingTSP(TSP(30, seed=1), move='2opt', strategy=strategy, max_iter=1000, seed=0)
+    hc.solve()
+    assert hc.stop_reason == 'local_optimum'
+    # Mỗi lần duyệt tính delta cho nhiều bước ứng viên, không chỉ 1 lần đánh giá
+    assert hc.n_evals > hc.n_candidates * len(hc.history)
@@ -0,0 +1,45 @@
+import numpy as np
+from problems.continuous import Rastrigin
+from algorithms.physics.simulated_annealing import SimulatedAnnealing
+
+
+class _RecordingSA(SimulatedAnnealing):
+    """Ghi lại nhiệt độ của mọi chuỗi sau mỗi bước làm nguội"""
+    def _cool(self, temps, t, accept_rate, stagnant, rungs):
+        temps = super()._cool(temps, t, accept_rate, stagnant, rungs)
+        self.trace.append(temps.copy())
+        return temps
+
+
+def _run(schedule):
+    sa = _RecordingSA(Rastrigin(5), n_chains=6, tempering=True, schedule=schedule,
+                      exchange_interval=5, max_iter=300, seed=0)
+    sa.trace = []
+    sa.solve()
+    return sa
+
+
+def test_linear_tempering_keeps_exchanged_temperatures():
+    sa = _run('linear')
+    assert sa.n_exchanges > 0
+    assert sorted(sa.final_rungs.tolist()) == list(range(6))
+    # Sau khi đổi, nhiệt độ không còn giảm dần theo chỉ số chuỗi ở mọi bước
+    unsorted = [np.any(np.diff(temps) > 0) for temps in sa.trace[:-1]]
+    assert any(unsorted)
+
+
+def test_linear_cooling_follows_current_rung():
+    sa = SimulatedAnnealing(Rastrigin(5), n_chains=4, tempering=True, schedule='linear', max_iter=100)
+    rungs = np.array([1, 0, 3, 2])
+    temps = sa._cool(sa._initial_temps(), 9, None, None, rungs)
+    expected = sa._initial_temps()[rungs] * 0.9
+    assert np.allclose(temps, expected)
+
+
+def test_reheat_uses_current_rung():
+    sa = SimulatedAnnealing(Rastrigin(5), n_chains=3, tempering=True, schedule='reheat',
+                            reheat_after=1, reheat_ratio=0.5, cooling_rate=0.5)
+    rungs = np.array([2, 1, 0])
+    start = sa._initial_temps()
+    temps = sa._cool(start[rungs] * 1e-6, 0, None, np.ones(3, dtype=int), rungs)
+    assert np.allclose(temps, 0.5 * start[rungs])
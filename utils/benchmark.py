@@ -0,0 +1,282 @@
+import hashlib
+import json
+import os
+import re
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from utils.metrics import stack_histories
+from utils.visualization import plot_convergence
+
+# Các cột xác định 1 ô thực nghiệm (1 lần chạy); các cột còn lại là kết quả đo được
+KEY_COLUMNS = ['suite', 'problem', 'dim', 'algorithm', 'params', 'seed', 'run']
+RESULT_COLUMNS = ['best_fitness', 'time', 'n_evals', 'peak_memory_mb', 'stop_reason', 'profile', 'timestamp']
+
+
+def _describe(obj):
+    """Mô tả ổn định cho giá trị không ghi được JSON (class, hàm, mảng...)"""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return getattr(obj, '__name__', repr(obj))
+
+
+def params_key(params):
+    """Tham số thuật toán dạng JSON (sắp xếp khóa) để nhận diện cấu hình khi chạy tiếp"""
+    return json.dumps(params, sort_keys=True, default=_describe)
+
+
+def normalize_key(value):
+    """
+    Dạng chuẩn (chuỗi) của 1 giá trị cột khóa, dùng cả khi ghi lẫn khi so khớp:
+    None/NaN -> '' (pandas đổi None thành NaN khi gộp bảng / đọc CSV), số nguyên dạng float (5.0) -> '5'.
+    """
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ''
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    if isinstance(value, np.integer):
+        return str(int(value))
+    return str(value)
+
+
+def _slug(text):
+    return re.sub(r'[^0-9A-Za-z]+', '_', str(text)).strip('_')
+
+
+def _peak_memory(optimizer_class, problem, seed_seq, kwargs):
+    """Đỉnh bộ nhớ (MB) của 1 lần chạy riêng dưới tracemalloc (không dùng để đo thời gian)"""
+    tracemalloc.start()
+    try:
+        optimizer_class(problem, seed=seed_seq, **kwargs).solve()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def _run_recorded(optimizer_class, problem, seed_seq, kwargs, track_memory):
+    """
+    Chạy 1 lần và trả về (kết quả đo, lịch sử hội tụ).
+    Đặt ở cấp module để gửi sang process khác.
+    track_memory: đo đỉnh bộ nhớ trong 1 lần chạy thêm với cùng seed, tách khỏi lần chạy được đo thời gian
+    (tracemalloc làm chậm đáng kể các thuật toán cấp phát nhiều đối tượng Python).
+    Báo cáo profiling theo pha (khi tham số có profile=True) được lưu dạng JSON ở cột 'profile'.
+    """
+    peak = _peak_memory(optimizer_class, problem, seed_seq, kwargs) if track_memory else np.nan
+    optimizer = optimizer_class(problem, seed=seed_seq, **kwargs)
+    _, best_fitness, history = optimizer.solve()
+    report = optimizer.profile_report()
+    result = {
+        "best_fitness": float(best_fitness),
+        "time": optimizer.run_time,
+        "n_evals": int(optimizer.n_evals),
+        "peak_memory_mb": peak,
+        "stop_reason": optimizer.stop_reason,
+        "profile": json.dumps(report) if report is not None else '',
+    }
+    return result, np.asarray(history, dtype=float)
+
+
+class ResultStore:
+    """
+    Kho kết quả dạng bảng: mỗi dòng là 1 lần chạy (KEY_COLUMNS + RESULT_COLUMNS).
+    - path=None: chỉ giữ trong bộ nhớ
+    - '.csv': mỗi lần chạy xong được ghi nối thêm 1 dòng ngay -> bị ngắt giữa chừng chỉ mất lần đang chạy
+    - '.parquet': ghi lại toàn bộ file qua file tạm + os.replace (cần pyarrow hoặc fastparquet)
+    Lịch sử hội tụ lưu riêng từng lần chạy dạng .npy trong thư mục <tên file>_histories/.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.format = None
+        self.history_dir = None
+        self._histories = {}
+        if path is not None:
+            ext = os.path.splitext(path)[1].lower()
+            if ext not in ('.csv', '.parquet'):
+                raise ValueError(f"File kết quả phải là .csv hoặc .parquet, nhận được: {path}")
+            self.format = ext[1:]
+            self.history_dir = os.path.splitext(path)[0] + '_histories'
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            os.makedirs(self.history_dir, exist_ok=True)
+        self.frame = self._load()
+        self._done = {self._key(row) for row in self.frame[KEY_COLUMNS].itertuples(index=False)}
+
+    @staticmethod
+    def _key(values):
+        # So khớp theo dạng chuẩn: CSV đọc lại / pd.concat có thể đổi kiểu (int -> float, None -> NaN)
+        return tuple(normalize_key(v) for v in values)
+
+    def _load(self):
+        empty = pd.DataFrame(columns=KEY_COLUMNS + RESULT_COLUMNS)
+        if self.path is None or not os.path.exists(self.path):
+            return empty
+        if self.format == 'parquet':
+            return pd.read_parquet(self.path)
+
+        # Dòng cuối có thể bị cắt dở nếu tiến trình bị dừng đúng lúc ghi -> bỏ phần sau dấu xuống dòng cuối
+        with open(self.path, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+        if os.path.getsize(self.path) == 0:
+            return empty
+        frame = pd.read_csv(self.path, dtype={'params': str, 'seed': str, 'stop_reason': str, 'profile': str})
+        frame = frame.dropna(subset=['timestamp']).reset_index(drop=True)
+        frame['seed'] = frame['seed'].map(normalize_key)
+        return frame
+
+    def _history_file(self, key):
+        digest = hashlib.sha1(json.dumps(key).encode()).hexdigest()[:16]
+        return os.path.join(self.history_dir, f"{digest}.npy")
+
+    def has(self, row):
+        return self._key(row[c] for c in KEY_COLUMNS) in self._done
+
+    def add(self, row, history):
+        """Ghi 1 lần chạy (lịch sử ghi trước, dòng kết quả sau: có dòng thì chắc chắn có lịch sử)"""
+        row = dict(row, timestamp=pd.Timestamp.now().isoformat(timespec='seconds'))
+        key = self._key(row[c] for c in KEY_COLUMNS)
+        if self.path is None:
+            self._histories[key] = history
+        else:
+            np.save(self._history_file(key), history)
+
+        new = pd.DataFrame([row], columns=KEY_COLUMNS + RESULT_COLUMNS)
+        if self.format == 'csv':
+            with open(self.path, 'a', newline='') as f:
+                new.to_csv(f, header=f.tell() == 0, index=False)
+                f.flush()
+                os.fsync(f.fileno())
+        self.frame = new if self.frame.empty else pd.concat([self.frame, new], ignore_index=True)
+        if self.format == 'parquet':
+            tmp = self.path + '.tmp'
+            self.frame.to_parquet(tmp, index=False)
+            os.replace(tmp, self.path)
+        self._done.add(key)
+
+    def select(self, **cell):
+        """Các dòng khớp với giá trị các cột cho trước (so theo dạng chuẩn normalize_key)"""
+        mask = np.ones(len(self.frame), dtype=bool)
+        for col, value in cell.items():
+            mask &= (self.frame[col].map(normalize_key) == normalize_key(value)).to_numpy()
+        return self.frame[mask]
+
+    def histories(self, rows):
+        """Lịch sử hội tụ của các dòng kết quả, theo thứ tự dòng"""
+        keys = [self._key(r) for r in rows[KEY_COLUMNS].itertuples(index=False)]
+        if self.path is None:
+            return [self._histories[k] for k in keys]
+        return [np.load(self._history_file(k)) for k in keys]
+
+
+def summarize(results):
+    """Bảng tổng hợp theo (suite, problem, algorithm, params): trung bình/độ lệch/tốt nhất của fitness, thời gian, FEs, bộ nhớ"""
+    return results.groupby(['suite', 'problem', 'algorithm', 'params'], sort=False).agg(
+        runs=('run', 'count'),
+        mean_fitness=('best_fitness', 'mean'),
+        std_fitness=('best_fitness', 'std'),
+        best_fitness=('best_fitness', 'min'),
+        median_time=('time', 'median'),
+        mean_evals=('n_evals', 'mean'),
+        peak_memory_mb=('peak_memory_mb', 'max'),
+    ).reset_index()
+
+
+def _make_problem(spec):
+    """Bài toán cho sẵn (instance) hoặc dạng khai báo {'class': Sphere, 'params': {'dim': 10}}"""
+    if isinstance(spec, dict):
+        return spec['class'](**spec.get('params', {}))
+    return spec
+
+
+def run_benchmark(config, results_path=None, plots_dir=None, workers=1, track_memory=False):
+    """
+    Chạy 1 bộ benchmark khai báo bằng config và lưu kết quả từng lần chạy vào kho.
+    Các lần chạy đã có trong kho (cùng suite, bài toán, thuật toán, tham số, seed, run) được bỏ qua
+    -> chạy lại cùng lệnh sau khi bị ngắt sẽ tiếp tục từ chỗ dừng.
+
+    Args:
+        config: {
+            'name': 'continuous',
+            'problems': [Sphere(dim=10), {'class': Rastrigin, 'params': {'dim': 10}}, ...],
+            'algorithms': [{'class': HillClimbing, 'params': {...}, 'name': 'HC'}, ...],  # 'name' tùy chọn
+            'n_runs': 30,
+            'seed': 42
+        }
+        results_path: File kết quả .csv / .parquet (None = không lưu)
+        plots_dir: Thư mục lưu biểu đồ hội tụ dạng PNG (None = hiển thị bằng plt.show())
+        workers: Số process chạy song song các lần chạy độc lập
+        track_memory: Đo thêm đỉnh bộ nhớ (tracemalloc) bằng 1 lần chạy riêng không tính giờ
+                      (mặc định tắt; cột 'time' không bao giờ đo dưới tracemalloc)
+        Thêm profile=True vào 'params' của thuật toán để lưu báo cáo thời gian theo pha vào cột 'profile'.
+    Returns:
+        DataFrame kết quả các lần chạy của suite này (kể cả các lần đã có từ trước)
+    """
+    suite = config.get('name', 'benchmark')
+    n_runs = config.get('n_runs', 10)
+    seed = config.get('seed')
+    algorithms = config['algorithms']
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    store = ResultStore(results_path)
+    # Seed con của lần chạy thứ r không phụ thuộc thứ tự chạy hay số worker -> chạy tiếp vẫn lặp lại được
+    child_seeds = np.random.SeedSequence(seed).spawn(n_runs)
+
+    print("\n" + "="*60)
+    print(f"🚀 STARTING BENCHMARK '{suite}' ({len(config['problems'])} Problems, {len(algorithms)} Algorithms)")
+    print("="*60)
+
+    for spec in config['problems']:
+        problem = _make_problem(spec)
+        print(f"\n📌 PROBLEM: {problem.name}")
+        print("-" * 40)
+
+        histories = {}
+        strides = {}
+        for algo_conf in algorithms:
+            AlgoClass = algo_conf['class']
+            params = algo_conf.get('params', {})
+            label = algo_conf.get('name', AlgoClass.__name__)
+            cell = {"suite": suite, "problem": problem.name, "dim": problem.dim,
+                    "algorithm": label, "params": params_key(params), "seed": normalize_key(seed)}
+
+            pending = [r for r in range(n_runs) if not store.has(dict(cell, run=r))]
+            cached = n_runs - len(pending)
+            print(f"⏳ Running {label:<16} ({len(pending)} runs" + (f", {cached} cached" if cached else "") + ")... ",
+                  end="", flush=True)
+
+            jobs = [(AlgoClass, problem, child_seeds[r], params, track_memory) for r in pending]
+            if workers > 1 and len(jobs) > 1:
+                with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+                    futures = {executor.submit(_run_recorded, *job): r for job, r in zip(jobs, pending)}
+                    for future in as_completed(futures):
+                        result, history = future.result()
+                        store.add(dict(cell, run=futures[future], **result), history)
+            else:
+                for job, r in zip(jobs, pending):
+                    result, history = _run_recorded(*job)
+                    store.add(dict(cell, run=r, **result), history)
+
+            rows = store.select(**cell)
+            rows = rows[rows['run'].astype(int) < n_runs].sort_values('run', key=lambda s: s.astype(int))
+            if len(rows) != n_runs:
+                raise ValueError(f"Kho kết quả chỉ có {len(rows)}/{n_runs} lần chạy cho {label} trên {problem.name} "
+                                 f"(cột khóa không khớp: {cell})")
+            fit = rows['best_fitness'].to_numpy(dtype=float)
+            print("Done!")
+            print(f"   ✅ {label:<16} | Fit: {np.mean(fit):10.4f} ± {np.std(fit):.4f} | Best: {np.min(fit):10.4f} "
+                  f"| Time: {rows['time'].astype(float).mean():.4f}s | FEs: {rows['n_evals'].astype(float).mean():.0f}")
+
+            histories[label] = stack_histories(store.histories(rows))
+            strides[label] = params.get('history_stride', 1)
+
+        save_path = os.path.join(plots_dir, f"{_slug(suite)}_{_slug(problem.name)}.png") if plots_dir else None
+        print(f"   >> Vẽ biểu đồ so sánh cho {problem.name}" + (f" -> {save_path}" if save_path else "..."))
+        plot_convergence(histories, title=f"Comparison on {problem.name}", strides=strides, save_path=save_path)
+
+    print(f"\n✅ BENCHMARK '{suite}' COMPLETED!")
+    return store.select(suite=suite).reset_index(drop=True)
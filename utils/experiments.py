@@ -1,44 +1,28 @@
 from utils.metrics import run_experiment, measure_memory, run_scalability_test
-from utils.visualization import plot_convergence
-import matplotlib.pyplot as plt
+from utils.benchmark import run_benchmark
 
-def run_suite(problem_list, algorithm_configs, n_runs=10):
+def run_suite(problem_list, algorithm_configs, n_runs=10, workers=1, seed=None, results_path=None, plots_dir=None):
     """
     Chạy một bộ test (Test Suite) gồm nhiều bài toán.
+    Dạng rút gọn của utils.benchmark.run_benchmark (xem ở đó để lưu kết quả và chạy tiếp khi bị ngắt).
     
     Args:
         problem_list: Danh sách các bài toán (đã khởi tạo). VD: [Sphere(10), Rastrigin(10)]
         algorithm_configs: Danh sách cấu hình thuật toán. 
                            Dạng: [{'class': HillClimbing, 'params': {...}}, ...]
         n_runs: Số lần chạy mỗi thuật toán để lấy thống kê.
+        workers: Số process chạy song song các lần chạy độc lập (xem run_experiment).
+        seed: Seed gốc để kết quả lặp lại được.
+        results_path: File .csv / .parquet lưu kết quả từng lần chạy (None = không lưu)
+        plots_dir: Thư mục lưu biểu đồ (None = hiển thị bằng plt.show())
+    Returns:
+        DataFrame kết quả từng lần chạy
     """
-    print("\n" + "="*60)
-    print(f"🚀 STARTING TEST SUITE ({len(problem_list)} Problems, {len(algorithm_configs)} Algorithms)")
-    print("="*60)
-
-    for problem in problem_list:
-        print(f"\n📌 PROBLEM: {problem.name}")
-        print("-" * 40)
-        
-        histories = {} # Để lưu dữ liệu vẽ biểu đồ
-        
-        # 1. Chạy từng thuật toán trên bài toán này
-        for algo_conf in algorithm_configs:
-            AlgoClass = algo_conf['class']
-            params = algo_conf.get('params', {})
-            
-            # A. Chạy thống kê (Robustness)
-            # Hàm run_experiment đã tự in báo cáo ra màn hình rồi
-            stats = run_experiment(AlgoClass, problem, n_runs=n_runs, **params)
-            
-            # B. Chạy 1 lần nữa để lấy lịch sử vẽ biểu đồ (Convergence Plot)
-            # (Chúng ta chạy riêng để đảm bảo biểu đồ thể hiện một lần chạy điển hình)
-            opt = AlgoClass(problem, **params)
-            opt.solve()
-            histories[AlgoClass.__name__] = opt.history
-
-        # 2. Vẽ biểu đồ so sánh ngay sau khi xong 1 bài toán
-        print(f"   >> Vẽ biểu đồ so sánh cho {problem.name}...")
-        plot_convergence(histories, title=f"Comparison on {problem.name}")
-        
-    print("\n✅ TEST SUITE COMPLETED!")
\ No newline at end of file
+    config = {
+        'name': 'suite',
+        'problems': problem_list,
+        'algorithms': algorithm_configs,
+        'n_runs': n_runs,
+        'seed': seed
+    }
+    return run_benchmark(config, results_path=results_path, plots_dir=plots_dir, workers=workers)
\ No newline at end of file
@@ -1,43 +1,119 @@
+import gc
 import numpy as np
+import os
 import time
 import tracemalloc
-import matplotlib.pyplot as plt
+import pandas as pd
+from utils.visualization import plot_scalability
+from concurrent.futures import ProcessPoolExecutor
 
-def run_experiment(optimizer_class, problem, n_runs=30, **kwargs):
+def _run_single(optimizer_class, problem, seed_seq, kwargs):
+    """
+    Chạy 1 lần thực nghiệm độc lập với SeedSequence con riêng.
+    Hàm đặt ở cấp module để có thể gửi sang process khác (pickle).
+    """
+    # Khởi tạo và chạy thuật toán
+    # Mỗi lần chạy có bộ sinh số ngẫu nhiên riêng -> kết quả không phụ thuộc số worker
+    optimizer = optimizer_class(problem, seed=seed_seq, **kwargs)
+    _, best_fitness, history = optimizer.solve()
+    return best_fitness, optimizer.run_time, optimizer.n_evals, history.copy(), optimizer.profile_report()
+
+def aggregate_profiles(reports):
+    """
+    Gộp báo cáo profiling (Optimizer.profile_report) của nhiều lần chạy theo từng pha:
+    thời gian trung bình/độ lệch (giây), tỉ lệ thời gian trung bình, số lần gọi trung bình,
+    đỉnh bộ nhớ lớn nhất (MB, None nếu không đo). Trả về None nếu các lần chạy không bật profiling.
+    """
+    reports = [r for r in reports if r is not None]
+    if not reports:
+        return None
+    phases = list(dict.fromkeys(name for r in reports for name in r))
+    summary = {}
+    for name in phases:
+        entries = [r.get(name) for r in reports]
+        times = np.array([e["time_s"] if e else 0.0 for e in entries])
+        memory = [e["peak_memory_mb"] for e in entries if e and e["peak_memory_mb"] is not None]
+        summary[name] = {
+            "mean_time_s": np.mean(times),
+            "std_time_s": np.std(times),
+            "share": np.mean([e["share"] if e else 0.0 for e in entries]),
+            "mean_calls": np.mean([e["calls"] if e else 0 for e in entries]),
+            "peak_memory_mb": max(memory) if memory else None
+        }
+    return summary
+
+def stack_histories(histories):
+    """
+    Gộp lịch sử hội tụ của nhiều lần chạy thành ma trận (n_runs, n_iters).
+    Các lần chạy dừng sớm được kéo dài bằng giá trị cuối cùng (fitness tốt nhất không đổi nữa).
+    """
+    n_iters = max(len(h) for h in histories)
+    matrix = np.empty((len(histories), n_iters))
+    for i, h in enumerate(histories):
+        matrix[i, :len(h)] = h
+        matrix[i, len(h):] = h[-1] if len(h) else np.nan
+    return matrix
+
+def run_experiment(optimizer_class, problem, n_runs=30, workers=1, seed=None, **kwargs):
     """
     Chạy thực nghiệm và in báo cáo dạng rút gọn (One-line summary).
+
+    Args:
+        workers: Số process chạy song song (1 = chạy tuần tự, None = dùng tất cả CPU)
+        seed: Seed gốc. Mỗi lần chạy nhận 1 SeedSequence con (spawn) nên kết quả
+              giống hệt nhau dù chạy với bao nhiêu worker.
+        kwargs: Tham số thuật toán. profile=True / 'memory' để đo thời gian theo pha,
+                kết quả gộp nằm ở khóa "profile" (xem aggregate_profiles).
     """
-    fitness_results = []
-    time_results = []
-    
+    if workers is None:
+        workers = os.cpu_count() or 1
+
     # In thông báo đang chạy (dùng end="" để không xuống dòng)
     print(f"⏳ Running {optimizer_class.__name__:<16} ({n_runs} runs)... ", end="", flush=True)
-    
-    for i in range(n_runs):
-        # Khởi tạo và chạy thuật toán
-        optimizer = optimizer_class(problem, **kwargs)
-        _, best_fitness, _ = optimizer.solve()
-        
-        fitness_results.append(best_fitness)
-        time_results.append(optimizer.run_time)
+
+    # Sinh seed con cho từng lần chạy từ seed gốc
+    child_seeds = np.random.SeedSequence(seed).spawn(n_runs)
+    jobs = [(optimizer_class, problem, child, kwargs) for child in child_seeds]
+
+    if workers > 1 and n_runs > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, n_runs)) as executor:
+            results = list(executor.map(_run_single, *zip(*jobs)))
+    else:
+        results = [_run_single(*job) for job in jobs]
+
+    fitness_results = [res[0] for res in results]
+    time_results = [res[1] for res in results]
+    eval_results = [res[2] for res in results]
+    histories = stack_histories([res[3] for res in results])
+    profile = aggregate_profiles([res[4] for res in results])
 
     # Tính toán thống kê
     mean_fit = np.mean(fitness_results)
     std_fit = np.std(fitness_results)
     best_fit = np.min(fitness_results)
     avg_time = np.mean(time_results)
+    avg_evals = np.mean(eval_results)
     
     # In kết quả dạng ONE-LINE (Gọn gàng)
     # Ví dụ: ✅ HillClimbing | Fit: 2.50 ± 1.20 | Best: 0.05 | Time: 0.001s
     print(f"Done!")
-    print(f"   ✅ {optimizer_class.__name__:<16} | Fit: {mean_fit:10.4f} ± {std_fit:.4f} | Best: {best_fit:10.4f} | Time: {avg_time:.4f}s")
+    print(f"   ✅ {optimizer_class.__name__:<16} | Fit: {mean_fit:10.4f} ± {std_fit:.4f} | Best: {best_fit:10.4f} | Time: {avg_time:.4f}s | FEs: {avg_evals:.0f}")
+    if profile is not None:
+        # Ví dụ: ⏱  variation 61.3% | evaluation 30.2% | bookkeeping 6.1% | other 2.4% | Eval batches: 501
+        # Eval batches: số lần gọi evaluate / evaluate_batch (1 batch chứa nhiều lần đánh giá, xem FEs ở trên)
+        phases = " | ".join(f"{name} {p['share'] * 100:.1f}%" for name, p in profile.items())
+        calls = profile.get("evaluation", {}).get("mean_calls", 0)
+        print(f"      ⏱  {phases} | Eval batches: {calls:.0f}")
     
     return {
         "algorithm": optimizer_class.__name__,
         "mean_fitness": mean_fit,
         "std_fitness": std_fit,
         "best_fitness": best_fit,
-        "avg_time": avg_time
+        "avg_time": avg_time,
+        "avg_evals": avg_evals,
+        "histories": histories,  # Ma trận (n_runs, n_iters) để vẽ median/IQR
+        "profile": profile       # Thống kê theo pha (None nếu không bật profile)
     }
 
 def measure_memory(optimizer_class, problem, **kwargs):
@@ -54,48 +130,97 @@ def measure_memory(optimizer_class, problem, **kwargs):
     print(f"   💾 Memory ({optimizer_class.__name__}): {peak_mb:.4f} MB")
     return peak_mb
 
-def run_scalability_test(optimizer_classes, problem_class, dims=[10, 30, 50, 100], **kwargs):
+def fit_complexity(summary):
+    """
+    Khớp số mũ độ phức tạp thực nghiệm cho từng thuật toán bằng hồi quy log-log:
+    log(time) = c + k_dim * log(dim) + k_pop * log(pop_size)
+    (chỉ dùng các tham số có nhiều hơn 1 giá trị). k ~ 1: tuyến tính, k ~ 2: bậc hai...
+    Returns:
+        DataFrame (algorithm, parameter, exponent, r2)
     """
-    Test khả năng mở rộng (Scalability) cho NHIỀU thuật toán cùng lúc.
+    rows = []
+    for name, group in summary.groupby('algorithm', sort=False):
+        params = [p for p in ('dim', 'pop_size') if group[p].nunique() > 1]
+        if not params:
+            continue
+        A = np.column_stack([np.ones(len(group))] + [np.log(group[p].to_numpy(dtype=float)) for p in params])
+        y = np.log(group['median_time'].to_numpy(dtype=float))
+        coef, *_ = np.linalg.lstsq(A, y, rcond=None)
+        ss_res = np.sum((y - A @ coef) ** 2)
+        ss_tot = np.sum((y - y.mean()) ** 2)
+        r2 = 1 - ss_res / ss_tot if ss_tot > 0 else 1.0
+        for param, k in zip(params, coef[1:]):
+            rows.append({"algorithm": name, "parameter": param, "exponent": k, "r2": r2})
+    return pd.DataFrame(rows, columns=["algorithm", "parameter", "exponent", "r2"])
+
+def run_scalability_test(optimizer_classes, problem_class, dims=[10, 30, 50, 100], pop_sizes=None,
+                         n_repeats=5, n_warmup=1, seed=None, plot=True, save_path=None, **kwargs):
+    """
+    Test khả năng mở rộng (Scalability) cho NHIỀU thuật toán cùng lúc, theo số chiều và kích thước quần thể.
+    - Chỉ đo solve() (không tính khởi tạo bài toán/thuật toán) bằng time.perf_counter, tắt GC trong lúc đo
+    - Mỗi cấu hình chạy n_warmup lần khởi động (bỏ qua) rồi n_repeats lần đo -> median và IQR
+    - Khớp số mũ độ phức tạp (xem fit_complexity) để phát hiện thuật toán tăng nhanh bất thường (VD: O(N^2))
     Args:
         optimizer_classes: Danh sách Class thuật toán (VD: [HillClimbing, GeneticAlgorithm])
         problem_class: Class bài toán
         dims: Các chiều cần test
+        pop_sizes: Các kích thước quần thể cần test (None = dùng mặc định của thuật toán)
+        n_repeats: Số lần đo mỗi cấu hình
+        n_warmup: Số lần chạy khởi động trước khi đo
+        seed: Seed gốc (mỗi lần chạy nhận 1 SeedSequence con)
+        plot: Vẽ biểu đồ (xem plot_scalability), save_path: lưu ảnh thay vì hiển thị
+        kwargs: Tham số chung cho các thuật toán (max_iter...)
+    Returns:
+        dict các DataFrame:
+            "runs": từng lần đo (algorithm, dim, pop_size, repeat, time, n_evals)
+            "summary": theo cấu hình (median_time, q1, q3, iqr)
+            "exponents": số mũ độ phức tạp theo dim / pop_size và R^2
     """
     print(f"\n📈 Running Scalability Comparison...")
-    
-    plt.figure(figsize=(10, 6))
-    
+    seed_seq = np.random.SeedSequence(seed)
+    pops = [None] if pop_sizes is None else list(pop_sizes)
+    records = []
+
     # Duyệt qua từng thuật toán trong danh sách
     for opt_class in optimizer_classes:
-        times = []
-        print(f"   Testing {opt_class.__name__:<16} | Dims: {dims} ... ", end="", flush=True)
-        
+        sweep = f"Dims: {dims}" + (f" | Pops: {pops}" if pop_sizes is not None else "")
+        print(f"   Testing {opt_class.__name__:<16} | {sweep} ... ", end="", flush=True)
+
         for d in dims:
             prob = problem_class(dim=d)
-            # Chạy ngầm 3 lần lấy trung bình time cho chính xác
-            start = time.time()
-            n_avg = 3
-            for _ in range(n_avg):
-                opt = opt_class(prob, **kwargs)
-                opt.solve()
-            
-            avg_time = (time.time() - start) / n_avg
-            times.append(avg_time)
-        
+            for pop in pops:
+                params = dict(kwargs) if pop is None else dict(kwargs, pop_size=pop)
+                for r in range(n_warmup + n_repeats):
+                    opt = opt_class(prob, seed=seed_seq.spawn(1)[0], **params)
+                    gc.collect()
+                    gc_enabled = gc.isenabled()
+                    gc.disable()
+                    try:
+                        start = time.perf_counter()
+                        opt.solve()
+                        elapsed = time.perf_counter() - start
+                    finally:
+                        if gc_enabled:
+                            gc.enable()
+                    if r >= n_warmup:
+                        records.append({"algorithm": opt_class.__name__, "dim": d, "pop_size": opt.pop_size,
+                                        "repeat": r - n_warmup, "time": elapsed, "n_evals": opt.n_evals})
         print("Done!")
-        
-        # Vẽ đường cho thuật toán này
-        plt.plot(dims, times, marker='o', linewidth=2, label=opt_class.__name__)
-        
-        # Hiển thị số liệu tại điểm cuối cùng
-        plt.annotate(f"{times[-1]:.4f}s", (dims[-1], times[-1]), 
-                     xytext=(5, 0), textcoords="offset points", fontsize=8)
-
-    # Trang trí biểu đồ
-    plt.title(f"Scalability Comparison: Time vs Dimension")
-    plt.xlabel("Problem Dimension (Size)")
-    plt.ylabel("Execution Time (seconds)")
-    plt.grid(True, linestyle='--', alpha=0.5)
-    plt.legend() # Hiển thị chú thích
-    plt.show()
\ No newline at end of file
+
+    runs = pd.DataFrame(records)
+    grouped = runs.groupby(['algorithm', 'dim', 'pop_size'], sort=False)['time']
+    summary = grouped.median().rename('median_time').to_frame()
+    summary['q1'] = grouped.quantile(0.25)
+    summary['q3'] = grouped.quantile(0.75)
+    summary['iqr'] = summary['q3'] - summary['q1']
+    summary = summary.reset_index()
+    exponents = fit_complexity(summary)
+
+    # In số mũ: VD: 🔎 GeneticAlgorithm | dim^1.02 pop_size^0.98 (R²=0.997)
+    for name, group in exponents.groupby('algorithm', sort=False):
+        terms = " ".join(f"{p}^{k:.2f}" for p, k in zip(group['parameter'], group['exponent']))
+        print(f"   🔎 {name:<16} | {terms} (R²={group['r2'].iloc[0]:.3f})")
+
+    if plot:
+        plot_scalability(summary, title="Scalability Comparison: Time vs Problem Size", save_path=save_path)
+    return {"runs": runs, "summary": summary, "exponents": exponents}
\ No newline at end of file
@@ -1,3 +1,4 @@
+import os
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
@@ -16,10 +17,9 @@ def plot_3d_surface(problem, title="Objective Function Landscape"):
     y = np.linspace(y_min, y_max, 100)
     X, Y = np.meshgrid(x, y)
     
-    Z = np.zeros_like(X)
-    for i in range(X.shape[0]):
-        for j in range(X.shape[1]):
-            Z[i, j] = problem.fitness(np.array([X[i, j], Y[i, j]]))
+    # Đánh giá toàn bộ lưới trong 1 lần gọi
+    grid = np.column_stack([X.ravel(), Y.ravel()])
+    Z = problem.fitness_batch(grid).reshape(X.shape)
 
     fig = plt.figure(figsize=(12, 8))
     ax = fig.add_subplot(111, projection='3d')
@@ -33,19 +33,34 @@ def plot_3d_surface(problem, title="Objective Function Landscape"):
     plt.show()
 
 # --- CẬP NHẬT MỚI: Hỗ trợ so sánh nhiều thuật toán ---
-def plot_convergence(histories_dict, title="Convergence Comparison"):
+def plot_convergence(histories_dict, title="Convergence Comparison", strides=None, save_path=None):
     """
     Vẽ biểu đồ so sánh nhiều thuật toán trên cùng 1 hình.
     
     Args:
-        histories_dict: Dictionary dạng {'Tên Thuật Toán': [list history], ...}
+        histories_dict: Dictionary dạng {'Tên Thuật Toán': history, ...}
+                        history là list/mảng 1 chiều (1 lần chạy) hoặc ma trận (n_runs, n_iters);
+                        với ma trận sẽ vẽ đường trung vị (median) và dải tứ phân vị (IQR).
         title: Tiêu đề biểu đồ
+        strides: Dictionary {'Tên Thuật Toán': history_stride} để trục hoành đúng số vòng lặp
+        save_path: Đường dẫn file ảnh (.png/.pdf/.svg). Có -> lưu file và đóng hình (không cần màn hình),
+                   None -> hiển thị bằng plt.show() như cũ
     """
-    plt.figure(figsize=(10, 6))
+    strides = strides or {}
+    fig = plt.figure(figsize=(10, 6))
     
     # Duyệt qua từng thuật toán trong dictionary để vẽ
     for name, history in histories_dict.items():
-        plt.plot(history, label=name, linewidth=2)
+        history = np.asarray(history, dtype=float)
+        if history.ndim == 1:
+            history = history[np.newaxis, :]
+        x = np.arange(history.shape[1]) * strides.get(name, 1)
+
+        median = np.median(history, axis=0)
+        line, = plt.plot(x, median, label=name, linewidth=2)
+        if history.shape[0] > 1:
+            q1, q3 = np.percentile(history, [25, 75], axis=0)
+            plt.fill_between(x, q1, q3, color=line.get_color(), alpha=0.2)
     
     plt.title(title, fontsize=14)
     plt.xlabel("Iterations (Vòng lặp)")
@@ -57,4 +72,47 @@ def plot_convergence(histories_dict, title="Convergence Comparison"):
     
     plt.grid(True, linestyle='--', alpha=0.7, which="both")
     plt.legend() # Hiển thị chú thích tên thuật toán
-    plt.show()
\ No newline at end of file
+    if save_path:
+        os.makedirs(os.path.dirname(save_path) or '.', exist_ok=True)
+        fig.savefig(save_path, dpi=150, bbox_inches='tight')
+        plt.close(fig)
+    else:
+        plt.show()
+
+def plot_scalability(summary, title="Scalability Comparison", save_path=None):
+    """
+    Vẽ thời gian chạy (median, thanh lỗi = IQR) theo số chiều, và theo kích thước quần thể nếu có nhiều giá trị.
+    Trục log-log: độ dốc của đường chính là số mũ độ phức tạp.
+
+    Args:
+        summary: DataFrame từ run_scalability_test (cột algorithm, dim, pop_size, median_time, q1, q3)
+        save_path: Đường dẫn file ảnh (None = plt.show())
+    """
+    sweep_pop = summary['pop_size'].nunique() > 1
+    fig, axes = plt.subplots(1, 2 if sweep_pop else 1, figsize=(14 if sweep_pop else 10, 6), squeeze=False)
+    panels = [('dim', 'pop_size', min, "Problem Dimension (Size)")]
+    if sweep_pop:
+        panels.append(('pop_size', 'dim', max, "Population Size"))
+
+    for ax, (x_col, fixed_col, pick, xlabel) in zip(axes[0], panels):
+        for name, group in summary.groupby('algorithm', sort=False):
+            # Giữ tham số còn lại cố định (quần thể nhỏ nhất / số chiều lớn nhất)
+            fixed = pick(group[fixed_col])
+            group = group[group[fixed_col] == fixed].sort_values(x_col)
+            err = [group['median_time'] - group['q1'], group['q3'] - group['median_time']]
+            ax.errorbar(group[x_col], group['median_time'], yerr=err, marker='o', linewidth=2, capsize=3,
+                        label=f"{name} ({fixed_col}={fixed})")
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel("Execution Time (seconds)")
+        ax.grid(True, linestyle='--', alpha=0.5, which="both")
+        ax.legend()
+
+    fig.suptitle(title, fontsize=14)
+    if save_path:
+        os.makedirs(os.path.dirname(save_path) or '.', exist_ok=True)
+        fig.savefig(save_path, dpi=150, bbox_inches='tight')
+        plt.close(fig)
+    else:
+        plt.show()
\ No newline at end of file